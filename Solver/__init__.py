@@ -0,0 +1,48 @@
+"""Solucionador de sistemas Ax = b de redes de comunicaciones
+
+Importar el paquete no ejecuta nada: el programa interactivo se lanza
+con python -m Solver (ver __main__.py). Los nombres de abajo se importan
+de su módulo la primera vez que se usan, para que importar un solo
+módulo (Solver.batch, Solver.cache, ...) no cargue todos los demás.
+"""
+import importlib
+
+_EXPORTS = {
+    "GroundedLaplacian": "laplacian",
+    "MatrixAnalysis": "analysis",
+    "MixedPrecisionLU": "mixed_precision",
+    "OutOfCoreLU": "out_of_core",
+    "StepTrace": "trace",
+    "TraceViewer": "trace",
+    "WarmStartSolver": "iterative",
+    "analyze_system": "analysis",
+    "detect_structure": "structure",
+    "gauss_jordan": "elimination",
+    "gauss_jordan_steps": "elimination",
+    "inverse": "elimination",
+    "is_laplacian": "laplacian",
+    "iterative_solve": "iterative",
+    "load_system": "batch",
+    "mixed_precision_solve": "mixed_precision",
+    "record_trace": "trace",
+    "solve": "elimination",
+    "solve_laplacian": "laplacian",
+    "solve_out_of_core": "out_of_core",
+    "solve_sparse": "sparse_path",
+    "solve_system": "batch",
+    "structured_solve": "structure",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,32 @@
+"""Línea de comandos del solucionador
+
+    python -m Solver                    programa interactivo (FASE 1 a 4)
+    python -m Solver batch ...          modo por lotes (ver batch.py)
+    python -m Solver sweep ...          barrido de escenarios (ver sweep.py)
+    python -m Solver benchmark ...      banco de pruebas (ver benchmark.py)
+    python -m Solver out_of_core ...    A en disco, fuera de memoria (ver out_of_core.py)
+    python -m Solver trace ...          traza de Gauss-Jordan paso a paso (ver trace.py)
+
+Cada comando importa solo su módulo, para que el arranque sea rápido.
+"""
+import importlib
+import sys
+
+COMMANDS = ("batch", "sweep", "benchmark", "out_of_core", "trace")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        from .main import main as interactive
+        interactive()
+        return 0
+    if argv[0] not in COMMANDS:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    module = importlib.import_module(f".{argv[0]}", __package__)
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
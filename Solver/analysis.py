@@ -0,0 +1,159 @@
+import numpy as np
+from scipy import linalg, sparse
+from scipy.linalg import lapack
+
+from .cache import content_key, get_cache
+from .laplacian import LaplacianAnalysis, is_laplacian
+from .profiling import estimate_flops, operation
+from .structure import permutation_sign, structured_analysis
+
+
+class MatrixAnalysis:
+    """Análisis de Ax = b a partir de una sola factorización QR con pivoteo
+
+    A P = Q R, con |R[0,0]| ≥ |R[1,1]| ≥ ... (QR que revela el rango).
+    De esa única factorización salen el rango de A y de [A|b], el
+    logaritmo del determinante, el número de condición y la solución
+    (exacta o de mínimos cuadrados de norma mínima). Los factores se
+    guardan para calcular después A⁻¹, A⁺ o resolver otros vectores b.
+    """
+
+    path = "qr"
+
+    def __init__(self, A, b):
+        # No hay QR dispersa que revele el rango: una A dispersa llega aquí
+        # solo si es singular o casi, y se factoriza densa
+        A = A.toarray() if sparse.issparse(A) else np.asarray(A, dtype=float)
+        self.b = np.array(b, dtype=float)
+        self.n = A.shape[0]
+
+        with operation("qr_pivoteo", estimate_flops("qr_pivoteo", self.n)):
+            (self._h, self._tau), self._R, self._perm = linalg.qr(
+                A, mode="raw", pivoting=True, check_finite=False)
+
+        eps = np.finfo(float).eps
+        diag = np.abs(np.diagonal(self._R))
+        r_max = diag[0] if diag.size else 0.0
+
+        # Misma tolerancia que np.linalg.matrix_rank, aplicada a la diagonal de R
+        self.rank_tol = r_max * max(A.shape) * eps
+        self.rank = int(np.count_nonzero(diag > self.rank_tol))
+
+        # [A|b] tiene un rango más si b tiene componente fuera de la imagen de A
+        c = self._apply_qt(self.b)
+        b_tol = max(r_max, np.linalg.norm(self.b)) * (self.n + 1) * eps
+        self.residual_norm = float(np.linalg.norm(c[self.rank:]))
+        self.consistent = self.residual_norm <= b_tol
+        self.rank_augmented = self.rank + (0 if self.consistent else 1)
+
+        # det(A) = det(Q) · det(R) · det(P)⁻¹, en escala logarítmica
+        if self.rank == self.n:
+            self.logabsdet = float(np.sum(np.log(diag)))
+        else:
+            self.logabsdet = float("-inf")
+        reflectors = np.count_nonzero(self._tau)
+        sign = (-1.0) ** reflectors * permutation_sign(self._perm)
+        sign *= np.prod(np.sign(np.diagonal(self._R)))
+        self.det_sign = float(sign) if self.rank == self.n else 0.0
+
+        with operation("condicion"):
+            self.condition = self._condition_estimate()
+        self._c = c
+        self._x = None
+        self._min_norm = None
+
+    @property
+    def invertible(self):
+        """A es invertible si la factorización tiene rango completo"""
+        return self.rank == self.n
+
+    @property
+    def det(self):
+        """Determinante de A (puede desbordar a ±inf o 0 para n grande)"""
+        if self.det_sign == 0.0:
+            return 0.0
+        with np.errstate(over="ignore", under="ignore"):
+            return self.det_sign * float(np.exp(self.logabsdet))
+
+    @property
+    def x(self):
+        """Solución única, o de mínimos cuadrados de norma mínima si A es singular"""
+        if self._x is None:
+            with operation("solucion_qr", estimate_flops("solucion_qr", self.n)):
+                self._x = self._solve_from_qtb(self._c)
+        return self._x
+
+    def solve(self, B):
+        """Resuelve AX = B (o mínimos cuadrados) reutilizando los factores"""
+        return self._solve_from_qtb(self._apply_qt(np.asarray(B, dtype=float)))
+
+    def inverse(self):
+        """A⁻¹ a partir de los factores (A debe ser invertible)"""
+        if not self.invertible:
+            raise np.linalg.LinAlgError("La matriz A no es invertible")
+        with operation("inversa", estimate_flops("solucion_qr", self.n, self.n)):
+            return self.solve(np.eye(self.n))
+
+    def pseudo_inverse(self):
+        """Pseudo-inversa de Moore-Penrose A⁺ a partir de los factores"""
+        with operation("pseudo_inversa", estimate_flops("solucion_qr", self.n, self.n)):
+            return self.solve(np.eye(self.n))
+
+    def _apply_qt(self, B):
+        """Calcula Qᵀ B sin formar Q explícitamente"""
+        C = B[:, None] if B.ndim == 1 else B
+        C = np.array(C, dtype=float, order="F")
+        lwork = max(1, C.shape[1]) * 64
+        C, _, info = lapack.dormqr("L", "T", self._h, self._tau, C, lwork=lwork)
+        if info != 0:
+            raise np.linalg.LinAlgError(f"dormqr falló (info={info})")
+        return C[:, 0] if B.ndim == 1 else C
+
+    def _solve_from_qtb(self, C):
+        """Resuelve R P⁻¹ x = Qᵀ b, con norma mínima si R tiene rango r < n"""
+        r = self.rank
+        Y = np.zeros((self.n,) + C.shape[1:])
+        if r == self.n:
+            Y = linalg.solve_triangular(self._R, C, check_finite=False)
+        elif r > 0:
+            # Factorización ortogonal completa: [R11 R12]ᵀ = Z S
+            if self._min_norm is None:
+                self._min_norm = linalg.qr(self._R[:r].T, mode="economic", check_finite=False)
+            Z, S = self._min_norm
+            Y = Z @ linalg.solve_triangular(S, C[:r], trans="T", check_finite=False)
+
+        X = np.empty_like(Y)
+        X[self._perm] = Y
+        return X
+
+    def _condition_estimate(self):
+        """Estimación del número de condición (norma 1) de R, igual al de A salvo un factor ≤ n"""
+        if self.rank < self.n:
+            return float("inf")
+        rcond, info = lapack.dtrcon(self._R, norm="1", uplo="U", diag="N")
+        return float("inf") if info != 0 or rcond == 0 else 1.0 / rcond
+
+
+def analyze_system(A, b):
+    """Analiza Ax = b con una sola factorización (ver MatrixAnalysis)
+
+    Si A es el laplaciano de la red (filas que suman cero) se usa
+    LaplacianAnalysis, que no necesita la QR de la matriz completa. Si A
+    es invertible y bien condicionada se usa StructuredAnalysis, con la
+    factorización más barata que admite su estructura (diagonal,
+    triangular, de banda, Cholesky, LDLᵀ, LU o, si A es grande y rala, LU
+    disperso sin pasarla a densa). La QR con pivoteo queda para las
+    matrices singulares o casi singulares, donde hace falta revelar el
+    rango. El método elegido queda en analisis.path.
+
+    El análisis queda en la caché de resultados: el mismo (A, b) devuelve
+    el mismo objeto sin volver a factorizar.
+    """
+    return get_cache().get_or_compute(content_key("analisis", A, b),
+                                      lambda: _analyze(A, b))
+
+
+def _analyze(A, b):
+    if is_laplacian(A):
+        return LaplacianAnalysis(A, b)
+    return structured_analysis(A, b) or MatrixAnalysis(A, b)
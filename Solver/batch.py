@@ -0,0 +1,306 @@
+"""Modo por lotes (sin interacción) del solucionador de redes
+
+Lee A y b de archivos o de la entrada estándar, resuelve sin animaciones
+ni pausas y escribe los resultados en JSON o NPZ:
+
+    python -m Solver.batch escenario1.npz escenario2.npz -o resultados.json
+    python -m Solver.batch --A A.npy --b b.npy -o resultado.npz
+    cat sistema.csv | python -m Solver.batch - --mode iterative
+    python -m Solver.batch escenario.npz --profile perfil.json --cprofile perfil.prof
+    python -m Solver.batch escenario.npz --cache cache/
+
+Formatos de entrada:
+    .npz        arreglos "A" y "b"
+    .npy        A si se pasa --b; si no, la matriz aumentada [A|b]
+    .csv/.txt   A si se pasa --b; si no, la matriz aumentada [A|b]
+    -           matriz aumentada [A|b] en CSV por la entrada estándar
+
+Un escenario que no se puede cargar o resolver (por ejemplo, A singular
+en modo sparse o mixed) no detiene el lote: queda con estado "error" y
+el mensaje en "error", x en NaN, y el programa termina con código 1
+después de escribir todos los resultados.
+"""
+import argparse
+import copy
+import io
+import json
+import sys
+
+import numpy as np
+
+from .analysis import analyze_system
+from .cache import ResultCache, content_key, get_cache, set_cache
+from .iterative import WarmStartSolver, iterative_solve
+from .laplacian import LaplacianAnalysis
+from .mixed_precision import mixed_precision_solve
+from .partition import partitioned_solve
+from .profiling import Profiler, phase, profiler_from_env, set_profiler
+from .sparse_path import solve_sparse
+
+MODES = ("direct", "sparse", "iterative", "blocks", "mixed")
+
+
+def _load_array(source):
+    """Carga un arreglo de .npy, .csv/.txt o de la entrada estándar ("-")"""
+    if source == "-":
+        return np.loadtxt(io.StringIO(sys.stdin.read()), delimiter=",", ndmin=2)
+    if source.endswith(".npy"):
+        return np.load(source)
+    return np.loadtxt(source, delimiter=",", ndmin=1)
+
+
+def load_system(source, b_source=None):
+    """Carga el sistema Ax = b de un escenario
+
+    Args:
+        source: Archivo .npz con "A" y "b", archivo con A (o [A|b]) o "-"
+        b_source: Archivo con el vector b, si no viene junto con A
+
+    Returns:
+        Tupla (A, b) de arreglos de punto flotante
+    """
+    if source.endswith(".npz"):
+        with np.load(source) as data:
+            A = data["A"]
+            b = data["b"] if b_source is None else _load_array(b_source)
+    else:
+        A = _load_array(source)
+        if b_source is None:
+            # Matriz aumentada [A|b]
+            A = np.atleast_2d(A)
+            A, b = A[:, :-1], A[:, -1]
+        else:
+            b = _load_array(b_source)
+
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    b = np.asarray(b, dtype=float).ravel()
+    if A.shape[0] != A.shape[1] or A.shape[0] != b.shape[0]:
+        raise ValueError(f"Dimensiones incompatibles: A {A.shape}, b {b.shape}")
+    return A, b
+
+
+def solve_system(A, b, mode="direct", solver=None):
+    """Resuelve Ax = b sin interacción y devuelve un diccionario de resultados
+
+    Args:
+        A: Matriz de coeficientes de conexión
+        b: Vector de demanda de tráfico
+        mode: "direct" (análisis completo con el método que admite la
+              estructura de A, ver analysis.analyze_system), "sparse"
+              (LU disperso), "iterative" (Krylov precondicionado),
+              "blocks" (cada subred conexa por separado, en paralelo) o
+              "mixed" (LU en float32 con refinamiento en float64)
+        solver: En modo "iterative", un WarmStartSolver de A (ver
+              WarmStarts) para arrancar desde la solución anterior
+
+    Returns:
+        Diccionario con la solución x, el residuo ‖Ax − b‖ y, en modo
+        "direct", las propiedades de la matriz (rango, determinante, ...).
+        Si el método no puede resolver el sistema (A singular en modo
+        sparse o mixed, o un método iterativo que diverge) el estado es
+        "error", "error" tiene el motivo y x es NaN.
+
+    El resultado se guarda en la caché (también en disco, si está
+    configurada): el mismo (A, b, mode) no se vuelve a resolver. Los
+    errores no se guardan.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Modo desconocido: {mode!r}")
+
+    key = content_key("solve_system", A, b, mode)
+    cached = get_cache().get(key)
+    if cached is not None:
+        # Copia: quien llama puede modificar el diccionario (o x)
+        return copy.deepcopy(cached)
+    try:
+        result = _solve_system(A, b, mode, solver)
+    except (np.linalg.LinAlgError, ArithmeticError) as exc:
+        return error_result(exc, mode, A.shape[0])
+    if result["estado"] != "error":
+        get_cache().put(key, copy.deepcopy(result), persist=True)
+    return result
+
+
+class WarmStarts:
+    """Reutiliza un WarmStartSolver mientras los escenarios compartan A
+
+    Los escenarios que solo cambian la demanda (un barrido de
+    demand_scale, una serie de archivos con la misma red) se resuelven
+    con el precondicionador ya armado y desde la solución anterior.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._solver = None
+
+    def solver_for(self, A):
+        key = content_key("arranque_en_caliente", A)
+        if key != self._key:
+            self._key, self._solver = key, WarmStartSolver(A)
+        return self._solver
+
+
+def error_result(exc, mode, n=0):
+    """Resultado de un escenario que no se pudo resolver"""
+    message = exc if isinstance(exc, str) else f"{type(exc).__name__}: {exc}"
+    return {"mode": mode, "n": int(n), "estado": "error", "error": message,
+            "residual": float("nan"), "x": np.full(n, np.nan)}
+
+
+def _solve_system(A, b, mode, solver=None):
+    result = {"mode": mode, "n": int(A.shape[0])}
+    if mode == "direct":
+        analisis = analyze_system(A, b)
+        x = analisis.x
+        if analisis.invertible:
+            estado = "unica"
+        elif analisis.consistent:
+            estado = "consistente"
+        else:
+            estado = "inconsistente"
+        result.update({
+            "estado": estado,
+            "invertible": analisis.invertible,
+            "rank": analisis.rank,
+            "rank_augmented": analisis.rank_augmented,
+            "det": analisis.det,
+            "logabsdet": analisis.logabsdet,
+            "condition": analisis.condition,
+            "path": analisis.path,
+        })
+        if isinstance(analisis, LaplacianAnalysis):
+            result["laplacian"] = {"components": analisis.components,
+                                   "grounded": analisis.grounded.grounded.tolist()}
+    elif mode == "sparse":
+        x = solve_sparse(A, b)
+        result["estado"] = "unica"
+    elif mode == "blocks":
+        x, info = partitioned_solve(A, b)
+        if info["invertible"]:
+            result["estado"] = "unica"
+        else:
+            residual = np.linalg.norm(A @ x - b)
+            consistent = residual <= 1e-8 * max(np.linalg.norm(b), 1.0)
+            result["estado"] = "consistente" if consistent else "inconsistente"
+        result["components"] = info["components"]
+        result["component_sizes"] = info["sizes"]
+    elif mode == "mixed":
+        x, info = mixed_precision_solve(A, b)
+        result["estado"] = "unica"
+        result["precision"] = info["precision"]
+        result["refinement_steps"] = info["refinement_steps"]
+        result["condition"] = info["condition"]
+    else:
+        x, info = solver.solve(b) if solver is not None else iterative_solve(A, b)
+        if info["breakdown"]:
+            return error_result(f"El método {info['method']} se interrumpió con valores no "
+                                "finitos (A singular o indefinida)", mode, A.shape[0])
+        result["estado"] = "unica" if info["converged"] else "no_convergio"
+        result["iterative"] = info
+
+    result["residual"] = float(np.linalg.norm(A @ x - b))
+    result["x"] = x
+    return result
+
+
+def _to_json(value):
+    """Convierte arreglos y escalares de NumPy a tipos serializables en JSON"""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f" and not np.all(np.isfinite(value)):
+            return _to_json(value.tolist())
+        return value.tolist()
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, (np.floating, float)):
+        # JSON no admite inf/nan: se escriben como texto
+        return float(value) if np.isfinite(value) else str(float(value))
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    return value
+
+
+def write_results(results, destination):
+    """Escribe los resultados en JSON (o en la salida estándar) o en NPZ
+
+    En NPZ cada escenario k guarda x_k y un arreglo JSON meta_k con el
+    resto de los campos.
+    """
+    if destination and destination.endswith(".npz"):
+        arrays = {}
+        for k, result in enumerate(results):
+            arrays[f"x_{k}"] = result["x"]
+            meta = {key: v for key, v in result.items() if key != "x"}
+            arrays[f"meta_{k}"] = np.array(json.dumps(_to_json(meta)))
+        np.savez_compressed(destination, **arrays)
+        return
+
+    text = json.dumps([_to_json(r) for r in results], ensure_ascii=False)
+    if destination in (None, "-"):
+        sys.stdout.write(text + "\n")
+    else:
+        with open(destination, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resuelve sistemas Ax = b de redes sin interacción")
+    parser.add_argument("inputs", nargs="*",
+                        help="Escenarios (.npz, .npy, .csv) o '-' para la entrada estándar")
+    parser.add_argument("--A", dest="A", help="Archivo con la matriz A")
+    parser.add_argument("--b", dest="b", help="Archivo con el vector b")
+    parser.add_argument("--mode", choices=MODES, default="direct",
+                        help="Método de resolución (por defecto: direct)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Archivo de salida .json o .npz (por defecto: salida estándar)")
+    parser.add_argument("--profile", help="Reporte JSON de tiempos por fase y por operación")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Incluir asignaciones de memoria (tracemalloc) en el reporte")
+    parser.add_argument("--cprofile", help="Archivo .prof con el perfil completo de cProfile")
+    parser.add_argument("--cache", help="Carpeta de la caché persistente de resultados")
+    args = parser.parse_args(argv)
+
+    sources = list(args.inputs)
+    if args.A:
+        sources.append(args.A)
+    if not sources:
+        parser.error("Debe indicar al menos un escenario, --A o '-'")
+
+    # Sin opciones en la línea de comandos vale la configuración del entorno
+    if args.profile or args.cprofile:
+        profiler = Profiler(memory=args.profile_memory, cprofile=args.cprofile,
+                            report_path=args.profile)
+        set_profiler(profiler)
+    else:
+        profiler = profiler_from_env()
+    if args.cache:
+        set_cache(ResultCache(directory=args.cache))
+
+    results = []
+    warm = WarmStarts()
+    for source in sources:
+        try:
+            with phase(f"carga {source}"):
+                A, b = load_system(source, args.b)
+            solver = warm.solver_for(A) if args.mode == "iterative" else None
+            with phase(f"resolución {source}"):
+                result = solve_system(A, b, args.mode, solver)
+        except (OSError, ValueError, KeyError, np.linalg.LinAlgError) as exc:
+            result = error_result(exc, args.mode)
+        if result["estado"] == "error":
+            print(f"{source}: {result['error']}", file=sys.stderr)
+        result["source"] = source
+        results.append(result)
+
+    with phase("escritura"):
+        write_results(results, args.output)
+    profiler.finish()
+    return 1 if any(r["estado"] == "error" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
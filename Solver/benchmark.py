@@ -0,0 +1,261 @@
+"""Banco de pruebas de rendimiento de los métodos de resolución
+
+Corre cada método sobre una grilla de tamaños de red y de estructuras de
+matriz, y guarda tiempo, memoria pico y residuo ‖Ax − b‖ en un JSON:
+
+    python -m Solver.benchmark -o bench.json
+    python -m Solver.benchmark --sizes 3 100 1000 --structures dense laplacian
+    python -m Solver.benchmark -o nuevo.json --compare bench.json
+
+Con --compare se marcan como regresión los casos que tardan más que en
+la corrida anterior (más allá de --threshold) o cuyo residuo empeora, y
+el programa termina con código 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+from scipy import sparse
+
+from .analysis import analyze_system
+from .cache import set_cache
+from .iterative import iterative_solve
+from .laplacian import solve_laplacian
+from .main import gauss_jordan_step_by_step, inverse_step_by_step
+from .mixed_precision import mixed_precision_solve
+from .sparse_path import solve_sparse
+from .structure import structured_solve
+
+DEFAULT_SIZES = (3, 10, 100, 500, 1000, 2000, 5000)
+STRUCTURES = ("dense", "sparse", "laplacian", "ill_conditioned")
+
+# Tiempo mínimo acumulado por caso para promediar corridas cortas
+MIN_TOTAL_TIME = 0.2
+# Por debajo de este tiempo las diferencias se consideran ruido
+NOISE_FLOOR = 1e-3
+
+
+def make_system(structure, n, seed=0):
+    """Genera un sistema Ax = b reproducible de la estructura pedida
+
+    dense            aleatoria con diagonal dominante
+    sparse           anillo más atajos, pocas conexiones por nodo (CSR)
+    laplacian        laplaciano de un grafo conexo (singular, b consistente)
+    ill_conditioned  valores singulares en escala geométrica hasta 1e-12
+    """
+    rng = np.random.default_rng(seed + n)
+    if structure == "dense":
+        A = rng.normal(size=(n, n))
+        A[np.diag_indices(n)] -= 2.0 * np.sqrt(n)
+    elif structure in ("sparse", "laplacian"):
+        nodes = np.arange(n)
+        shortcuts = rng.integers(0, n, size=n)
+        ring = (nodes + 1) % n
+        w_ring = rng.uniform(0.5, 1.5, size=n)
+        w_shortcut = rng.uniform(0.5, 1.5, size=n)
+        # Enlaces en los dos sentidos: anillo y atajos
+        origen = np.concatenate([nodes, nodes, ring, shortcuts])
+        destino = np.concatenate([ring, shortcuts, nodes, nodes])
+        weights = np.concatenate([w_ring, w_shortcut, w_ring, w_shortcut])
+        # Se arma en CSR, sin pasar por una matriz densa n × n
+        W = sparse.coo_matrix((weights, (origen, destino)), shape=(n, n)).tocsr()
+        W.setdiag(0.0)
+        W.eliminate_zeros()
+        degree = np.asarray(W.sum(axis=1)).ravel()
+        if structure == "sparse":
+            A = (W - sparse.diags(degree + 1.0)).tocsr()
+        else:
+            A = W.toarray() - np.diag(degree)
+    elif structure == "ill_conditioned":
+        Q1, _ = np.linalg.qr(rng.normal(size=(n, n)))
+        Q2, _ = np.linalg.qr(rng.normal(size=(n, n)))
+        A = (Q1 * np.logspace(0, -12, n)) @ Q2.T
+    else:
+        raise ValueError(f"Estructura desconocida: {structure!r}")
+
+    x_true = rng.normal(size=n)
+    b = A @ x_true
+    return A, b
+
+
+def _legacy_pipeline(A, b):
+    """Fases 2 y 3 originales: det, dos matrix_rank e inv o pinv"""
+    det_A = np.linalg.det(A)
+    np.linalg.matrix_rank(A)
+    np.linalg.matrix_rank(np.column_stack((A, b)))
+    if abs(det_A) > 1e-10:
+        return np.dot(np.linalg.inv(A), b)
+    return np.dot(np.linalg.pinv(A), b)
+
+
+# Métodos a medir, tamaño máximo razonable de cada uno y si aceptan A
+# dispersa (a los demás se les pasa la versión densa)
+SOLVERS = {
+    "gauss_jordan": (lambda A, b: gauss_jordan_step_by_step(A, b, show_steps=False), 5000, False),
+    "gauss_jordan_inverse": (lambda A, b: inverse_step_by_step(A, show_steps=False) @ b, 2000,
+                             False),
+    "numpy_solve": (np.linalg.solve, 5000, False),
+    "numpy_inv": (lambda A, b: np.linalg.inv(A) @ b, 5000, False),
+    "numpy_pinv": (lambda A, b: np.linalg.pinv(A) @ b, 2000, False),
+    "legacy_pipeline": (_legacy_pipeline, 2000, False),
+    "analysis": (lambda A, b: analyze_system(A, b).x, 5000, True),
+    "mixed_precision": (lambda A, b: mixed_precision_solve(A, b)[0], 5000, False),
+    "structured": (lambda A, b: structured_solve(A, b)[0], 5000, True),
+    "sparse_lu": (solve_sparse, 5000, True),
+    "laplacian": (lambda A, b: solve_laplacian(A, b)[0], 5000, True),
+    # Iteraciones acotadas: en los casos mal condicionados interesa cuánto
+    # residuo queda, no esperar a que GMRES agote 10·n iteraciones
+    "iterative": (lambda A, b: iterative_solve(A, b, maxiter=100)[0], 5000, True),
+}
+
+
+def measure(solver, A, b, repeat=None):
+    """Mide un método: mejor tiempo, memoria pico y residuo
+
+    Returns:
+        Diccionario con time_s, peak_mem_mb, residual y error (o None)
+    """
+    try:
+        # Memoria pico en una corrida aparte: tracemalloc altera los tiempos
+        tracemalloc.start()
+        x = solver(A, b)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        times = []
+        while True:
+            start = time.perf_counter()
+            solver(A, b)
+            times.append(time.perf_counter() - start)
+            if repeat is not None:
+                if len(times) >= repeat:
+                    break
+            elif sum(times) >= MIN_TOTAL_TIME or len(times) >= 50:
+                break
+    except Exception as exc:  # Un método que falla no detiene el banco
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {"time_s": None, "peak_mem_mb": None, "residual": None,
+                "error": f"{type(exc).__name__}: {exc}"}
+
+    residual = float(np.linalg.norm(A @ np.asarray(x) - b))
+    return {"time_s": min(times), "peak_mem_mb": peak / 2**20,
+            "residual": residual if np.isfinite(residual) else str(residual),
+            "error": None}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, structures=STRUCTURES, solvers=None,
+                   repeat=None, limits=True, seed=0, log=sys.stderr):
+    """Corre todos los métodos sobre la grilla y devuelve el reporte completo"""
+    solvers = solvers or list(SOLVERS)
+    results = []
+    # Sin caché: las repeticiones de measure medirían solo el hash de A
+    previous_cache = set_cache(None)
+    try:
+        _run_grid(sizes, structures, solvers, repeat, limits, seed, log, results)
+    finally:
+        set_cache(previous_cache)
+    return {"meta": _environment(seed), "results": results}
+
+
+def _run_grid(sizes, structures, solvers, repeat, limits, seed, log, results):
+    for structure in structures:
+        for n in sizes:
+            A, b = make_system(structure, n, seed)
+            dense = None
+            for name in solvers:
+                solver, max_n, accepts_sparse = SOLVERS[name]
+                if limits and n > max_n:
+                    continue
+                A_in = A
+                if sparse.issparse(A) and not accepts_sparse:
+                    dense = A.toarray() if dense is None else dense
+                    A_in = dense
+                row = {"structure": structure, "n": n, "solver": name}
+                row.update(measure(solver, A_in, b, repeat))
+                results.append(row)
+                if log is not None:
+                    shown = "error" if row["error"] else f"{row['time_s']:.4g} s"
+                    print(f"{structure:>16} {n:>6} {name:>22}: {shown}", file=log)
+
+
+def _environment(seed):
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(previous, current, threshold=0.25):
+    """Compara dos reportes y devuelve la lista de regresiones
+
+    Es regresión si el tiempo crece más de threshold (relativo), si el
+    residuo crece más de 10 veces por encima de 1e-8, o si un método que
+    funcionaba ahora falla.
+    """
+    before = {(r["structure"], r["n"], r["solver"]): r for r in previous["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = before.get((row["structure"], row["n"], row["solver"]))
+        if old is None or old["error"]:
+            continue
+        key = f"{row['structure']} n={row['n']} {row['solver']}"
+        if row["error"]:
+            regressions.append(f"{key}: ahora falla ({row['error']})")
+            continue
+        t_old, t_new = old["time_s"], row["time_s"]
+        if t_new > NOISE_FLOOR and t_new > t_old * (1.0 + threshold):
+            regressions.append(f"{key}: tiempo {t_old:.4g} s → {t_new:.4g} s")
+        r_old, r_new = old["residual"], row["residual"]
+        if isinstance(r_old, float) and isinstance(r_new, float):
+            if r_new > 1e-8 and r_new > 10.0 * max(r_old, 1e-300):
+                regressions.append(f"{key}: residuo {r_old:.2e} → {r_new:.2e}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los métodos de resolución")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--structures", nargs="+", choices=STRUCTURES, default=list(STRUCTURES))
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=None)
+    parser.add_argument("--repeat", type=int, default=None,
+                        help="Corridas por caso (por defecto, hasta acumular 0.2 s)")
+    parser.add_argument("--no-limits", action="store_true",
+                        help="No omitir métodos lentos en tamaños grandes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Reporte anterior contra el cual comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Aumento relativo de tiempo tolerado (por defecto 0.25)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.structures, args.solvers,
+                            args.repeat, not args.no_limits, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        regressions = compare(previous, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        if regressions:
+            return 1
+        print("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
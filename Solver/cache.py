@@ -0,0 +1,251 @@
+"""Caché de resultados direccionada por contenido
+
+Los mismos escenarios (misma A, misma b) se resuelven una y otra vez. La
+clave de cada resultado es un hash de los bytes de A y b y de los
+parámetros que lo determinan (modo, tolerancia, ...), de modo que no
+importa de dónde salió la matriz: si el contenido es igual, el resultado
+también.
+
+En memoria se guardan objetos cualquiera (factorizaciones, análisis) con
+desalojo LRU acotado en bytes. En disco, opcional, se guardan los
+resultados que son diccionarios de arreglos y escalares (los de
+batch.solve_system), en .npz sin pickle, con un tope de tamaño total:
+
+    SOLVER_CACHE=0                   desactiva la caché
+    SOLVER_CACHE_MB=256              memoria para la caché en RAM
+    SOLVER_CACHE_DIR=cache/          además, caché persistente en disco
+    SOLVER_CACHE_DISK_MB=1024        tope del directorio de la caché
+"""
+import collections
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+DEFAULT_MEMORY_BYTES = 256 * 2**20
+DEFAULT_DISK_BYTES = 1024 * 2**20
+
+
+def _update_array(h, array):
+    array = np.asarray(array)
+    if array.dtype.kind in "biu":
+        array = array.astype(float)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    h.update(np.ascontiguousarray(array).data)
+
+
+def content_key(*parts):
+    """Hash (hex) del contenido de arreglos densos o dispersos y de escalares
+
+    Las matrices enteras se comparan como las de punto flotante con los
+    mismos valores; las dispersas, por su forma CSR canónica.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if sparse.issparse(part):
+            M = sparse.csr_matrix(part, dtype=float, copy=True)
+            M.sum_duplicates()
+            M.sort_indices()
+            h.update(f"csr{M.shape}".encode())
+            for array in (M.indptr.astype(np.int64), M.indices.astype(np.int64), M.data):
+                h.update(np.ascontiguousarray(array).data)
+        elif isinstance(part, (np.ndarray, list)):
+            _update_array(h, part)
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def nbytes(value, _depth=0):
+    """Memoria aproximada de un resultado: la de los arreglos que contiene"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if sparse.issparse(value):
+        return sum(a.nbytes for a in (value.data, getattr(value, "indices", value.data),
+                                      getattr(value, "indptr", value.data)))
+    if isinstance(value, sparse_linalg.SuperLU):
+        # No tiene __dict__: se cuentan sus factores L y U y las permutaciones
+        return (nbytes(value.L) + nbytes(value.U)
+                + value.perm_r.nbytes + value.perm_c.nbytes)
+    if _depth > 3:
+        return 0
+    if isinstance(value, dict):
+        return sum(nbytes(v, _depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v, _depth + 1) for v in value)
+    if hasattr(value, "__dict__"):
+        return nbytes(vars(value), _depth + 1)
+    return 0
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"No se puede guardar {type(value).__name__} en la caché")
+
+
+class ResultCache:
+    """Caché LRU en memoria, con respaldo opcional en disco
+
+    Es segura entre hilos (partition resuelve bloques en paralelo).
+
+    Args:
+        memory_bytes: Memoria máxima de los objetos en RAM
+        directory: Carpeta de la caché persistente, o None
+        disk_bytes: Tamaño máximo de la carpeta; se borran primero los
+            archivos usados hace más tiempo
+        enabled: Si es False, get no encuentra nada y put no guarda
+    """
+
+    def __init__(self, memory_bytes=DEFAULT_MEMORY_BYTES, directory=None,
+                 disk_bytes=DEFAULT_DISK_BYTES, enabled=True):
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key, default=None):
+        """Resultado guardado con esa clave (en memoria o en disco)"""
+        if not self.enabled:
+            return default
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        value = self._read(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value, persist=False):
+        """Guarda value; con persist=True también en disco (si hay carpeta)
+
+        Solo se pueden persistir diccionarios de arreglos y de valores
+        que se puedan escribir en JSON.
+        """
+        if not self.enabled:
+            return
+        self._remember(key, value)
+        if persist and self.directory:
+            self._write(key, value)
+
+    def get_or_compute(self, key, compute, persist=False):
+        """Devuelve el resultado guardado o lo calcula y lo guarda"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, persist)
+        return value
+
+    def clear(self):
+        """Vacía la caché en memoria (la de disco se conserva)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key, value):
+        size = nbytes(value)
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.memory_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._size -= old_size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                value = json.loads(str(data["__meta__"]))
+                value.update({name: data[name] for name in data.files if name != "__meta__"})
+            os.utime(path)  # El orden LRU del disco es el de la fecha de uso
+        except (OSError, KeyError, ValueError):
+            return None
+        return value
+
+    def _write(self, key, value):
+        arrays = {k: v for k, v in value.items() if isinstance(v, np.ndarray)}
+        meta = {k: v for k, v in value.items() if k not in arrays}
+        buffer = io.BytesIO()
+        np.savez(buffer, __meta__=np.array(json.dumps(meta, default=_json_default)), **arrays)
+        if buffer.tell() > self.disk_bytes:
+            return
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp, self._path(key))
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def cache_from_env(environ=None):
+    """Crea la caché según SOLVER_CACHE, SOLVER_CACHE_DIR y compañía"""
+    environ = os.environ if environ is None else environ
+    memory_mb = float(environ.get("SOLVER_CACHE_MB") or DEFAULT_MEMORY_BYTES / 2**20)
+    disk_mb = float(environ.get("SOLVER_CACHE_DISK_MB") or DEFAULT_DISK_BYTES / 2**20)
+    return ResultCache(memory_bytes=int(memory_mb * 2**20),
+                       directory=environ.get("SOLVER_CACHE_DIR") or None,
+                       disk_bytes=int(disk_mb * 2**20),
+                       enabled=environ.get("SOLVER_CACHE", "1") != "0")
+
+
+# Caché activa: la consultan analyze_system, solve_system y NetworkOptimizer
+_active = cache_from_env()
+
+
+def get_cache():
+    return _active
+
+
+def set_cache(cache):
+    """Activa una caché (o una desactivada con None) y devuelve la anterior"""
+    global _active
+    previous = _active
+    _active = cache if cache is not None else ResultCache(enabled=False)
+    return previous
@@ -0,0 +1,234 @@
+import numpy as np
+
+from .profiling import estimate_flops, operation
+
+TOLERANCIA = 1e-10
+
+
+def augmented_buffer(A, B):
+    """Reserva la matriz aumentada [A|B] en un solo buffer
+
+    Evita las copias intermedias de np.column_stack: A y B se escriben
+    directamente en su bloque del buffer preasignado.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    if B.ndim == 1:
+        B = B[:, None]
+    n = A.shape[0]
+    M = np.empty((n, A.shape[1] + B.shape[1]))
+    M[:, :A.shape[1]] = A
+    M[:, A.shape[1]:] = B
+    return M
+
+
+def gauss_jordan_steps(M, n, pivoting=True, tol=TOLERANCIA, detailed=False, block=64):
+    """Motor de Gauss-Jordan que trabaja en sitio sobre la matriz aumentada M
+
+    Las primeras n columnas de M se reducen a la identidad y las demás
+    quedan con la solución. Es un generador que va entregando las
+    operaciones realizadas:
+        ("pivote", i)                 inicio de la columna i
+        ("intercambio", i, k)         se intercambian las filas i y k
+        ("singular", i)               pivote ≈ 0, se salta la columna
+        ("escala", i, pivote)         la fila i se divide entre el pivote
+        ("elimina", j, i, factor)     F[j] = F[j] - factor × F[i]
+        ("elimina_bloque", filas, i, factores)
+                                      lo mismo para varias filas a la vez
+        ("fin_columna", i)            terminó la eliminación de la columna i
+        ("atras",)                    inicio de la eliminación hacia atrás
+
+    Con detailed=True se opera fila por fila, de modo que M refleja cada
+    operación en el momento en que se entrega (modo paso a paso).
+
+    Con detailed=False cada columna pivote se elimina con una sola
+    actualización de rango 1 restringida a un panel de `block` columnas;
+    el resto de la matriz recibe las actualizaciones del panel acumuladas
+    en un único producto matricial. Así el costo lo domina BLAS y no el
+    intérprete, pero M solo es consistente al terminar el generador.
+    """
+    if detailed:
+        yield from _forward_by_rows(M, n, pivoting, tol)
+    else:
+        yield from _forward_blocked(M, n, pivoting, tol, block)
+
+    # Eliminación hacia atrás
+    yield ("atras",)
+    if detailed:
+        yield from _backward_by_rows(M, n, tol)
+    elif np.any(np.abs(np.diagonal(M)[:n]) < tol):
+        # Con columnas sin pivote la parte inferior de A no quedó en cero
+        yield from _backward_full_rows(M, n, tol)
+    else:
+        yield from _backward_blocked(M, n, tol, block)
+
+
+def _find_pivot(M, i, n):
+    """Fila con el mayor valor absoluto en la columna i (pivoteo parcial)"""
+    max_row = i + int(np.argmax(np.abs(M[i:n, i])))
+    if abs(M[max_row, i]) > abs(M[i, i]):
+        return max_row
+    return i
+
+
+def _forward_by_rows(M, n, pivoting, tol):
+    """Eliminación hacia adelante fila por fila (modo paso a paso)"""
+    for i in range(n):
+        yield ("pivote", i)
+
+        # Encontrar el pivote
+        max_row = _find_pivot(M, i, n) if pivoting else i
+        if max_row != i:
+            M[[i, max_row]] = M[[max_row, i]]
+            yield ("intercambio", i, max_row)
+
+        # Hacer el pivote igual a 1
+        pivot = M[i, i]
+        if abs(pivot) < tol:
+            yield ("singular", i)
+            continue
+
+        if abs(pivot - 1.0) > tol:
+            M[i] /= pivot
+            yield ("escala", i, pivot)
+
+        # Eliminar elementos debajo del pivote
+        for j in range(i + 1, n):
+            if abs(M[j, i]) > tol:
+                factor = M[j, i]
+                M[j] -= factor * M[i]
+                yield ("elimina", j, i, factor)
+
+        yield ("fin_columna", i)
+
+
+def _forward_blocked(M, n, pivoting, tol, block):
+    """Eliminación hacia adelante por paneles de columnas"""
+    # Multiplicadores del panel actual, una columna por pivote
+    F = np.zeros((n, block))
+
+    for p0 in range(0, n, block):
+        p1 = min(p0 + block, n)
+        F.fill(0.0)
+
+        for i in range(p0, p1):
+            k = i - p0
+            yield ("pivote", i)
+
+            # Encontrar el pivote
+            max_row = _find_pivot(M, i, n) if pivoting else i
+            if max_row != i:
+                M[[i, max_row]] = M[[max_row, i]]
+                F[[i, max_row]] = F[[max_row, i]]
+                yield ("intercambio", i, max_row)
+
+            # Aplicar a la fila pivote las actualizaciones pendientes
+            # del panel en las columnas que están fuera de él
+            if k:
+                M[i, p1:] -= F[i, :k] @ M[p0:i, p1:]
+
+            # Hacer el pivote igual a 1
+            pivot = M[i, i]
+            if abs(pivot) < tol:
+                yield ("singular", i)
+                continue
+
+            if abs(pivot - 1.0) > tol:
+                M[i, i:] /= pivot
+                yield ("escala", i, pivot)
+
+            # Eliminar elementos debajo del pivote: una actualización de
+            # rango 1 sobre las columnas del panel
+            factors = M[i + 1:, i].copy()
+            factors[np.abs(factors) <= tol] = 0.0
+            M[i + 1:, i:p1] -= np.outer(factors, M[i, i:p1])
+            F[i + 1:, k] = factors
+
+            targets = np.flatnonzero(factors)
+            if targets.size:
+                yield ("elimina_bloque", targets + i + 1, i, factors[targets])
+            yield ("fin_columna", i)
+
+        # Actualización acumulada del resto de la matriz (BLAS-3)
+        if p1 < n:
+            M[p1:, p1:] -= F[p1:, :p1 - p0] @ M[p0:p1, p1:]
+
+
+def _backward_by_rows(M, n, tol):
+    """Eliminación hacia atrás fila por fila (modo paso a paso)"""
+    for i in range(n - 1, -1, -1):
+        for j in range(i - 1, -1, -1):
+            if abs(M[j, i]) > tol:
+                factor = M[j, i]
+                M[j] -= factor * M[i]
+                yield ("elimina", j, i, factor)
+
+
+def _backward_full_rows(M, n, tol):
+    """Eliminación hacia atrás con una actualización de rango 1 por columna"""
+    for i in range(n - 1, -1, -1):
+        factors = M[:i, i].copy()
+        factors[np.abs(factors) <= tol] = 0.0
+        targets = np.flatnonzero(factors)
+        if targets.size:
+            M[:i] -= np.outer(factors, M[i])
+            yield ("elimina_bloque", targets[::-1], i, factors[targets][::-1])
+
+
+def _backward_blocked(M, n, tol, block):
+    """Eliminación hacia atrás por paneles de columnas
+
+    Las columnas de A a la derecha de i en la fila i ya son cero, así que
+    cada pivote solo modifica la columna i y las columnas aumentadas.
+    """
+    # Multiplicadores de las filas por encima del panel actual
+    G = np.zeros((n, block))
+
+    for q1 in range(n, 0, -block):
+        q0 = max(q1 - block, 0)
+        G.fill(0.0)
+
+        for i in range(q1 - 1, q0 - 1, -1):
+            factors = M[:i, i].copy()
+            factors[np.abs(factors) <= tol] = 0.0
+            targets = np.flatnonzero(factors)
+            if targets.size == 0:
+                continue
+
+            # Filas del panel: actualización de rango 1 inmediata
+            inner = factors[q0:]
+            M[q0:i, i] -= inner * M[i, i]
+            M[q0:i, n:] -= np.outer(inner, M[i, n:])
+            # Filas por encima del panel: se acumulan en G
+            G[:q0, i - q0] = factors[:q0]
+
+            yield ("elimina_bloque", targets[::-1], i, factors[targets][::-1])
+
+        # Actualización acumulada de las filas por encima del panel (BLAS-3)
+        if q0:
+            W = G[:q0, :q1 - q0]
+            M[:q0, q0:q1] -= W * np.diagonal(M[q0:q1, q0:q1])
+            M[:q0, n:] -= W @ M[q0:q1, n:]
+
+
+def gauss_jordan(M, n, pivoting=True, tol=TOLERANCIA):
+    """Ejecuta el motor completo sin mostrar pasos y devuelve M reducida"""
+    with operation("gauss_jordan", estimate_flops("gauss_jordan", n, M.shape[1] - n)):
+        for _ in gauss_jordan_steps(M, n, pivoting, tol):
+            pass
+    return M
+
+
+def solve(A, b, pivoting=True, tol=TOLERANCIA):
+    """Resuelve Ax = b (o AX = B) con el motor vectorizado"""
+    n = len(A)
+    M = gauss_jordan(augmented_buffer(A, b), n, pivoting, tol)
+    x = M[:, n:]
+    return x[:, 0].copy() if np.ndim(b) == 1 else x.copy()
+
+
+def inverse(A, pivoting=True, tol=TOLERANCIA):
+    """Calcula A⁻¹ reduciendo [A|I] con el motor vectorizado"""
+    n = len(A)
+    M = gauss_jordan(augmented_buffer(A, np.eye(n)), n, pivoting, tol)
+    return M[:, n:].copy()
@@ -0,0 +1,233 @@
+import math
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+from .profiling import operation
+
+# Tolerancia del residuo relativo ‖b - Ax‖ / ‖b‖
+TOLERANCIA_RESIDUO = 1e-8
+
+# Redes de este tamaño o más: la Fase 3 no forma ni muestra A⁻¹
+ITERATIVE_MIN_NODES = 2000
+
+# Iteraciones de GMRES entre reinicios (el valor por defecto de SciPy)
+GMRES_RESTART = 20
+
+METHODS = ("cg", "gmres", "bicgstab")
+PRECONDITIONERS = (None, "jacobi", "ilu")
+
+
+def _as_operator_matrix(A):
+    """Deja A como CSR si es dispersa y como arreglo denso en otro caso"""
+    if sparse.issparse(A):
+        return sparse.csr_matrix(A, dtype=float)
+    return np.asarray(A, dtype=float)
+
+
+def is_symmetric(A, tol=1e-12):
+    """Comprueba si A es simétrica (densa o dispersa)"""
+    if sparse.issparse(A):
+        diff = (A - A.T).tocsr()
+        return diff.nnz == 0 or np.max(np.abs(diff.data)) <= tol
+    return np.allclose(A, A.T, atol=tol, rtol=0.0)
+
+
+def is_diagonally_dominant(A):
+    """|a_ii| ≥ Σ_j≠i |a_ij| en todas las filas (densa o dispersa)"""
+    d = np.abs(np.asarray(A.diagonal(), dtype=float))
+    row_sums = np.asarray(abs(A).sum(axis=1), dtype=float).ravel()
+    return bool(np.all(2.0 * d >= row_sums))
+
+
+def _definite_sign(A):
+    """+1 o -1 si la diagonal tiene un solo signo (candidata a CG), 0 si no"""
+    d = A.diagonal()
+    if np.all(d > 0):
+        return 1.0
+    if np.all(d < 0):
+        return -1.0
+    return 0.0
+
+
+def jacobi_preconditioner(A):
+    """Precondicionador de Jacobi: M⁻¹ = diag(A)⁻¹"""
+    d = np.asarray(A.diagonal(), dtype=float).copy()
+    d[np.abs(d) < 1e-300] = 1.0
+    inv_d = 1.0 / d
+    n = A.shape[0]
+    return sparse_linalg.LinearOperator((n, n), matvec=lambda v: inv_d * np.ravel(v),
+                                        dtype=float)
+
+
+def ilu_preconditioner(A, drop_tol=1e-4, fill_factor=10):
+    """Precondicionador de factorización incompleta ILU (SuperLU)"""
+    ilu = sparse_linalg.spilu(sparse.csc_matrix(A, dtype=float),
+                              drop_tol=drop_tol, fill_factor=fill_factor)
+    n = A.shape[0]
+    return sparse_linalg.LinearOperator((n, n), matvec=ilu.solve, dtype=float)
+
+
+def make_preconditioner(A, kind="jacobi"):
+    """Construye el precondicionador pedido (None, "jacobi" o "ilu")"""
+    if kind is None:
+        return None
+    if kind == "jacobi":
+        return jacobi_preconditioner(A)
+    if kind == "ilu":
+        return ilu_preconditioner(A)
+    raise ValueError(f"Precondicionador desconocido: {kind!r}")
+
+
+def choose_method(A):
+    """Método de Krylov para A según lo que se puede asegurar de ella
+
+    CG solo si A (o -A) es simétrica y definida: diagonal de un solo signo
+    y diagonal dominante (por Gershgorin todos los autovalores tienen ese
+    signo). Una simétrica que no cumple esto puede ser indefinida, y ahí
+    CG diverge o se estanca. BiCGSTAB para las no simétricas diagonal
+    dominantes (memoria fija y convergencia rápida) y GMRES, el más
+    robusto, en cualquier otro caso.
+    """
+    dominant = is_diagonally_dominant(A) and _definite_sign(A) != 0.0
+    if dominant and is_symmetric(A):
+        return "cg"
+    if dominant:
+        return "bicgstab"
+    return "gmres"
+
+
+def iterative_solve(A, b, method="auto", preconditioner="jacobi",
+                    tol=TOLERANCIA_RESIDUO, maxiter=None, x0=None, M=None):
+    """Resuelve Ax = b con un método iterativo de Krylov
+
+    Args:
+        A: Matriz del sistema (densa o dispersa)
+        b: Vector de demanda
+        method: "cg", "gmres", "bicgstab" o "auto" (choose_method; si el
+            método elegido no converge se intenta con GMRES)
+        preconditioner: None, "jacobi" o "ilu" (se ignora si se pasa M)
+        tol: Tolerancia del residuo relativo ‖b - Ax‖ / ‖b‖
+        maxiter: Máximo de iteraciones en total (por defecto 10·n); en
+            GMRES se reparte en ciclos de GMRES_RESTART iteraciones
+        x0: Aproximación inicial (arranque en caliente)
+        M: Precondicionador ya construido, para reutilizarlo entre llamadas
+
+    Returns:
+        Tupla (x, info) donde info tiene method, preconditioner, iterations,
+        residual, converged y breakdown (True si el método produjo valores
+        no finitos, típico de una A singular o indefinida)
+    """
+    A = _as_operator_matrix(A)
+    b = np.asarray(b, dtype=float)
+    n = A.shape[0]
+    if method == "auto":
+        method = choose_method(A)
+        x, info = iterative_solve(A, b, method, preconditioner, tol, maxiter, x0, M)
+        if info["converged"] or method == "gmres":
+            return x, info
+        # El precondicionador de CG puede ser el de -A: GMRES arma el suyo
+        M = M if _definite_sign(A) > 0 or method != "cg" else None
+        return iterative_solve(A, b, "gmres", preconditioner, tol, maxiter, x0, M)
+    if method not in METHODS:
+        raise ValueError(f"Método iterativo desconocido: {method!r}")
+    if maxiter is None:
+        maxiter = 10 * n
+
+    # CG necesita una matriz definida positiva: las matrices de
+    # conectividad con diagonal negativa se resuelven como (-A)x = -b
+    sign = 1.0
+    if method == "cg":
+        sign = _definite_sign(A) or 1.0
+    A_op = A if sign > 0 else -A
+    b_op = b if sign > 0 else -b
+
+    if M is None:
+        M = make_preconditioner(A_op, preconditioner)
+
+    iterations = [0]
+
+    def count(_):
+        iterations[0] += 1
+
+    options = dict(x0=x0, rtol=tol, atol=0.0, maxiter=maxiter, M=M, callback=count)
+    # Con A singular los métodos pueden dividir por cero: el resultado se
+    # revisa abajo en lugar de llenar la salida de advertencias
+    with operation(f"krylov_{method}"), np.errstate(all="ignore"):
+        if method == "cg":
+            x, status = sparse_linalg.cg(A_op, b_op, **options)
+        elif method == "bicgstab":
+            x, status = sparse_linalg.bicgstab(A_op, b_op, **options)
+        else:
+            # El maxiter de SciPy cuenta ciclos de reinicio, no iteraciones
+            options["maxiter"] = max(1, math.ceil(maxiter / GMRES_RESTART))
+            x, status = sparse_linalg.gmres(A_op, b_op, restart=GMRES_RESTART,
+                                            callback_type="pr_norm", **options)
+        breakdown = not np.all(np.isfinite(x))
+        norm_b = np.linalg.norm(b)
+        residual = np.inf if breakdown else np.linalg.norm(b - A @ x) / (norm_b if norm_b > 0 else 1.0)
+
+    info = {
+        "method": method,
+        "preconditioner": preconditioner if preconditioner else "ninguno",
+        "iterations": iterations[0],
+        "residual": float(residual),
+        "converged": status == 0 and not breakdown,
+        "breakdown": breakdown,
+    }
+    return x, info
+
+
+class WarmStartSolver:
+    """Solucionador iterativo que reutiliza la solución anterior
+
+    Guarda el precondicionador de A y la última solución x. Cuando solo
+    cambia b (por ejemplo una demanda de tráfico ligeramente distinta),
+    la nueva resolución arranca desde α·x, con α el múltiplo del b
+    anterior más cercano al nuevo, y converge en pocas iteraciones (una
+    demanda escalada no necesita ninguna).
+
+    Con method="auto", si el método elegido no converge se intenta con
+    GMRES, que queda como método para las resoluciones siguientes.
+    """
+
+    def __init__(self, A, method="auto", preconditioner="jacobi",
+                 tol=TOLERANCIA_RESIDUO, maxiter=None):
+        self.A = _as_operator_matrix(A)
+        self.auto = method == "auto"
+        self.method = choose_method(self.A) if self.auto else method
+        self.preconditioner = preconditioner
+        self.tol = tol
+        self.maxiter = maxiter
+        self.x = None
+        self.b = None
+        self.last_info = None
+
+        sign = _definite_sign(self.A) if self.method == "cg" else 1.0
+        A_op = self.A if sign >= 0 else -self.A
+        self._M = make_preconditioner(A_op, preconditioner)
+        self._M_gmres = self._M if sign >= 0 else None
+
+    def solve(self, b):
+        """Resuelve Ax = b partiendo de la última solución encontrada"""
+        b = np.asarray(b, dtype=float)
+        x0 = None
+        if self.x is not None:
+            # A(α x) = α b_anterior: el α que deja el menor residuo inicial
+            norm2 = float(self.b @ self.b)
+            x0 = self.x * (float(b @ self.b) / norm2) if norm2 > 0 else self.x
+        x, info = iterative_solve(self.A, b, self.method, self.preconditioner,
+                                  self.tol, self.maxiter, x0=x0, M=self._M)
+        if self.auto and not info["converged"] and self.method != "gmres":
+            # Como en iterative_solve: si el método elegido no converge, GMRES
+            if self._M_gmres is None:
+                self._M_gmres = make_preconditioner(self.A, self.preconditioner)
+            x, info = iterative_solve(self.A, b, "gmres", self.preconditioner,
+                                      self.tol, self.maxiter, x0=x0, M=self._M_gmres)
+            if info["converged"]:
+                self.method, self._M = "gmres", self._M_gmres
+        self.last_info = info
+        if info["converged"]:
+            self.x, self.b = x, b
+        return x, info
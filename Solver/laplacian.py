@@ -0,0 +1,222 @@
+import numpy as np
+from scipy import linalg, sparse
+from scipy.sparse import csgraph
+from scipy.sparse import linalg as sparse_linalg
+
+from .profiling import operation
+from .sparse_path import is_sparse_candidate
+
+TOLERANCIA = 1e-10
+
+
+def _offdiagonal(A):
+    """Parte fuera de la diagonal de A, en formato CSR"""
+    A = sparse.csr_matrix(A, dtype=float)
+    return (A - sparse.diags(A.diagonal())).tocsr()
+
+
+def laplacian_sign(A, tol=TOLERANCIA):
+    """Indica si A = ±L, con L el laplaciano de un grafo con pesos positivos
+
+    Las filas de A deben sumar cero, A debe ser simétrica y los elementos
+    fuera de la diagonal deben tener todos signo contrario al de la
+    diagonal. La matriz de conectividad del proyecto, con diagonal
+    negativa, es A = -L.
+
+    Returns:
+        +1.0 si A = L, -1.0 si A = -L, 0.0 si A no es un laplaciano
+    """
+    if A.shape[0] != A.shape[1] or A.shape[0] == 0:
+        return 0.0
+    diag = A.diagonal() if sparse.issparse(A) else np.diagonal(A)
+    scale = max(float(np.max(np.abs(diag))), 1.0)
+    atol = tol * scale * A.shape[0]
+
+    row_sums = np.asarray(A.sum(axis=1)).ravel()
+    if np.max(np.abs(row_sums)) > atol:
+        return 0.0
+    if sparse.issparse(A):
+        asymmetry = abs(A - A.T).max() if A.nnz else 0.0
+    else:
+        asymmetry = np.max(np.abs(A - A.T))
+    if asymmetry > atol:
+        return 0.0
+
+    off = _offdiagonal(A).data
+    if np.all(off >= -atol) and np.all(diag <= atol):
+        return -1.0
+    if np.all(off <= atol) and np.all(diag >= -atol):
+        return 1.0
+    return 0.0
+
+
+def is_laplacian(A, tol=TOLERANCIA):
+    """True si A (o -A) es el laplaciano de una red (ver laplacian_sign)"""
+    return laplacian_sign(A, tol) != 0.0
+
+
+class GroundedLaplacian:
+    """Factorización de un laplaciano con un nodo a tierra por componente
+
+    L es singular: cada componente conexa aporta el vector constante a su
+    núcleo. Fijando x = 0 en un nodo de cada componente (el de mayor
+    grado) el sistema reducido es definido positivo y se factoriza con
+    Cholesky (o con el LU disperso si la red es grande y dispersa).
+    Restando después la media de cada componente se obtiene la solución
+    de norma mínima, la misma que da la pseudo-inversa.
+
+    Args:
+        A: Matriz de conectividad (densa o dispersa) con A = ±L
+        tol: Tolerancia de las comprobaciones
+
+    Raises:
+        ValueError: Si A no es un laplaciano
+    """
+
+    def __init__(self, A, tol=TOLERANCIA):
+        self.sign = laplacian_sign(A, tol)
+        if self.sign == 0.0:
+            raise ValueError("La matriz A no es un laplaciano (filas que no suman cero)")
+        self.n = A.shape[0]
+        self.tol = tol
+
+        off = _offdiagonal(A)
+        self.num_components, self.labels = csgraph.connected_components(
+            off, directed=False)
+        self.sizes = np.bincount(self.labels, minlength=self.num_components)
+
+        # Nodo a tierra: el de mayor grado de cada componente
+        degree = np.abs(A.diagonal() if sparse.issparse(A) else np.diagonal(A))
+        order = np.lexsort((-degree, self.labels))
+        first = np.r_[0, np.cumsum(self.sizes)[:-1]]
+        self.grounded = np.sort(order[first])
+        self.free = np.setdiff1d(np.arange(self.n), self.grounded)
+
+        # Matriz indicadora de componentes (n × k) para medias y sumas
+        self._indicator = sparse.csr_matrix(
+            (np.ones(self.n), (np.arange(self.n), self.labels)),
+            shape=(self.n, self.num_components))
+
+        with operation("laplaciano_tierra"):
+            self._factor(A)
+
+    def _factor(self, A):
+        free = self.free
+        if free.size == 0:
+            self._kind = "vacio"
+            return
+        if sparse.issparse(A) or is_sparse_candidate(A):
+            L_red = (self.sign * sparse.csr_matrix(A, dtype=float))[free][:, free]
+            try:
+                self._lu = sparse_linalg.splu(L_red.tocsc())
+            except RuntimeError as exc:
+                raise np.linalg.LinAlgError("Laplaciano reducido singular") from exc
+            self._kind = "splu"
+        else:
+            L_red = self.sign * np.asarray(A, dtype=float)[np.ix_(free, free)]
+            self._cho = linalg.cho_factor(L_red, check_finite=False)
+            self._kind = "cholesky"
+
+    def component_sums(self, b):
+        """Demanda neta de cada componente conexa (debe ser cero)"""
+        return self._indicator.T @ np.asarray(b, dtype=float)
+
+    def is_consistent(self, b):
+        """Ax = b tiene solución si la demanda de cada componente suma cero"""
+        b = np.asarray(b, dtype=float)
+        sums = self.component_sums(b)
+        scale = max(float(np.max(np.abs(b))) if b.size else 0.0, 1.0)
+        return bool(np.all(np.abs(sums) <= self.tol * scale * self.n))
+
+    def _remove_means(self, X):
+        """Resta a cada componente su media (proyección fuera del núcleo)"""
+        sums = self._indicator.T @ X
+        means = sums / (self.sizes if X.ndim == 1 else self.sizes[:, None])
+        return X - self._indicator @ means
+
+    def solve(self, B):
+        """Solución de norma mínima de AX = B (de mínimos cuadrados si B no
+        es consistente), igual a A⁺B"""
+        B = np.asarray(B, dtype=float)
+        # Proyectar B sobre la imagen de A: demanda neta cero por componente
+        B = self._remove_means(B)
+        X = np.zeros_like(B)
+        if self._kind != "vacio":
+            rhs = self.sign * B[self.free]
+            if self._kind == "splu":
+                X[self.free] = self._lu.solve(rhs)
+            else:
+                X[self.free] = linalg.cho_solve(self._cho, rhs, check_finite=False)
+        return self._remove_means(X)
+
+
+def solve_laplacian(A, b, tol=TOLERANCIA):
+    """Resuelve Ax = b para un laplaciano con un nodo a tierra por componente
+
+    Returns:
+        Tupla (x, info) donde x es la solución de norma mínima e info tiene
+        components, grounded, consistent y residual
+    """
+    grounded = GroundedLaplacian(A, tol)
+    b = np.asarray(b, dtype=float)
+    x = grounded.solve(b)
+    info = {
+        "components": int(grounded.num_components),
+        "grounded": grounded.grounded.tolist(),
+        "consistent": grounded.is_consistent(b),
+        "residual": float(np.linalg.norm(A @ x - b)),
+    }
+    return x, info
+
+
+class LaplacianAnalysis:
+    """Análisis de Ax = b para un laplaciano, sin factorizar A completa
+
+    Tiene la misma interfaz que analysis.MatrixAnalysis, pero todo sale de
+    la estructura del grafo: rango n - (componentes), determinante cero,
+    consistencia por la demanda neta de cada componente y solución de
+    norma mínima con GroundedLaplacian.
+    """
+
+    path = "laplaciano"
+
+    def __init__(self, A, b, tol=TOLERANCIA):
+        self.b = np.array(b, dtype=float)
+        self.grounded = GroundedLaplacian(A, tol)
+        self.n = self.grounded.n
+        self.components = self.grounded.num_components
+        self.rank = self.n - self.components
+        self.consistent = self.grounded.is_consistent(self.b)
+        self.rank_augmented = self.rank + (0 if self.consistent else 1)
+        # ‖b - proyección de b‖: la parte de b que ningún x puede cubrir
+        sums = self.grounded.component_sums(self.b)
+        self.residual_norm = float(np.linalg.norm(sums / np.sqrt(self.grounded.sizes)))
+        self.logabsdet = float("-inf")
+        self.det_sign = 0.0
+        self.condition = float("inf")
+        self._x = None
+
+    @property
+    def invertible(self):
+        return False
+
+    @property
+    def det(self):
+        return 0.0
+
+    @property
+    def x(self):
+        """Solución de norma mínima (de mínimos cuadrados si b no es consistente)"""
+        if self._x is None:
+            self._x = self.grounded.solve(self.b)
+        return self._x
+
+    def solve(self, B):
+        return self.grounded.solve(B)
+
+    def inverse(self):
+        raise np.linalg.LinAlgError("La matriz A no es invertible")
+
+    def pseudo_inverse(self):
+        """A⁺ columna por columna con el sistema reducido"""
+        return self.grounded.solve(np.eye(self.n))
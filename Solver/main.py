@@ -2,10 +2,20 @@
 # PROYECTO: Optimización de Sistema de Redes de Comunicaciones
 # Materia: Álgebra Lineal
 # ============================================
+# Se ejecuta como paquete desde la raíz del proyecto: python -m Solver
 import numpy as np
 import time
 import sys
 
+from .elimination import augmented_buffer, gauss_jordan
+from .sparse_path import density, is_sparse_candidate
+from .iterative import ITERATIVE_MIN_NODES
+from .analysis import analyze_system
+from .laplacian import LaplacianAnalysis
+from .profiling import profiler_from_env, start_phase, waiting
+from .structure import detect_structure
+from .trace import TraceViewer, record_trace
+
 # Colores ANSI para la consola
 class Colors:
     HEADER = '\033[95m'
@@ -38,59 +48,107 @@ def print_section(title, color=Colors.BLUE):
     print(color + "│" + Colors.BOLD + title.center(68) + Colors.ENDC + color + "│" + Colors.ENDC)
     print(color + "└" + "─" * 68 + "┘" + Colors.ENDC)
 
-def print_matrix(matrix, name="MATRIZ", color=Colors.CYAN):
-    """Imprime una matriz de forma bonita"""
-    print(color + f"\n{name}:" + Colors.ENDC)
-    rows, cols = matrix.shape
-    
-    # Encontrar el ancho máximo necesario
-    max_width = max(len(f"{val:.2f}") for row in matrix for val in row)
-    
-    for i, row in enumerate(matrix):
-        if i == 0:
-            print(color + "┌ " + Colors.ENDC, end="")
-        elif i == rows - 1:
-            print(color + "└ " + Colors.ENDC, end="")
+# Nombre en pantalla de cada método de analysis.analyze_system
+METHOD_NAMES = {
+    "diagonal": "escalado diagonal",
+    "triangular": "sustitución triangular",
+    "banda": "LU de banda",
+    "cholesky": "Cholesky",
+    "ldlt": "LDLᵀ (Bunch-Kaufman)",
+    "lu": "LU con pivoteo parcial",
+    "lu_disperso": "LU disperso (SuperLU)",
+    "qr": "QR con pivoteo (revela el rango)",
+    "laplaciano": "laplaciano con nodo de referencia",
+}
+
+# Matrices más grandes se muestran recortadas (primeras y últimas filas/columnas)
+MAX_RENDER_ROWS = 16
+MAX_RENDER_COLS = 12
+
+def _visible_indices(size, limit):
+    """Índices a mostrar: todos, o los primeros y últimos con None como elipsis"""
+    if size <= limit:
+        return list(range(size))
+    half = limit // 2
+    return list(range(half)) + [None] + list(range(size - half, size))
+
+def format_matrix(matrix, name="MATRIZ", color=Colors.CYAN, separator_pos=None, rows=None):
+    """Arma el cuadro completo de una matriz en un solo texto
+
+    Solo se formatean los valores visibles, todos de una vez con NumPy.
+    Con rows se muestran únicamente esas filas (por ejemplo, las que
+    cambiaron en un paso), cada una con su número de fila.
+    """
+    n_rows, n_cols = matrix.shape
+    row_idx = list(rows) if rows is not None else _visible_indices(n_rows, MAX_RENDER_ROWS)
+    if not row_idx or n_cols == 0:
+        return color + f"\n{name}:" + Colors.ENDC + "\n" + color + "[ ]" + Colors.ENDC + "\n"
+    if separator_pos is not None and 0 < separator_pos < n_cols:
+        # Se recorta cada bloque por separado para que el separador siempre se vea
+        right_size = n_cols - separator_pos
+        right_limit = min(right_size, max(2, MAX_RENDER_COLS // 2))
+        left_limit = max(2, MAX_RENDER_COLS - right_limit)
+        col_idx = _visible_indices(separator_pos, left_limit) + [
+            None if j is None else separator_pos + j
+            for j in _visible_indices(right_size, right_limit)]
+    else:
+        col_idx = _visible_indices(n_cols, MAX_RENDER_COLS)
+
+    real_rows = [i for i in row_idx if i is not None]
+    real_cols = [j for j in col_idx if j is not None]
+    cells = np.char.mod("%.2f", matrix[np.ix_(real_rows, real_cols)])
+    width = int(np.char.str_len(cells).max()) if cells.size else 0
+    cells = np.char.rjust(cells, width)
+
+    # Encabezado de cada columna visible: valor, elipsis y separador
+    layout = []
+    k = 0
+    for j in col_idx:
+        if separator_pos is not None and j == separator_pos:
+            layout.append(("sep", None))
+        if j is None:
+            layout.append(("gap", None))
         else:
-            print(color + "│ " + Colors.ENDC, end="")
-        
-        for j, val in enumerate(row):
-            print(f"{val:>{max_width}.2f}", end="  ")
-        
-        if i == 0:
-            print(color + "┐" + Colors.ENDC)
-        elif i == rows - 1:
-            print(color + "┘" + Colors.ENDC)
+            layout.append(("val", k))
+            k += 1
+
+    sep = color + "│" + Colors.ENDC + " "
+    lines = [color + f"\n{name}:" + Colors.ENDC]
+    r = 0
+    for pos, i in enumerate(row_idx):
+        if pos == 0:
+            left, right = "┌ ", "┐"
+        elif pos == len(row_idx) - 1:
+            left, right = "└ ", "┘"
         else:
-            print(color + "│" + Colors.ENDC)
+            left, right = "│ ", "│"
+        label = f"F{i+1:<{len(str(n_rows))}} " if rows is not None else ""
 
-def print_augmented_matrix(matrix, name="MATRIZ AUMENTADA", color=Colors.CYAN):
-    """Imprime una matriz aumentada con separador"""
-    print(color + f"\n{name}:" + Colors.ENDC)
-    rows, cols = matrix.shape
-    
-    max_width = max(len(f"{val:.2f}") for row in matrix for val in row)
-    separator_pos = cols // 2
-    
-    for i, row in enumerate(matrix):
-        if i == 0:
-            print(color + "┌ " + Colors.ENDC, end="")
-        elif i == rows - 1:
-            print(color + "└ " + Colors.ENDC, end="")
-        else:
-            print(color + "│ " + Colors.ENDC, end="")
-        
-        for j, val in enumerate(row):
-            if j == separator_pos:
-                print(color + "│" + Colors.ENDC, end=" ")
-            print(f"{val:>{max_width}.2f}", end="  ")
-        
-        if i == 0:
-            print(color + "┐" + Colors.ENDC)
-        elif i == rows - 1:
-            print(color + "┘" + Colors.ENDC)
+        if i is None:
+            body = "".join(sep if kind == "sep" else "⋮".rjust(width) + "  "
+                           for kind, _ in layout)
         else:
-            print(color + "│" + Colors.ENDC)
+            values = cells[r]
+            r += 1
+            body = "".join(sep if kind == "sep" else
+                           ("…".rjust(width) + "  " if kind == "gap" else values[c] + "  ")
+                           for kind, c in layout)
+        lines.append(label + color + left + Colors.ENDC + body + color + right + Colors.ENDC)
+    return "\n".join(lines) + "\n"
+
+def print_matrix(matrix, name="MATRIZ", color=Colors.CYAN):
+    """Imprime una matriz de forma bonita"""
+    sys.stdout.write(format_matrix(matrix, name, color))
+
+def print_augmented_matrix(matrix, name="MATRIZ AUMENTADA", color=Colors.CYAN,
+                           separator_pos=None, rows=None):
+    """Imprime una matriz aumentada con separador
+
+    Por defecto el separador va en la mitad, como en [A|I].
+    """
+    if separator_pos is None:
+        separator_pos = matrix.shape[1] // 2
+    sys.stdout.write(format_matrix(matrix, name, color, separator_pos, rows))
 
 def print_vector(vector, name="VECTOR", color=Colors.GREEN):
     """Imprime un vector de forma bonita"""
@@ -106,21 +164,79 @@ def print_vector(vector, name="VECTOR", color=Colors.GREEN):
 def loading_animation(text="Procesando", duration=1.5):
     """Muestra una animación de carga"""
     animation = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-    end_time = time.time() + duration
-    i = 0
-    while time.time() < end_time:
-        sys.stdout.write(f'\r{Colors.YELLOW}{animation[i % len(animation)]} {text}...{Colors.ENDC}')
+    with waiting():
+        end_time = time.time() + duration
+        i = 0
+        while time.time() < end_time:
+            sys.stdout.write(f'\r{Colors.YELLOW}{animation[i % len(animation)]} {text}...{Colors.ENDC}')
+            sys.stdout.flush()
+            time.sleep(0.1)
+            i += 1
+        sys.stdout.write('\r' + ' ' * 50 + '\r')
         sys.stdout.flush()
-        time.sleep(0.1)
-        i += 1
-    sys.stdout.write('\r' + ' ' * 50 + '\r')
-    sys.stdout.flush()
+
+def ask(prompt=""):
+    """input() cuya espera no se cuenta como cómputo en el perfil"""
+    with waiting():
+        return input(prompt)
+
+def pause(seconds):
+    """Pausa estética; tampoco se cuenta como cómputo"""
+    with waiting():
+        time.sleep(seconds)
+
+def run_elimination_steps(M, n, pivoting, show_steps, back_title):
+    """Recorre el motor de Gauss-Jordan mostrando cada operación si se pide
+
+    Devuelve la traza de los pasos (trace.StepTrace) si se mostraron.
+    """
+    if not show_steps:
+        gauss_jordan(M, n, pivoting)
+        return
+
+    # Primero se calcula todo (M queda reducida) registrando las
+    # operaciones; después se repiten para mostrarlas con sus pausas
+    trace = record_trace(M, n, pivoting)
+
+    # En matrices grandes cada paso muestra solo las filas que cambiaron
+    only_changed = n > MAX_RENDER_ROWS
+
+    def show(name, color, changed):
+        print_augmented_matrix(state, name, color, separator_pos=n,
+                               rows=sorted(set(changed)) if only_changed else None)
+
+    step = 2
+    for _, op, state in TraceViewer(trace).replay():
+        kind = op[0]
+        if kind == "pivote":
+            i = op[1]
+            print(f"\n{Colors.GREEN}➤ Paso {step}: Hacer pivote en posición [{i+1},{i+1}]{Colors.ENDC}")
+            step += 1
+        elif kind == "intercambio":
+            _, i, max_row = op
+            print(f"   {Colors.YELLOW}↔ Intercambiando fila {i+1} con fila {max_row+1}{Colors.ENDC}")
+            show(f"Después del intercambio", Colors.YELLOW, [i, max_row])
+        elif kind == "escala":
+            _, i, pivot = op
+            print(f"   {Colors.CYAN}÷ Dividiendo fila {i+1} entre {pivot:.2f}{Colors.ENDC}")
+            show(f"Fila {i+1} normalizada", Colors.CYAN, [i])
+        elif kind == "elimina":
+            _, j, i, factor = op
+            print(f"   {Colors.BLUE}− F{j+1} = F{j+1} - ({factor:.2f}) × F{i+1}{Colors.ENDC}")
+            show(f"Eliminando elemento [{j+1},{i+1}]", Colors.BLUE, [j])
+        elif kind == "fin_columna":
+            if op[1] < n - 1:
+                ask(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
+        elif kind == "atras":
+            print(f"\n{Colors.GREEN}➤ Paso {step}: {back_title}{Colors.ENDC}")
+            step += 1
+    return trace
 
 def gauss_jordan_step_by_step(A, b, show_steps=True):
     """Resuelve el sistema Ax=b usando Gauss-Jordan con pasos detallados"""
     n = len(A)
     # Crear matriz aumentada [A|b]
-    Ab = np.column_stack([A.copy(), b.copy()])
+    Ab = augmented_buffer(A, b)
     
     if show_steps:
         print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
@@ -128,69 +244,14 @@ def gauss_jordan_step_by_step(A, b, show_steps=True):
         print(f"{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
         
         print(f"\n{Colors.GREEN}➤ Paso 1: Formar la matriz aumentada [A|b]{Colors.ENDC}")
-        print_augmented_matrix(Ab, "Matriz Aumentada [A|b]", Colors.CYAN)
-        input(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
+        print_augmented_matrix(Ab, "Matriz Aumentada [A|b]", Colors.CYAN, separator_pos=n)
+        ask(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
     
-    step = 2
-    
-    # Eliminación hacia adelante
-    for i in range(n):
-        if show_steps:
-            print(f"\n{Colors.GREEN}➤ Paso {step}: Hacer pivote en posición [{i+1},{i+1}]{Colors.ENDC}")
-            step += 1
-        
-        # Encontrar el pivote
-        max_row = i
-        for k in range(i + 1, n):
-            if abs(Ab[k][i]) > abs(Ab[max_row][i]):
-                max_row = k
-        
-        if max_row != i:
-            Ab[[i, max_row]] = Ab[[max_row, i]]
-            if show_steps:
-                print(f"   {Colors.YELLOW}↔ Intercambiando fila {i+1} con fila {max_row+1}{Colors.ENDC}")
-                print_augmented_matrix(Ab, f"Después del intercambio", Colors.YELLOW)
-        
-        # Hacer el pivote igual a 1
-        pivot = Ab[i][i]
-        if abs(pivot) < 1e-10:
-            continue
-            
-        if abs(pivot - 1.0) > 1e-10:
-            Ab[i] = Ab[i] / pivot
-            if show_steps:
-                print(f"   {Colors.CYAN}÷ Dividiendo fila {i+1} entre {pivot:.2f}{Colors.ENDC}")
-                print_augmented_matrix(Ab, f"Fila {i+1} normalizada", Colors.CYAN)
-        
-        # Eliminar elementos debajo del pivote
-        for j in range(i + 1, n):
-            if abs(Ab[j][i]) > 1e-10:
-                factor = Ab[j][i]
-                Ab[j] = Ab[j] - factor * Ab[i]
-                if show_steps:
-                    print(f"   {Colors.BLUE}− F{j+1} = F{j+1} - ({factor:.2f}) × F{i+1}{Colors.ENDC}")
-                    print_augmented_matrix(Ab, f"Eliminando elemento [{j+1},{i+1}]", Colors.BLUE)
-        
-        if show_steps and i < n-1:
-            input(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
-    
-    # Eliminación hacia atrás
-    if show_steps:
-        print(f"\n{Colors.GREEN}➤ Paso {step}: ELIMINACIÓN HACIA ATRÁS (formar identidad){Colors.ENDC}")
-        step += 1
-    
-    for i in range(n - 1, -1, -1):
-        for j in range(i - 1, -1, -1):
-            if abs(Ab[j][i]) > 1e-10:
-                factor = Ab[j][i]
-                Ab[j] = Ab[j] - factor * Ab[i]
-                if show_steps:
-                    print(f"   {Colors.BLUE}− F{j+1} = F{j+1} - ({factor:.2f}) × F{i+1}{Colors.ENDC}")
-                    print_augmented_matrix(Ab, f"Eliminando elemento [{j+1},{i+1}]", Colors.BLUE)
+    run_elimination_steps(Ab, n, True, show_steps, "ELIMINACIÓN HACIA ATRÁS (formar identidad)")
     
     if show_steps:
         print(f"\n{Colors.GREEN}✓ ¡FORMA ESCALONADA REDUCIDA ALCANZADA!{Colors.ENDC}")
-        print_augmented_matrix(Ab, "Matriz en forma [I|x]", Colors.GREEN)
+        print_augmented_matrix(Ab, "Matriz en forma [I|x]", Colors.GREEN, separator_pos=n)
     
     # Extraer solución
     x = Ab[:, -1]
@@ -200,8 +261,7 @@ def inverse_step_by_step(A, show_steps=True):
     """Calcula la inversa de A usando Gauss-Jordan con pasos detallados"""
     n = len(A)
     # Crear matriz aumentada [A|I]
-    I = np.eye(n)
-    AI = np.column_stack([A.copy(), I])
+    AI = augmented_buffer(A, np.eye(n))
     
     if show_steps:
         print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
@@ -211,52 +271,10 @@ def inverse_step_by_step(A, show_steps=True):
         print(f"\n{Colors.GREEN}➤ Paso 1: Formar la matriz aumentada [A|I]{Colors.ENDC}")
         print("   Donde I es la matriz identidad")
         print_augmented_matrix(AI, "Matriz Aumentada [A|I]", Colors.CYAN)
-        input(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
-    
-    step = 2
-    
-    # Eliminación hacia adelante
-    for i in range(n):
-        if show_steps:
-            print(f"\n{Colors.GREEN}➤ Paso {step}: Hacer pivote en posición [{i+1},{i+1}]{Colors.ENDC}")
-            step += 1
-        
-        # Hacer el pivote igual a 1
-        pivot = AI[i][i]
-        if abs(pivot) < 1e-10:
-            continue
-            
-        if abs(pivot - 1.0) > 1e-10:
-            AI[i] = AI[i] / pivot
-            if show_steps:
-                print(f"   {Colors.CYAN}÷ Dividiendo fila {i+1} entre {pivot:.2f}{Colors.ENDC}")
-                print_augmented_matrix(AI, f"Fila {i+1} normalizada", Colors.CYAN)
-        
-        # Eliminar elementos debajo del pivote
-        for j in range(i + 1, n):
-            if abs(AI[j][i]) > 1e-10:
-                factor = AI[j][i]
-                AI[j] = AI[j] - factor * AI[i]
-                if show_steps:
-                    print(f"   {Colors.BLUE}− F{j+1} = F{j+1} - ({factor:.2f}) × F{i+1}{Colors.ENDC}")
-                    print_augmented_matrix(AI, f"Eliminando elemento [{j+1},{i+1}]", Colors.BLUE)
-        
-        if show_steps and i < n-1:
-            input(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
+        ask(f"\n{Colors.YELLOW}Presione Enter para continuar...{Colors.ENDC}")
     
-    # Eliminación hacia atrás
-    if show_steps:
-        print(f"\n{Colors.GREEN}➤ Paso {step}: ELIMINACIÓN HACIA ATRÁS{Colors.ENDC}")
-        step += 1
-    
-    for i in range(n - 1, -1, -1):
-        for j in range(i - 1, -1, -1):
-            if abs(AI[j][i]) > 1e-10:
-                factor = AI[j][i]
-                AI[j] = AI[j] - factor * AI[i]
-                if show_steps:
-                    print(f"   {Colors.BLUE}− F{j+1} = F{j+1} - ({factor:.2f}) × F{i+1}{Colors.ENDC}")
-                    print_augmented_matrix(AI, f"Eliminando elemento [{j+1},{i+1}]", Colors.BLUE)
+    # Sin intercambio de filas, igual que el cálculo original de la inversa
+    run_elimination_steps(AI, n, False, show_steps, "ELIMINACIÓN HACIA ATRÁS")
     
     if show_steps:
         print(f"\n{Colors.GREEN}✓ ¡MATRIZ INVERSA CALCULADA!{Colors.ENDC}")
@@ -266,270 +284,332 @@ def inverse_step_by_step(A, show_steps=True):
     A_inv = AI[:, n:]
     return A_inv
 
-# ============================================
-# INICIO DEL PROGRAMA
-# ============================================
-print("\n" * 2)
-print_box("OPTIMIZACIÓN DE SISTEMA DE REDES", Colors.CYAN, 70)
-print_box("Proyecto de Álgebra Lineal", Colors.BLUE, 70)
-time.sleep(0.5)
-
 # ----------------------------
 # FASE 1: Planteamiento del Problema
 # ----------------------------
-print_section("⚡ FASE 1: PLANTEAMIENTO DEL PROBLEMA", Colors.BLUE)
+def read_problem():
+    """Lee A y b (o carga el ejemplo) y pregunta si se muestran los pasos
 
-usar_ejemplo = input(f"\n{Colors.CYAN}❓ ¿Desea usar el ejemplo del documento? (s/n): {Colors.ENDC}").lower()
+    Devuelve la tupla (A, b, mostrar_pasos).
+    """
+    print_section("⚡ FASE 1: PLANTEAMIENTO DEL PROBLEMA", Colors.BLUE)
 
-if usar_ejemplo == 's':
-    loading_animation("Cargando datos de ejemplo")
-    
-    n = 3
-    A_original = np.array([[-2., 1., 1.],
-                           [1., -2., 1.],
-                           [1., 1., -2.]])
-    
-    A_modificada = np.array([[-3., 1., 1.],
-                             [1., -3., 1.],
-                             [1., 1., -3.]])
-    
-    b = np.array([100., 200., 150.])
-    
-    print(f"\n{Colors.YELLOW}⚠️  NOTA IMPORTANTE:{Colors.ENDC}")
-    print("   La matriz original del documento NO es invertible.\n")
-    
-    print(f"{Colors.GREEN}   [1]{Colors.ENDC} Matriz ORIGINAL (determinante = 0)")
-    print(f"       → Se usará pseudo-inversa para solución aproximada")
-    
-    print(f"\n{Colors.GREEN}   [2]{Colors.ENDC} Matriz MODIFICADA (invertible)")
-    print(f"       → Diagonal ajustada: -3 en lugar de -2\n")
-    
-    opcion = input(f"{Colors.CYAN}🎯 Seleccione opción (1 o 2): {Colors.ENDC}")
-    
-    if opcion == "2":
-        A = A_modificada
-        print(f"{Colors.GREEN}✓ Usando matriz MODIFICADA{Colors.ENDC}")
+    usar_ejemplo = ask(f"\n{Colors.CYAN}❓ ¿Desea usar el ejemplo del documento? (s/n): {Colors.ENDC}").lower()
+
+    if usar_ejemplo == 's':
+        loading_animation("Cargando datos de ejemplo")
+        
+        n = 3
+        A_original = np.array([[-2., 1., 1.],
+                               [1., -2., 1.],
+                               [1., 1., -2.]])
+        
+        A_modificada = np.array([[-3., 1., 1.],
+                                 [1., -3., 1.],
+                                 [1., 1., -3.]])
+        
+        b = np.array([100., 200., 150.])
+        
+        print(f"\n{Colors.YELLOW}⚠️  NOTA IMPORTANTE:{Colors.ENDC}")
+        print("   La matriz original del documento NO es invertible.\n")
+        
+        print(f"{Colors.GREEN}   [1]{Colors.ENDC} Matriz ORIGINAL (determinante = 0)")
+        print(f"       → Se usará pseudo-inversa para solución aproximada")
+        
+        print(f"\n{Colors.GREEN}   [2]{Colors.ENDC} Matriz MODIFICADA (invertible)")
+        print(f"       → Diagonal ajustada: -3 en lugar de -2\n")
+        
+        opcion = ask(f"{Colors.CYAN}🎯 Seleccione opción (1 o 2): {Colors.ENDC}")
+        
+        if opcion == "2":
+            A = A_modificada
+            print(f"{Colors.GREEN}✓ Usando matriz MODIFICADA{Colors.ENDC}")
+        else:
+            A = A_original
+            print(f"{Colors.YELLOW}⚠ Usando matriz ORIGINAL{Colors.ENDC}")
+            
     else:
-        A = A_original
-        print(f"{Colors.YELLOW}⚠ Usando matriz ORIGINAL{Colors.ENDC}")
+        n = int(ask(f"\n{Colors.CYAN}📊 Ingrese el número de nodos en la red: {Colors.ENDC}"))
         
-else:
-    n = int(input(f"\n{Colors.CYAN}📊 Ingrese el número de nodos en la red: {Colors.ENDC}"))
-    
-    print(f"\n{Colors.BLUE}╔{'═' * 60}╗{Colors.ENDC}")
-    print(f"{Colors.BLUE}║{'INGRESO DE MATRIZ A (Coeficientes de Conexión)'.center(60)}║{Colors.ENDC}")
-    print(f"{Colors.BLUE}╚{'═' * 60}╝{Colors.ENDC}")
-    
-    A = []
-    for i in range(n):
-        fila = list(map(float, input(f"{Colors.CYAN}   Fila {i+1}: {Colors.ENDC}").split()))
-        A.append(fila)
-    A = np.array(A)
-    
-    print(f"\n{Colors.BLUE}╔{'═' * 60}╗{Colors.ENDC}")
-    print(f"{Colors.BLUE}║{'INGRESO DE VECTOR b (Demanda de Tráfico)'.center(60)}║{Colors.ENDC}")
-    print(f"{Colors.BLUE}╚{'═' * 60}╝{Colors.ENDC}")
-    
-    b = []
-    for i in range(n):
-        valor = float(input(f"{Colors.CYAN}   Demanda del nodo {i+1}: {Colors.ENDC}"))
-        b.append(valor)
-    b = np.array(b)
+        print(f"\n{Colors.BLUE}╔{'═' * 60}╗{Colors.ENDC}")
+        print(f"{Colors.BLUE}║{'INGRESO DE MATRIZ A (Coeficientes de Conexión)'.center(60)}║{Colors.ENDC}")
+        print(f"{Colors.BLUE}╚{'═' * 60}╝{Colors.ENDC}")
+        
+        A = []
+        for i in range(n):
+            fila = list(map(float, ask(f"{Colors.CYAN}   Fila {i+1}: {Colors.ENDC}").split()))
+            A.append(fila)
+        A = np.array(A)
+        
+        print(f"\n{Colors.BLUE}╔{'═' * 60}╗{Colors.ENDC}")
+        print(f"{Colors.BLUE}║{'INGRESO DE VECTOR b (Demanda de Tráfico)'.center(60)}║{Colors.ENDC}")
+        print(f"{Colors.BLUE}╚{'═' * 60}╝{Colors.ENDC}")
+        
+        b = []
+        for i in range(n):
+            valor = float(ask(f"{Colors.CYAN}   Demanda del nodo {i+1}: {Colors.ENDC}"))
+            b.append(valor)
+        b = np.array(b)
 
-time.sleep(0.3)
-print_matrix(A, "MATRIZ A (Coeficientes de Conexión)", Colors.CYAN)
-print_vector(b, "VECTOR b (Demanda de Tráfico)", Colors.GREEN)
+    pause(0.3)
+    print_matrix(A, "MATRIZ A (Coeficientes de Conexión)", Colors.CYAN)
+    print_vector(b, "VECTOR b (Demanda de Tráfico)", Colors.GREEN)
 
-# Preguntar si quiere ver los pasos
-print(f"\n{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
-ver_pasos = input(f"{Colors.BOLD}{Colors.YELLOW}¿Desea ver la resolución PASO A PASO? (s/n): {Colors.ENDC}").lower()
-mostrar_pasos = (ver_pasos == 's')
+    # Preguntar si quiere ver los pasos
+    print(f"\n{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
+    ver_pasos = ask(f"{Colors.BOLD}{Colors.YELLOW}¿Desea ver la resolución PASO A PASO? (s/n): {Colors.ENDC}").lower()
+    mostrar_pasos = (ver_pasos == 's')
+    return A, b, mostrar_pasos
 
 # ----------------------------
 # FASE 2: Análisis de la Matriz
 # ----------------------------
-print_section("🔍 FASE 2: ANÁLISIS DE LA MATRIZ", Colors.BLUE)
-
-loading_animation("Analizando propiedades matemáticas", 1.0)
-
-det_A = np.linalg.det(A)
-rank_A = np.linalg.matrix_rank(A)
-rank_Aug = np.linalg.matrix_rank(np.column_stack((A, b)))
-
-print(f"\n{Colors.BOLD}{Colors.BLUE}📈 PROPIEDADES MATEMÁTICAS:{Colors.ENDC}\n")
-print(f"{Colors.CYAN}   ▪ Determinante de A:{Colors.ENDC}  {det_A:>15.6f}")
-print(f"{Colors.CYAN}   ▪ Rango(A):{Colors.ENDC}           {rank_A:>15}")
-print(f"{Colors.CYAN}   ▪ Rango(A|b):{Colors.ENDC}         {rank_Aug:>15}")
-print(f"{Colors.CYAN}   ▪ Dimensión:{Colors.ENDC}          {n:>15} × {n}")
-
-tolerancia = 1e-10
+def analyze_phase(A, b):
+    """Muestra las propiedades de A y devuelve el análisis (ver analysis.py)"""
+    n = len(A)
+    print_section("🔍 FASE 2: ANÁLISIS DE LA MATRIZ", Colors.BLUE)
+
+    loading_animation("Analizando propiedades matemáticas", 1.0)
+
+    # Una sola factorización para todo el análisis y la solución: la más
+    # barata que admite la estructura de A (QR con pivoteo si es singular)
+    analisis = analyze_system(A, b)
+    det_A = analisis.det
+    rank_A = analisis.rank
+    rank_Aug = analisis.rank_augmented
+
+    print(f"\n{Colors.BOLD}{Colors.BLUE}📈 PROPIEDADES MATEMÁTICAS:{Colors.ENDC}\n")
+    print(f"{Colors.CYAN}   ▪ Determinante de A:{Colors.ENDC}  {det_A:>15.6f}")
+    print(f"{Colors.CYAN}   ▪ log|det(A)|:{Colors.ENDC}        {analisis.logabsdet:>15.6f}")
+    print(f"{Colors.CYAN}   ▪ Condición de A:{Colors.ENDC}     {analisis.condition:>15.6g}")
+    print(f"{Colors.CYAN}   ▪ Rango(A):{Colors.ENDC}           {rank_A:>15}")
+    print(f"{Colors.CYAN}   ▪ Rango(A|b):{Colors.ENDC}         {rank_Aug:>15}")
+    print(f"{Colors.CYAN}   ▪ Dimensión:{Colors.ENDC}          {n:>15} × {n}")
+    print(f"{Colors.CYAN}   ▪ Estructura:{Colors.ENDC}         {', '.join(detect_structure(A).describe())}")
+    print(f"{Colors.CYAN}   ▪ Método:{Colors.ENDC}             {METHOD_NAMES[analisis.path]}")
+    return analisis
 
 # ----------------------------
 # FASE 3: Resolución del Sistema
 # ----------------------------
-print_section("⚙️  FASE 3: RESOLUCIÓN DEL SISTEMA Ax = b", Colors.BLUE)
+def solve_phase(A, b, analisis, mostrar_pasos):
+    """Resuelve Ax = b (o por mínimos cuadrados) y devuelve la solución"""
+    n = len(A)
+    rank_A = analisis.rank
+    rank_Aug = analisis.rank_augmented
+    # La invertibilidad se decide por el rango: el determinante desborda
+    # o se anula numéricamente para n grande
+    es_invertible = analisis.invertible
 
-if not mostrar_pasos:
-    loading_animation("Resolviendo sistema de ecuaciones", 1.5)
+    print_section("⚙️  FASE 3: RESOLUCIÓN DEL SISTEMA Ax = b", Colors.BLUE)
 
-if abs(det_A) > tolerancia:
-    # Caso 1: Matriz invertible
-    print(f"\n{Colors.GREEN}{Colors.BOLD}✓ MATRIZ INVERTIBLE{Colors.ENDC}")
-    print(f"{Colors.GREEN}  El sistema tiene solución ÚNICA{Colors.ENDC}\n")
-    
-    if mostrar_pasos:
-        # Mostrar cálculo de la inversa paso a paso
-        A_inv = inverse_step_by_step(A, show_steps=True)
+    if not mostrar_pasos:
+        loading_animation("Resolviendo sistema de ecuaciones", 1.5)
+
+    if es_invertible:
+        # Caso 1: Matriz invertible
+        print(f"\n{Colors.GREEN}{Colors.BOLD}✓ MATRIZ INVERTIBLE{Colors.ENDC}")
+        print(f"{Colors.GREEN}  El sistema tiene solución ÚNICA{Colors.ENDC}\n")
         
-        print(f"\n{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.ENDC}")
-        print(f"{Colors.BOLD}{Colors.GREEN}CÁLCULO DE LA SOLUCIÓN: x = A⁻¹ × b{Colors.ENDC}")
-        print(f"{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.ENDC}")
+        if mostrar_pasos:
+            # Mostrar cálculo de la inversa paso a paso
+            A_inv = inverse_step_by_step(A, show_steps=True)
+            
+            print(f"\n{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.ENDC}")
+            print(f"{Colors.BOLD}{Colors.GREEN}CÁLCULO DE LA SOLUCIÓN: x = A⁻¹ × b{Colors.ENDC}")
+            print(f"{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.ENDC}")
+            
+            print_matrix(A_inv, "A⁻¹ (Matriz Inversa)", Colors.YELLOW)
+            print_vector(b, "b (Vector de demanda)", Colors.CYAN)
+            
+            ask(f"\n{Colors.YELLOW}Presione Enter para calcular x = A⁻¹ × b...{Colors.ENDC}")
+            
+            x = np.dot(A_inv, b)
+            
+            print(f"\n{Colors.GREEN}➤ Multiplicando A⁻¹ × b:{Colors.ENDC}")
+            for i in range(n):
+                componentes = " + ".join([f"({A_inv[i][j]:.2f})×({b[j]:.2f})" for j in range(n)])
+                print(f"   x[{i+1}] = {componentes} = {x[i]:.2f}")
+        else:
+            # La solución sale de los factores de la Fase 2, sin formar A⁻¹.
+            # Un método iterativo aquí repetiría un trabajo ya hecho: A ya
+            # está factorizada (los de Krylov quedan para batch y sweep)
+            x = analisis.x
+            if is_sparse_candidate(A):
+                # Red grande y dispersa: LU disperso o de banda de la Fase 2
+                print(f"\n{Colors.CYAN}   ▪ Matriz dispersa:{Colors.ENDC} {density(A):.2%} de elementos no nulos")
+                print(f"{Colors.CYAN}   ▪ Se omite A⁻¹: se resolvió con {METHOD_NAMES[analisis.path]}{Colors.ENDC}")
+            elif n >= ITERATIVE_MIN_NODES:
+                print(f"{Colors.CYAN}   ▪ Se omite A⁻¹: red demasiado grande para mostrarla{Colors.ENDC}")
+            else:
+                A_inv = analisis.inverse()
+                print_matrix(A_inv, "MATRIZ INVERSA A⁻¹", Colors.YELLOW)
         
-        print_matrix(A_inv, "A⁻¹ (Matriz Inversa)", Colors.YELLOW)
-        print_vector(b, "b (Vector de demanda)", Colors.CYAN)
+        print(f"\n{Colors.GREEN}{Colors.BOLD}🎯 SOLUCIÓN x (Flujo de datos óptimo):{Colors.ENDC}")
+        print(f"{Colors.GREEN}{'─' * 50}{Colors.ENDC}")
         
-        input(f"\n{Colors.YELLOW}Presione Enter para calcular x = A⁻¹ × b...{Colors.ENDC}")
+        for i in range(n):
+            if x[i] >= 0:
+                signo = "➜"
+                color = Colors.GREEN
+            else:
+                signo = "➜"
+                color = Colors.YELLOW
+            
+            print(f"   {color}Nodo {i+1}: {x[i]:>10.2f} unidades de flujo {signo}{Colors.ENDC}")
         
-        x = np.dot(A_inv, b)
+        # Verificación
+        print(f"\n{Colors.BLUE}{Colors.BOLD}✓ VERIFICACIÓN (A × x = b):{Colors.ENDC}")
+        Ax = np.dot(A, x)
+        print_vector(Ax, "A × x", Colors.CYAN)
+        print_vector(b, "b (original)", Colors.GREEN)
+        
+        error = np.linalg.norm(Ax - b)
+        print(f"\n{Colors.GREEN}   ✓ Error: {error:.2e} (prácticamente cero){Colors.ENDC}")
         
-        print(f"\n{Colors.GREEN}➤ Multiplicando A⁻¹ × b:{Colors.ENDC}")
-        for i in range(n):
-            componentes = " + ".join([f"({A_inv[i][j]:.2f})×({b[j]:.2f})" for j in range(n)])
-            print(f"   x[{i+1}] = {componentes} = {x[i]:.2f}")
     else:
-        loading_animation("Calculando matriz inversa", 1.0)
-        A_inv = np.linalg.inv(A)
-        x = np.dot(A_inv, b)
-        print_matrix(A_inv, "MATRIZ INVERSA A⁻¹", Colors.YELLOW)
-    
-    print(f"\n{Colors.GREEN}{Colors.BOLD}🎯 SOLUCIÓN x (Flujo de datos óptimo):{Colors.ENDC}")
-    print(f"{Colors.GREEN}{'─' * 50}{Colors.ENDC}")
-    
-    for i in range(n):
-        if x[i] >= 0:
-            signo = "➜"
-            color = Colors.GREEN
+        # Caso 2: Matriz no invertible
+        print(f"\n{Colors.RED}{Colors.BOLD}✗ MATRIZ NO INVERTIBLE{Colors.ENDC}")
+        print(f"{Colors.RED}  (determinante ≈ 0){Colors.ENDC}\n")
+        
+        if rank_A == rank_Aug:
+            print(f"{Colors.YELLOW}   ℹ  El sistema es CONSISTENTE{Colors.ENDC}")
+            print(f"{Colors.YELLOW}      → Tiene infinitas soluciones{Colors.ENDC}")
+            estado = "consistente"
         else:
-            signo = "➜"
-            color = Colors.YELLOW
+            print(f"{Colors.RED}   ✗ El sistema NO es consistente{Colors.ENDC}")
+            print(f"{Colors.RED}      → No tiene solución exacta{Colors.ENDC}")
+            estado = "inconsistente"
         
-        print(f"   {color}Nodo {i+1}: {x[i]:>10.2f} unidades de flujo {signo}{Colors.ENDC}")
-    
-    # Verificación
-    print(f"\n{Colors.BLUE}{Colors.BOLD}✓ VERIFICACIÓN (A × x = b):{Colors.ENDC}")
-    Ax = np.dot(A, x)
-    print_vector(Ax, "A × x", Colors.CYAN)
-    print_vector(b, "b (original)", Colors.GREEN)
-    
-    error = np.linalg.norm(Ax - b)
-    print(f"\n{Colors.GREEN}   ✓ Error: {error:.2e} (prácticamente cero){Colors.ENDC}")
-    
-else:
-    # Caso 2: Matriz no invertible
-    print(f"\n{Colors.RED}{Colors.BOLD}✗ MATRIZ NO INVERTIBLE{Colors.ENDC}")
-    print(f"{Colors.RED}  (determinante ≈ 0){Colors.ENDC}\n")
-    
-    if rank_A == rank_Aug:
-        print(f"{Colors.YELLOW}   ℹ  El sistema es CONSISTENTE{Colors.ENDC}")
-        print(f"{Colors.YELLOW}      → Tiene infinitas soluciones{Colors.ENDC}")
-        estado = "consistente"
-    else:
-        print(f"{Colors.RED}   ✗ El sistema NO es consistente{Colors.ENDC}")
-        print(f"{Colors.RED}      → No tiene solución exacta{Colors.ENDC}")
-        estado = "inconsistente"
-    
-    print(f"\n{Colors.CYAN}   📊 Análisis:{Colors.ENDC}")
-    print(f"      • Rango(A) = {rank_A} < {n}")
-    print(f"      • Existe dependencia lineal entre nodos")
-    print(f"      • Los nodos NO son independientes\n")
-    
-    if mostrar_pasos and estado == "consistente":
-        # Intentar resolver con Gauss-Jordan aunque no tenga solución única
-        print(f"{Colors.YELLOW}Intentando resolver con Gauss-Jordan...{Colors.ENDC}")
-        try:
-            x_pinv = gauss_jordan_step_by_step(A, b, show_steps=True)
-        except:
-            x_pinv = np.dot(np.linalg.pinv(A), b)
-    else:
-        loading_animation("Calculando pseudo-inversa (mínimos cuadrados)", 1.5)
-        A_pinv = np.linalg.pinv(A)
-        x_pinv = np.dot(A_pinv, b)
-        print_matrix(A_pinv, "MATRIZ PSEUDO-INVERSA A⁺", Colors.YELLOW)
-    
-    print(f"\n{Colors.YELLOW}{Colors.BOLD}🎯 SOLUCIÓN APROXIMADA x:{Colors.ENDC}")
-    print(f"{Colors.YELLOW}{'─' * 50}{Colors.ENDC}")
-    
-    for i in range(n):
-        if x_pinv[i] >= 0:
-            signo = "➜"
-            color = Colors.GREEN
+        print(f"\n{Colors.CYAN}   📊 Análisis:{Colors.ENDC}")
+        print(f"      • Rango(A) = {rank_A} < {n}")
+        print(f"      • Existe dependencia lineal entre nodos")
+        print(f"      • Los nodos NO son independientes")
+        if isinstance(analisis, LaplacianAnalysis):
+            # Laplaciano: se resuelve el sistema reducido, sin pseudo-inversa por SVD
+            print(f"      • A es el laplaciano de la red ({analisis.components} componente(s) conexa(s))")
+            print(f"      • Se fija un nodo de referencia por componente")
+        print()
+        
+        if mostrar_pasos and estado == "consistente":
+            # Intentar resolver con Gauss-Jordan aunque no tenga solución única
+            print(f"{Colors.YELLOW}Intentando resolver con Gauss-Jordan...{Colors.ENDC}")
+            try:
+                x_pinv = gauss_jordan_step_by_step(A, b, show_steps=True)
+            except:
+                x_pinv = analisis.x
         else:
-            signo = "➜"
-            color = Colors.RED
+            loading_animation("Calculando pseudo-inversa (mínimos cuadrados)", 1.5)
+            x_pinv = analisis.x
+            if not (is_sparse_candidate(A) or n >= ITERATIVE_MIN_NODES):
+                A_pinv = analisis.pseudo_inverse()
+                print_matrix(A_pinv, "MATRIZ PSEUDO-INVERSA A⁺", Colors.YELLOW)
         
-        print(f"   {color}Nodo {i+1}: {x_pinv[i]:>10.2f} unidades de flujo {signo}{Colors.ENDC}")
-    
-    # Verificación
-    print(f"\n{Colors.BLUE}{Colors.BOLD}🔍 VERIFICACIÓN:{Colors.ENDC}")
-    Ax_aprox = np.dot(A, x_pinv)
-    print_vector(Ax_aprox, "A × x_aprox", Colors.YELLOW)
-    print_vector(b, "b (objetivo)", Colors.GREEN)
-    
-    error = np.linalg.norm(Ax_aprox - b)
-    print(f"\n{Colors.RED}   ⚠ Error (norma euclidiana): {error:.4f}{Colors.ENDC}")
-    
-    if estado == "inconsistente":
-        print(f"\n{Colors.YELLOW}   ℹ  Esta es la MEJOR aproximación posible{Colors.ENDC}")
-        print(f"      (minimiza el error cuadrático)")
+        print(f"\n{Colors.YELLOW}{Colors.BOLD}🎯 SOLUCIÓN APROXIMADA x:{Colors.ENDC}")
+        print(f"{Colors.YELLOW}{'─' * 50}{Colors.ENDC}")
+        
+        for i in range(n):
+            if x_pinv[i] >= 0:
+                signo = "➜"
+                color = Colors.GREEN
+            else:
+                signo = "➜"
+                color = Colors.RED
+            
+            print(f"   {color}Nodo {i+1}: {x_pinv[i]:>10.2f} unidades de flujo {signo}{Colors.ENDC}")
+        
+        # Verificación
+        print(f"\n{Colors.BLUE}{Colors.BOLD}🔍 VERIFICACIÓN:{Colors.ENDC}")
+        Ax_aprox = np.dot(A, x_pinv)
+        print_vector(Ax_aprox, "A × x_aprox", Colors.YELLOW)
+        print_vector(b, "b (objetivo)", Colors.GREEN)
+        
+        error = np.linalg.norm(Ax_aprox - b)
+        print(f"\n{Colors.RED}   ⚠ Error (norma euclidiana): {error:.4f}{Colors.ENDC}")
+        
+        if estado == "inconsistente":
+            print(f"\n{Colors.YELLOW}   ℹ  Esta es la MEJOR aproximación posible{Colors.ENDC}")
+            print(f"      (minimiza el error cuadrático)")
+
+    return x if es_invertible else x_pinv
 
 # ----------------------------
 # FASE 4: Interpretación y Conclusiones
 # ----------------------------
-print_section("📊 FASE 4: INTERPRETACIÓN Y CONCLUSIONES", Colors.BLUE)
+def conclusions_phase(es_invertible):
+    """Interpreta el resultado y da recomendaciones para la red"""
+    print_section("📊 FASE 4: INTERPRETACIÓN Y CONCLUSIONES", Colors.BLUE)
+
+    pause(0.5)
+
+    print(f"\n{Colors.BOLD}{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
+    print(f"{Colors.BOLD}{Colors.CYAN}📝 INTERPRETACIÓN DE RESULTADOS{Colors.ENDC}")
+    print(f"{Colors.BOLD}{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}\n")
+
+    if es_invertible:
+        print(f"{Colors.GREEN}✓ Sistema con solución única:{Colors.ENDC}\n")
+        print(f"   • La red está BIEN configurada")
+        print(f"   • Cada nodo tiene un flujo óptimo determinado")
+        print(f"   • {Colors.GREEN}Valores positivos{Colors.ENDC}: flujo neto de SALIDA")
+        print(f"   • {Colors.YELLOW}Valores negativos{Colors.ENDC}: flujo neto de ENTRADA")
+        
+    else:
+        print(f"{Colors.YELLOW}⚠ Sistema singular (matriz no invertible):{Colors.ENDC}\n")
+        print(f"   • Existe DEPENDENCIA entre los nodos")
+        print(f"   • Algunos nodos pueden estar redundantes")
+        print(f"   • La pseudo-inversa da la mejor aproximación")
+        print(f"   • Se minimiza el error cuadrático")
+
+    print(f"\n{Colors.CYAN}💡 Significado del vector solución x:{Colors.ENDC}\n")
+    print(f"   • Cada x[i] es el flujo de datos del nodo i")
+    print(f"   • {Colors.GREEN}Positivo{Colors.ENDC}: el nodo ENVÍA más de lo que recibe")
+    print(f"   • {Colors.RED}Negativo{Colors.ENDC}: el nodo RECIBE más de lo que envía")
+
+    print(f"\n{Colors.BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
+    print(f"{Colors.BLUE}🔧 RECOMENDACIONES PARA MEJORAR LA RED{Colors.ENDC}")
+    print(f"{Colors.BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}\n")
+
+    if es_invertible:
+        print(f"{Colors.GREEN}   ✓ La configuración actual es ÓPTIMA{Colors.ENDC}")
+        print(f"   ✓ Mantener el balance de flujos calculado")
+        print(f"   ✓ Monitorear el rendimiento regularmente")
+    else:
+        print(f"{Colors.YELLOW}   ⚙  Revisar las conexiones entre nodos{Colors.ENDC}")
+        print(f"   ⚙  Considerar agregar o remover enlaces")
+        print(f"   ⚙  Ajustar capacidades (diagonal de A)")
+        print(f"   ⚙  Verificar redundancia de nodos")
+        print(f"   ⚙  Redistribuir la demanda de tráfico")
 
-time.sleep(0.5)
+    print("\n")
+    print_box("FIN DEL PROYECTO", Colors.GREEN, 70)
+    print_box("Gracias por usar el sistema", Colors.CYAN, 70)
 
-print(f"\n{Colors.BOLD}{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
-print(f"{Colors.BOLD}{Colors.CYAN}📝 INTERPRETACIÓN DE RESULTADOS{Colors.ENDC}")
-print(f"{Colors.BOLD}{Colors.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}\n")
+def main():
+    """Programa interactivo completo: FASE 1 a FASE 4"""
+    # Perfil opcional (SOLVER_PROFILE, SOLVER_PROFILE_MEMORY, SOLVER_CPROFILE)
+    profiler = profiler_from_env()
 
-if abs(det_A) > tolerancia:
-    print(f"{Colors.GREEN}✓ Sistema con solución única:{Colors.ENDC}\n")
-    print(f"   • La red está BIEN configurada")
-    print(f"   • Cada nodo tiene un flujo óptimo determinado")
-    print(f"   • {Colors.GREEN}Valores positivos{Colors.ENDC}: flujo neto de SALIDA")
-    print(f"   • {Colors.YELLOW}Valores negativos{Colors.ENDC}: flujo neto de ENTRADA")
-    
-else:
-    print(f"{Colors.YELLOW}⚠ Sistema singular (matriz no invertible):{Colors.ENDC}\n")
-    print(f"   • Existe DEPENDENCIA entre los nodos")
-    print(f"   • Algunos nodos pueden estar redundantes")
-    print(f"   • La pseudo-inversa da la mejor aproximación")
-    print(f"   • Se minimiza el error cuadrático")
-
-print(f"\n{Colors.CYAN}💡 Significado del vector solución x:{Colors.ENDC}\n")
-print(f"   • Cada x[i] es el flujo de datos del nodo i")
-print(f"   • {Colors.GREEN}Positivo{Colors.ENDC}: el nodo ENVÍA más de lo que recibe")
-print(f"   • {Colors.RED}Negativo{Colors.ENDC}: el nodo RECIBE más de lo que envía")
-
-print(f"\n{Colors.BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}")
-print(f"{Colors.BLUE}🔧 RECOMENDACIONES PARA MEJORAR LA RED{Colors.ENDC}")
-print(f"{Colors.BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}\n")
-
-if abs(det_A) > tolerancia:
-    print(f"{Colors.GREEN}   ✓ La configuración actual es ÓPTIMA{Colors.ENDC}")
-    print(f"   ✓ Mantener el balance de flujos calculado")
-    print(f"   ✓ Monitorear el rendimiento regularmente")
-else:
-    print(f"{Colors.YELLOW}   ⚙  Revisar las conexiones entre nodos{Colors.ENDC}")
-    print(f"   ⚙  Considerar agregar o remover enlaces")
-    print(f"   ⚙  Ajustar capacidades (diagonal de A)")
-    print(f"   ⚙  Verificar redundancia de nodos")
-    print(f"   ⚙  Redistribuir la demanda de tráfico")
-
-print("\n")
-print_box("FIN DEL PROYECTO", Colors.GREEN, 70)
-print_box("Gracias por usar el sistema", Colors.CYAN, 70)
-
-print(f"\n{Colors.CYAN}Presione Enter para salir...{Colors.ENDC}", end="")
-input()
+    print("\n" * 2)
+    print_box("OPTIMIZACIÓN DE SISTEMA DE REDES", Colors.CYAN, 70)
+    print_box("Proyecto de Álgebra Lineal", Colors.BLUE, 70)
+    pause(0.5)
+
+    start_phase("FASE 1: planteamiento")
+    A, b, mostrar_pasos = read_problem()
+
+    start_phase("FASE 2: análisis")
+    analisis = analyze_phase(A, b)
+
+    start_phase("FASE 3: resolución")
+    solve_phase(A, b, analisis, mostrar_pasos)
+
+    start_phase("FASE 4: interpretación")
+    conclusions_phase(analisis.invertible)
+
+    profiler.finish()
+
+    print(f"\n{Colors.CYAN}Presione Enter para salir...{Colors.ENDC}", end="")
+    ask()
+
+if __name__ == "__main__":
+    main()
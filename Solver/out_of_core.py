@@ -0,0 +1,216 @@
+"""Resolución fuera de memoria de sistemas densos guardados en disco
+
+Para redes cuya matriz A no entra en RAM: A se lee de un .npy (o de
+cualquier np.memmap) y se factoriza LU por paneles de columnas, con un
+presupuesto de memoria fijo. La solución se escribe en otro .npy mapeado
+en memoria:
+
+    python -m Solver.out_of_core A.npy b.npy -o x.npy --memory-mb 512
+
+La factorización es LU "left-looking" con pivoteo parcial: cada panel de
+columnas se carga una vez, recibe las actualizaciones de los paneles ya
+factorizados (que se leen de a uno) y se vuelve a escribir. En memoria
+solo hay dos paneles a la vez. Los factores van a un archivo de trabajo
+en orden Fortran, de modo que cada panel es un bloque contiguo del disco.
+Se usa LU y no Gauss-Jordan porque hace un tercio menos de operaciones y
+en cada paso solo toca los paneles que hacen falta.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+from scipy import linalg
+from scipy.linalg import lapack
+
+from .profiling import estimate_flops, operation
+
+TOLERANCIA = 1e-10
+
+# Memoria para paneles por defecto: 256 MB
+DEFAULT_MEMORY_BUDGET = 256 * 2**20
+
+
+def open_matrix(source):
+    """Abre A sin cargarla: un .npy se mapea en memoria de solo lectura"""
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode="r")
+    return source
+
+
+def panel_width(n, memory_budget=DEFAULT_MEMORY_BUDGET, panels=3):
+    """Columnas por panel para que `panels` paneles n × w entren en el presupuesto"""
+    return int(max(1, min(n, memory_budget // (panels * 8 * max(n, 1)))))
+
+
+class OutOfCoreLU:
+    """Factorización LU de A por paneles sobre un archivo de trabajo
+
+    Las filas nunca se mueven en el disco: los intercambios del pivoteo
+    se guardan en la permutación `perm` (la fila i de PA es la fila
+    perm[i] del archivo) y cada panel se lee ya permutado.
+
+    Args:
+        A: Matriz cuadrada (np.memmap, arreglo o ruta a un .npy)
+        memory_budget: Bytes de RAM para paneles
+        workdir: Carpeta del archivo de trabajo (por defecto, la temporal)
+        tol: Tolerancia para considerar un pivote como cero
+
+    Raises:
+        np.linalg.LinAlgError: Si A es singular
+    """
+
+    def __init__(self, A, memory_budget=DEFAULT_MEMORY_BUDGET, workdir=None, tol=TOLERANCIA):
+        A = open_matrix(A)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError(f"A debe ser cuadrada, no {A.shape}")
+        self.n = A.shape[0]
+        self.memory_budget = memory_budget
+        self.width = panel_width(self.n, memory_budget)
+        self.tol = tol
+        self.perm = np.arange(self.n)
+
+        fd, self.path = tempfile.mkstemp(suffix=".lu", dir=workdir)
+        os.close(fd)
+        try:
+            self._W = np.memmap(self.path, dtype=np.float64, mode="w+",
+                                shape=(self.n, self.n), order="F")
+            self._copy(A)
+            with operation("lu_fuera_de_memoria", estimate_flops("det", self.n)):
+                self._factor()
+            self._W.flush()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Borra el archivo de trabajo"""
+        self._W = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+    def _panels(self):
+        return [(j0, min(j0 + self.width, self.n)) for j0 in range(0, self.n, self.width)]
+
+    def _copy(self, A):
+        """Copia A al archivo de trabajo por bloques en su orden de memoria"""
+        step = max(1, self.memory_budget // (2 * 8 * max(self.n, 1)))
+        for k0 in range(0, self.n, step):
+            k1 = min(k0 + step, self.n)
+            if A.flags.f_contiguous:
+                self._W[:, k0:k1] = A[:, k0:k1]
+            else:
+                self._W[k0:k1] = A[k0:k1]
+
+    def _factor(self):
+        W, perm = self._W, self.perm
+        scale = 0.0
+        for j0, j1 in self._panels():
+            P = np.array(W[perm, j0:j1])
+            scale = max(scale, float(np.max(np.abs(P))) if P.size else 0.0)
+
+            # Actualizaciones de los paneles ya factorizados
+            for k0, k1 in self._panels():
+                if k0 >= j0:
+                    break
+                L = np.array(W[perm[k0:], k0:k1])
+                P[k0:k1] = linalg.solve_triangular(L[:k1 - k0], P[k0:k1], lower=True,
+                                                   unit_diagonal=True, check_finite=False)
+                P[k1:] -= L[k1 - k0:] @ P[k0:k1]
+
+            # LU con pivoteo parcial de la parte del panel bajo la diagonal
+            lu, piv, info = lapack.dgetrf(P[j0:], overwrite_a=True)
+            diagonal = np.abs(np.diagonal(lu))
+            if info > 0 or np.min(diagonal) <= self.tol * max(scale, 1.0):
+                raise np.linalg.LinAlgError(
+                    "La matriz A es singular: no se puede factorizar para resolver Ax = b")
+            P[j0:] = lu
+            for t, p in enumerate(piv):
+                if p != t:
+                    perm[[j0 + t, j0 + p]] = perm[[j0 + p, j0 + t]]
+            W[perm, j0:j1] = P
+
+    def solve(self, B, out=None):
+        """Resuelve AX = B leyendo los factores panel por panel
+
+        Args:
+            B: Vector o matriz de demanda (entra en memoria: n × k)
+            out: Archivo .npy donde escribir X mapeado en memoria, o None
+                para devolver un arreglo en RAM
+
+        Returns:
+            X (np.memmap si se indicó out)
+        """
+        B = np.asarray(B, dtype=float)
+        if B.shape[0] != self.n:
+            raise ValueError(f"Dimensiones incompatibles: A {(self.n, self.n)}, b {B.shape}")
+        W, perm = self._W, self.perm
+        panels = self._panels()
+        X = B[perm].copy()
+
+        with operation("sustitucion_fuera_de_memoria"):
+            # Ly = Pb
+            for k0, k1 in panels:
+                L = np.array(W[perm[k0:], k0:k1])
+                X[k0:k1] = linalg.solve_triangular(L[:k1 - k0], X[k0:k1], lower=True,
+                                                   unit_diagonal=True, check_finite=False)
+                X[k1:] -= L[k1 - k0:] @ X[k0:k1]
+            # Ux = y
+            for k0, k1 in reversed(panels):
+                U = np.array(W[perm[:k1], k0:k1])
+                X[k0:k1] = linalg.solve_triangular(U[k0:], X[k0:k1], lower=False,
+                                                   check_finite=False)
+                X[:k0] -= U[:k0] @ X[k0:k1]
+
+        if out is None:
+            return X
+        result = np.lib.format.open_memmap(out, mode="w+", dtype=np.float64, shape=X.shape)
+        result[...] = X
+        result.flush()
+        return result
+
+
+def solve_out_of_core(A, b, out=None, memory_budget=DEFAULT_MEMORY_BUDGET, workdir=None):
+    """Resuelve Ax = b con A en disco, sin cargarla entera en memoria
+
+    Args:
+        A: np.memmap, arreglo o ruta a un .npy con la matriz A
+        b: Vector o matriz de demanda
+        out: Archivo .npy para la solución (mapeado en memoria), o None
+        memory_budget: Bytes de RAM para los paneles de la factorización
+        workdir: Carpeta del archivo de trabajo con los factores
+
+    Returns:
+        La solución x (np.memmap si se indicó out)
+    """
+    with OutOfCoreLU(A, memory_budget, workdir) as lu:
+        return lu.solve(b, out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resuelve Ax = b con A en disco (.npy), por paneles")
+    parser.add_argument("A", help="Archivo .npy con la matriz A")
+    parser.add_argument("b", help="Archivo .npy o .csv con el vector b")
+    parser.add_argument("-o", "--output", required=True, help="Archivo .npy para la solución")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_BUDGET / 2**20,
+                        help="Memoria para paneles en MB (por defecto: 256)")
+    parser.add_argument("--workdir", help="Carpeta del archivo de trabajo con los factores")
+    args = parser.parse_args(argv)
+
+    b = np.load(args.b) if args.b.endswith(".npy") else np.loadtxt(args.b, delimiter=",")
+    x = solve_out_of_core(args.A, b, args.output, int(args.memory_mb * 2**20), args.workdir)
+    print(f"Solución de {x.shape[0]} nodos escrita en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Instrumentación de tiempos, memoria y flops del solucionador
+
+Mide cada fase del programa y cada operación de álgebra lineal
+(factorizaciones, inversas, eliminación de Gauss-Jordan, ...) y genera un
+reporte JSON. Por defecto está desactivada y no cuesta nada; se activa
+sin tocar el código con variables de entorno:
+
+    SOLVER_PROFILE=reporte.json      tiempos por fase y por operación
+    SOLVER_PROFILE_MEMORY=1          además, asignaciones con tracemalloc
+    SOLVER_CPROFILE=perfil.prof      además, perfil completo con cProfile
+
+o desde el modo por lotes con --profile, --profile-memory y --cprofile.
+
+Cada fase reporta tiempo de reloj, tiempo de CPU y tiempo de espera
+(animaciones, pausas), de modo que el cómputo real no se confunde con
+los sleep ni con los input() del modo interactivo.
+"""
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Operaciones de punto flotante aproximadas de cada rutina (matriz n × n)
+FLOP_ESTIMATES = {
+    "det": lambda n, m: 2.0 * n**3 / 3.0,
+    "lu": lambda n, m: 2.0 * n**3 / 3.0,
+    "cholesky": lambda n, m: n**3 / 3.0,
+    "ldlt": lambda n, m: n**3 / 3.0,
+    "triangular": lambda n, m: n**2,
+    "diagonal": lambda n, m: n,
+    "matrix_rank": lambda n, m: 8.0 * n**3 / 3.0,
+    "inv": lambda n, m: 2.0 * n**3,
+    "pinv": lambda n, m: 22.0 * n**3,
+    "qr_pivoteo": lambda n, m: 4.0 * n**3 / 3.0,
+    "solucion_qr": lambda n, m: 4.0 * n**2 * m,
+    "gauss_jordan": lambda n, m: 2.0 * n**2 * (n + m),
+}
+
+
+def estimate_flops(kind, n, m=1):
+    """Estimación de flops de una rutina sobre A n × n con m lados derechos"""
+    estimate = FLOP_ESTIMATES.get(kind)
+    return estimate(float(n), float(m)) if estimate else None
+
+
+class Profiler:
+    """Acumula mediciones por fase y por operación
+
+    Args:
+        enabled: Si es False todas las mediciones son no-ops
+        memory: Registrar asignaciones y memoria pico con tracemalloc
+        cprofile: Archivo .prof donde guardar el perfil de cProfile, o None
+        report_path: Archivo JSON del reporte que escribe finish()
+    """
+
+    def __init__(self, enabled=True, memory=False, cprofile=None, report_path=None):
+        self.enabled = enabled
+        self.memory = memory
+        self.cprofile_path = cprofile
+        self.report_path = report_path
+        self.phases = []
+        self.operations = {}
+        # Mediciones abiertas por id: puede haber varias a la vez en hilos
+        self._open = {}
+        self._lock = threading.Lock()
+        self._current_phase = None
+        self._phase_ctx = None
+        self._waited = 0.0
+        self._profile = None
+        self._started = None
+        self._own_tracemalloc = False
+
+    def start(self):
+        """Empieza la medición global (tracemalloc y cProfile si se pidieron)"""
+        if not self.enabled or self._started is not None:
+            return
+        self._started = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        if self.cprofile_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """Detiene cProfile y tracemalloc; guarda el archivo .prof"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile_path)
+        if self._own_tracemalloc:
+            with self._lock:
+                self._checkpoint_peak()
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+
+    def _checkpoint_peak(self):
+        # tracemalloc tiene un único pico global: antes de reiniciarlo se
+        # lo reparte a todas las mediciones abiertas (con _lock tomado)
+        if not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._open.values():
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def _measure(self):
+        frame = {"peak": 0}
+        tracing = self.memory and tracemalloc.is_tracing()
+        with self._lock:
+            frame["waited"] = self._waited
+            if tracing:
+                self._checkpoint_peak()
+                frame["current"] = tracemalloc.get_traced_memory()[0]
+            self._open[id(frame)] = frame
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield frame
+        finally:
+            frame["wall_s"] = time.perf_counter() - wall
+            frame["cpu_s"] = time.process_time() - cpu
+            with self._lock:
+                frame["wait_s"] = self._waited - frame["waited"]
+                if tracing:
+                    self._checkpoint_peak()
+                    current = tracemalloc.get_traced_memory()[0]
+                    frame["alloc_mb"] = (current - frame["current"]) / 2**20
+                    frame["peak_mb"] = (frame["peak"] - frame["current"]) / 2**20
+                self._open.pop(id(frame), None)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Mide una fase del programa (FASE 1, carga, resolución, ...)"""
+        if not self.enabled:
+            yield
+            return
+        record = {"name": name, "operations": {}}
+        previous, self._current_phase = self._current_phase, record
+        try:
+            with self._measure() as frame:
+                yield
+        finally:
+            self._current_phase = previous
+            record["wall_s"] = frame["wall_s"]
+            record["cpu_s"] = frame["cpu_s"]
+            record["wait_s"] = frame["wait_s"]
+            record["compute_s"] = frame["wall_s"] - frame["wait_s"]
+            for key in ("alloc_mb", "peak_mb"):
+                if key in frame:
+                    record[key] = frame[key]
+            self.phases.append(record)
+
+    def start_phase(self, name):
+        """Cierra la fase en curso y abre otra (para código secuencial)"""
+        self.end_phase()
+        self._phase_ctx = self.phase(name)
+        self._phase_ctx.__enter__()
+
+    def end_phase(self):
+        if self._phase_ctx is not None:
+            ctx, self._phase_ctx = self._phase_ctx, None
+            ctx.__exit__(None, None, None)
+
+    @contextlib.contextmanager
+    def operation(self, name, flops=None):
+        """Mide una llamada de álgebra lineal; las repetidas se acumulan"""
+        if not self.enabled:
+            yield
+            return
+        try:
+            with self._measure() as frame:
+                yield
+        finally:
+            with self._lock:
+                self._record_operation(name, flops, frame)
+
+    def _record_operation(self, name, flops, frame):
+        stats = self.operations.setdefault(name, {
+            "count": 0, "wall_s": 0.0, "cpu_s": 0.0, "flops": 0.0})
+        stats["count"] += 1
+        stats["wall_s"] += frame["wall_s"]
+        stats["cpu_s"] += frame["cpu_s"]
+        if flops:
+            stats["flops"] += flops
+        if "peak_mb" in frame:
+            stats["alloc_mb"] = stats.get("alloc_mb", 0.0) + frame["alloc_mb"]
+            stats["peak_mb"] = max(stats.get("peak_mb", 0.0), frame["peak_mb"])
+        if self._current_phase is not None:
+            ops = self._current_phase["operations"]
+            ops[name] = ops.get(name, 0.0) + frame["wall_s"]
+
+    @contextlib.contextmanager
+    def waiting(self):
+        """Marca tiempo de espera (animaciones, pausas) que no es cómputo"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._waited += time.perf_counter() - start
+
+    def report(self, top=25):
+        """Reporte estructurado con fases, operaciones y perfil de cProfile"""
+        operations = {}
+        for name, stats in self.operations.items():
+            entry = dict(stats)
+            if entry["flops"] and entry["wall_s"] > 0:
+                entry["gflops_s"] = entry["flops"] / entry["wall_s"] / 1e9
+            operations[name] = entry
+        report = {
+            "total_s": (time.perf_counter() - self._started) if self._started else 0.0,
+            "memory": self.memory,
+            "phases": self.phases,
+            "operations": operations,
+        }
+        if self._profile is not None:
+            report["cprofile"] = {"file": self.cprofile_path,
+                                  "top": _cprofile_top(self._profile, top)}
+        return report
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+
+    def finish(self):
+        """Detiene las mediciones y escribe el reporte si se indicó archivo"""
+        if not self.enabled:
+            return
+        self.end_phase()
+        self.stop()
+        if self.report_path:
+            self.write(self.report_path)
+
+
+def _cprofile_top(profile, top):
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({function})",
+                     "ncalls": nc, "tottime_s": tt, "cumtime_s": ct})
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return rows[:top]
+
+
+# Perfilador activo: las funciones instrumentadas miden contra este
+_active = Profiler(enabled=False)
+
+
+def get_profiler():
+    return _active
+
+
+def set_profiler(profiler):
+    """Activa un perfilador (o uno desactivado con None) y devuelve el anterior"""
+    global _active
+    previous = _active
+    _active = profiler if profiler is not None else Profiler(enabled=False)
+    _active.start()
+    return previous
+
+
+def profiler_from_env(environ=None):
+    """Crea y activa el perfilador según SOLVER_PROFILE y compañía"""
+    environ = os.environ if environ is None else environ
+    report_path = environ.get("SOLVER_PROFILE") or None
+    cprofile = environ.get("SOLVER_CPROFILE") or None
+    memory = environ.get("SOLVER_PROFILE_MEMORY", "") not in ("", "0")
+    profiler = Profiler(enabled=bool(report_path or cprofile),
+                        memory=memory, cprofile=cprofile, report_path=report_path)
+    set_profiler(profiler)
+    return profiler
+
+
+def phase(name):
+    return _active.phase(name)
+
+
+def start_phase(name):
+    _active.start_phase(name)
+
+
+def end_phase():
+    _active.end_phase()
+
+
+def operation(name, flops=None):
+    return _active.operation(name, flops)
+
+
+def waiting():
+    return _active.waiting()
@@ -0,0 +1,52 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+from .profiling import operation
+
+TOLERANCIA = 1e-10
+
+# A partir de este tamaño y por debajo de esta densidad conviene el LU disperso
+SPARSE_MIN_NODES = 200
+SPARSE_MAX_DENSITY = 0.05
+
+
+def to_csr(A):
+    """Convierte A (densa o dispersa) a formato CSR de punto flotante"""
+    if sparse.issparse(A):
+        return sparse.csr_matrix(A, dtype=float)
+    return sparse.csr_matrix(np.asarray(A, dtype=float))
+
+
+def density(A):
+    """Fracción de elementos no nulos de A"""
+    n_rows, n_cols = A.shape
+    nnz = A.nnz if sparse.issparse(A) else np.count_nonzero(A)
+    return nnz / float(n_rows * n_cols)
+
+
+def is_sparse_candidate(A, min_nodes=SPARSE_MIN_NODES, max_density=SPARSE_MAX_DENSITY):
+    """Indica si A es lo bastante grande y dispersa para usar el LU disperso"""
+    if sparse.issparse(A):
+        return True
+    return A.shape[0] >= min_nodes and density(A) <= max_density
+
+
+def sparse_lu(A, tol=TOLERANCIA):
+    """Factoriza A con el LU disperso de SuperLU
+
+    Lanza np.linalg.LinAlgError si A es singular.
+    """
+    try:
+        with operation("lu_disperso"):
+            lu = sparse_linalg.splu(to_csr(A).tocsc())
+    except RuntimeError as exc:
+        raise np.linalg.LinAlgError("Matriz singular") from exc
+    if np.min(np.abs(lu.U.diagonal())) <= tol:
+        raise np.linalg.LinAlgError("Matriz singular")
+    return lu
+
+
+def solve_sparse(A, b, tol=TOLERANCIA):
+    """Resuelve Ax = b con el LU disperso, sin formar la inversa"""
+    return sparse_lu(A, tol).solve(np.asarray(b, dtype=float))
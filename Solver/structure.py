@@ -0,0 +1,457 @@
+import warnings
+
+import numpy as np
+from scipy import linalg, sparse
+from scipy.linalg import lapack
+from scipy.sparse import linalg as sparse_linalg
+
+from .profiling import estimate_flops, operation
+from .sparse_path import is_sparse_candidate, sparse_lu, to_csr
+
+# Una matriz de banda vale la pena si la banda ocupa a lo sumo esta fracción
+BAND_MAX_FRACTION = 0.25
+
+# Simetría: |A - Aᵀ| ≤ SYMMETRY_TOL · max|A|
+SYMMETRY_TOL = 1e-12
+
+
+class MatrixStructure:
+    """Propiedades de A que se detectan en O(n²) sin factorizar
+
+    Si A es dispersa se recorren solo sus elementos no nulos (O(nnz)),
+    sin pasarla a densa.
+
+    Attributes:
+        n: Dimensión
+        sparse: A es dispersa
+        lower_bandwidth, upper_bandwidth: Diagonales no nulas bajo y sobre
+            la principal (0 y 0 para una matriz diagonal)
+        symmetric: A = Aᵀ (salvo redondeo)
+        diagonally_dominant: |a_ii| ≥ Σ_j≠i |a_ij| en todas las filas
+        diagonal_sign: +1 o -1 si la diagonal tiene un solo signo, 0 si no
+        empty_line: A tiene una fila o una columna nula (es singular sin
+            necesidad de factorizarla)
+    """
+
+    def __init__(self, A):
+        self.sparse = sparse.issparse(A)
+        if self.sparse:
+            A = sparse.csr_matrix(A, dtype=float, copy=True)
+            A.eliminate_zeros()
+            coo = A.tocoo()
+            rows, cols, values = coo.row, coo.col, coo.data
+            self.n = A.shape[0]
+            self.lower_bandwidth = int(np.max(rows - cols, initial=0))
+            self.upper_bandwidth = int(np.max(cols - rows, initial=0))
+            filled_rows = np.bincount(rows, minlength=self.n) > 0
+            filled_cols = np.bincount(cols, minlength=self.n) > 0
+            scale = float(np.max(np.abs(values), initial=0.0))
+            asymmetry = abs(A - A.T).max() if A.nnz else 0.0
+            row_sums = np.asarray(abs(A).sum(axis=1)).ravel()
+            d = A.diagonal()
+        else:
+            A = np.asarray(A, dtype=float)
+            self.n = A.shape[0]
+            nonzero = A != 0
+            rows = np.arange(self.n)
+            filled_rows = nonzero.any(axis=1)
+            filled_cols = nonzero.any(axis=0)
+            first = np.argmax(nonzero, axis=1)
+            last = self.n - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+            self.lower_bandwidth = int(np.max((rows - first)[filled_rows], initial=0))
+            self.upper_bandwidth = int(np.max((last - rows)[filled_rows], initial=0))
+            scale = float(np.max(np.abs(A))) if A.size else 0.0
+            asymmetry = float(np.max(np.abs(A - A.T))) if A.size else 0.0
+            row_sums = np.sum(np.abs(A), axis=1)
+            d = np.diagonal(A)
+
+        self.symmetric = bool(asymmetry <= SYMMETRY_TOL * scale)
+        self.diagonally_dominant = bool(np.all(2.0 * np.abs(d) >= row_sums))
+        self.diagonal_sign = 1.0 if np.all(d > 0) else (-1.0 if np.all(d < 0) else 0.0)
+        self.empty_line = bool(not np.all(filled_rows) or not np.all(filled_cols))
+
+    @property
+    def diagonal(self):
+        return self.lower_bandwidth == 0 and self.upper_bandwidth == 0
+
+    @property
+    def triangular(self):
+        return self.lower_bandwidth == 0 or self.upper_bandwidth == 0
+
+    @property
+    def banded(self):
+        width = self.lower_bandwidth + self.upper_bandwidth + 1
+        return self.n >= 8 and width <= BAND_MAX_FRACTION * self.n
+
+    def candidate_paths(self):
+        """Métodos a intentar, del más rápido al más general
+
+        Solo Cholesky puede fallar sin que A sea singular (A simétrica pero
+        no definida): un pivote nulo en cualquier otro camino termina la
+        búsqueda. Una dispersa que no es diagonal ni de banda va directo al
+        LU disperso; las factorizaciones densas no se intentan.
+        """
+        if self.diagonal:
+            return ["diagonal"]
+        if self.sparse:
+            return ["banda"] if self.banded else ["lu_disperso"]
+        if self.triangular:
+            return ["triangular"]
+        paths = []
+        if self.banded:
+            paths.append("banda")
+        if self.symmetric:
+            if self.diagonal_sign != 0.0:
+                paths.append("cholesky")
+            paths.append("ldlt")
+        paths.append("lu")
+        return paths
+
+    def describe(self):
+        """Lista de propiedades en palabras, para mostrar en pantalla"""
+        names = []
+        if self.diagonal:
+            names.append("diagonal")
+        elif self.triangular:
+            names.append("triangular " + ("superior" if self.lower_bandwidth == 0 else "inferior"))
+        elif self.banded:
+            names.append(f"de banda ({self.lower_bandwidth}, {self.upper_bandwidth})")
+        if self.symmetric and not self.diagonal:
+            names.append("simétrica")
+        if self.diagonally_dominant:
+            names.append("diagonal dominante")
+        return names or ["general"]
+
+
+def detect_structure(A):
+    """Detecta la estructura de A (ver MatrixStructure)"""
+    return MatrixStructure(A)
+
+
+class StructuredFactorization:
+    """Factorización de A con el método más rápido que admite su estructura
+
+    Prueba en orden los caminos de structure.candidate_paths() (escalado
+    diagonal, sustitución triangular, LU de banda, Cholesky, LDLᵀ de
+    Bunch-Kaufman, LU general o LU disperso) y se queda con el primero que
+    funciona. Cada camino da además el determinante (en escala
+    logarítmica) y una estimación de la condición con la rutina de LAPACK
+    correspondiente.
+
+    Una fila o columna nula se detecta antes de factorizar, y un pivote
+    nulo en la LU (de banda, general o dispersa) o en la LDLᵀ termina la
+    búsqueda: A es singular y probar los demás caminos no sirve.
+
+    Solo se guardan los factores (copias propias, nunca la A de quien
+    llama): el objeto puede quedar en la caché aunque A cambie después.
+
+    Args:
+        A: Matriz cuadrada densa o dispersa
+        structure: MatrixStructure ya calculada (opcional)
+
+    Raises:
+        np.linalg.LinAlgError: Si A es singular
+    """
+
+    def __init__(self, A, structure=None):
+        if not sparse.issparse(A):
+            A = np.asarray(A, dtype=float)
+        self.n = A.shape[0]
+        self.structure = structure if structure is not None else detect_structure(A)
+        if self.structure.empty_line:
+            raise np.linalg.LinAlgError("La matriz A es singular (fila o columna nula)")
+        column_sums = abs(A).sum(axis=0)
+        self.anorm = float(np.max(column_sums)) if self.n else 0.0
+
+        for path in self.structure.candidate_paths():
+            with operation(f"estructura_{path}", self._flops(path)):
+                if getattr(self, f"_factor_{path}")(A):
+                    self.path = path
+                    return
+        raise np.linalg.LinAlgError("La matriz A es singular")
+
+    def _flops(self, path):
+        """Flops aproximados de factorizar A por el camino dado"""
+        if path == "banda":
+            kl, ku = self.structure.lower_bandwidth, self.structure.upper_bandwidth
+            return 2.0 * self.n * kl * (kl + ku + 1)
+        # El costo del LU disperso depende del relleno: no se estima
+        return estimate_flops(path, self.n)
+
+    # Cada _factor_* guarda sus factores, logabsdet, det_sign y condition.
+    # Devuelve False si el camino no sirve para esta matriz y lanza
+    # LinAlgError si encontró que A es singular
+
+    def _factor_diagonal(self, A):
+        d = np.array(A.diagonal(), dtype=float)
+        if np.any(d == 0):
+            raise np.linalg.LinAlgError("La matriz A es singular (pivote nulo)")
+        self._d = d
+        self._set_det(np.abs(d), np.sign(d))
+        self.condition = float(np.max(np.abs(d)) / np.min(np.abs(d)))
+        return True
+
+    def _factor_triangular(self, A):
+        self._lower = self.structure.upper_bandwidth == 0
+        d = np.diagonal(A)
+        if np.any(d == 0):
+            raise np.linalg.LinAlgError("La matriz A es singular (pivote nulo)")
+        self._triangle = np.array(A)  # La A de quien llama puede cambiar
+        self._set_det(np.abs(d), np.sign(d))
+        rcond, info = lapack.dtrcon(A, norm="1", uplo="L" if self._lower else "U", diag="N")
+        self.condition = _inverse_rcond(rcond, info)
+        return True
+
+    def _factor_banda(self, A):
+        kl, ku = self.structure.lower_bandwidth, self.structure.upper_bandwidth
+        ab = np.zeros((2 * kl + ku + 1, self.n))
+        for offset in range(-kl, ku + 1):
+            # ab[kl + ku + i - j, j] = A[i, j]
+            diag = A.diagonal(offset)
+            start = max(offset, 0)
+            ab[kl + ku - offset, start:start + len(diag)] = diag
+        lu, piv, info = lapack.dgbtrf(ab, kl, ku)
+        _check_breakdown("dgbtrf", info)
+        u = lu[kl + ku]
+        self._band = (lu, piv, kl, ku)
+        swaps = np.count_nonzero(piv != np.arange(self.n))
+        self._set_det(np.abs(u), np.sign(u), (-1.0) ** swaps)
+        rcond, info = lapack.dgbcon(kl, ku, lu, piv, self.anorm, norm="1")
+        self.condition = _inverse_rcond(rcond, info)
+        return True
+
+    def _factor_cholesky(self, A):
+        sign = self.structure.diagonal_sign
+        c, info = lapack.dpotrf(sign * A, lower=False, clean=True)
+        if info != 0:
+            return False
+        self._cholesky = (c, sign)
+        d = np.diagonal(c)
+        self._set_det(d ** 2, np.full(self.n, sign))
+        rcond, info = lapack.dpocon(c, self.anorm)
+        self.condition = _inverse_rcond(rcond, info)
+        return True
+
+    def _factor_ldlt(self, A):
+        ldu, ipiv, info = lapack.dsytrf(A)
+        _check_breakdown("dsytrf", info)
+        self._ldlt = (ldu, ipiv)
+        # D es diagonal por bloques de 1 × 1 y 2 × 2 (ipiv < 0 en ambas filas)
+        logabsdet, sign, k = 0.0, 1.0, 0
+        while k < self.n:
+            if ipiv[k] > 0:
+                block = ldu[k, k]
+                k += 1
+            else:
+                block = ldu[k, k] * ldu[k + 1, k + 1] - ldu[k, k + 1] ** 2
+                k += 2
+            logabsdet += np.log(abs(block))
+            sign *= np.sign(block)
+        self.logabsdet, self.det_sign = float(logabsdet), float(sign)
+        rcond, info = lapack.dsycon(ldu, ipiv, self.anorm)
+        self.condition = _inverse_rcond(rcond, info)
+        return True
+
+    def _factor_lu(self, A):
+        lu, piv, info = lapack.dgetrf(A)
+        _check_breakdown("dgetrf", info)
+        self._lu = (lu, piv)
+        d = np.diagonal(lu)
+        swaps = np.count_nonzero(piv != np.arange(self.n))
+        self._set_det(np.abs(d), np.sign(d), (-1.0) ** swaps)
+        rcond, info = lapack.dgecon(lu, self.anorm, norm="1")
+        self.condition = _inverse_rcond(rcond, info)
+        return True
+
+    def _factor_lu_disperso(self, A):
+        # Pr A Pc = L U con L de diagonal unitaria (SuperLU)
+        lu = sparse_lu(A, tol=0.0)
+        self._splu = lu
+        d = lu.U.diagonal()
+        self._set_det(np.abs(d), np.sign(d),
+                      permutation_sign(lu.perm_r) * permutation_sign(lu.perm_c))
+        # κ₁(A) = ‖A‖₁ ‖A⁻¹‖₁, con ‖A⁻¹‖₁ estimada con unas pocas soluciones
+        inverse = sparse_linalg.LinearOperator(
+            (self.n, self.n), matvec=lu.solve, rmatvec=lambda v: lu.solve(v, trans="T"),
+            dtype=float)
+        self.condition = self.anorm * float(sparse_linalg.onenormest(inverse))
+        return True
+
+    def _set_det(self, magnitudes, signs, extra_sign=1.0):
+        self.logabsdet = float(np.sum(np.log(magnitudes)))
+        self.det_sign = float(np.prod(signs) * extra_sign)
+
+    def solve(self, B):
+        """Resuelve AX = B con los factores del camino elegido"""
+        B = np.asarray(B, dtype=float)
+        if self.path == "diagonal":
+            return B / (self._d if B.ndim == 1 else self._d[:, None])
+        if self.path == "triangular":
+            return linalg.solve_triangular(self._triangle, B, lower=self._lower, check_finite=False)
+        if self.path == "lu_disperso":
+            return self._splu.solve(B)
+        if self.path == "banda":
+            lu, piv, kl, ku = self._band
+            X, info = lapack.dgbtrs(lu, kl, ku, B, piv)
+            routine = "dgbtrs"
+        elif self.path == "cholesky":
+            c, sign = self._cholesky
+            X, info = lapack.dpotrs(c, sign * B, lower=False)
+            routine = "dpotrs"
+        elif self.path == "ldlt":
+            ldu, ipiv = self._ldlt
+            X, info = lapack.dsytrs(ldu, ipiv, B)
+            routine = "dsytrs"
+        else:
+            lu, piv = self._lu
+            X, info = lapack.dgetrs(lu, piv, B)
+            routine = "dgetrs"
+        if info != 0:
+            raise np.linalg.LinAlgError(f"{routine} falló (info={info})")
+        return X
+
+
+def _check_breakdown(routine, info):
+    """info > 0 es un pivote exactamente nulo: A es singular"""
+    if info < 0:
+        raise ValueError(f"{routine}: argumento {-info} inválido")
+    if info > 0:
+        raise np.linalg.LinAlgError(f"La matriz A es singular (pivote nulo en {routine})")
+
+
+def _inverse_rcond(rcond, info):
+    return float("inf") if info != 0 or rcond == 0 else 1.0 / float(rcond)
+
+
+def permutation_sign(perm):
+    """Signo (+1/-1) de una permutación dada como arreglo de índices"""
+    seen = np.zeros(len(perm), dtype=bool)
+    sign = 1.0
+    for start in range(len(perm)):
+        if seen[start]:
+            continue
+        length = 0
+        j = start
+        while not seen[j]:
+            seen[j] = True
+            j = perm[j]
+            length += 1
+        if length % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def well_conditioned(condition, n):
+    """True si el rango numérico de A es n sin lugar a dudas
+
+    Con κ(A) · n · eps cerca de 1 la QR con pivoteo (y matrix_rank) podría
+    declarar A singular: esos casos se dejan al análisis general.
+    """
+    return condition * max(n, 1) * np.finfo(float).eps <= 1e-3
+
+
+class StructuredAnalysis:
+    """Análisis de Ax = b para una A invertible y bien condicionada
+
+    Tiene la misma interfaz que analysis.MatrixAnalysis, pero sale de la
+    factorización más barata que admite la estructura de A en lugar de
+    una QR con pivoteo: rango completo, solución única, determinante y
+    condición de los propios factores.
+    """
+
+    def __init__(self, factorization, b):
+        self.factorization = factorization
+        self.path = factorization.path
+        self.structure = factorization.structure
+        self.b = np.array(b, dtype=float)
+        self.n = factorization.n
+        self.rank = self.n
+        self.rank_augmented = self.n
+        self.consistent = True
+        self.residual_norm = 0.0
+        self.logabsdet = factorization.logabsdet
+        self.det_sign = factorization.det_sign
+        self.condition = factorization.condition
+        self._x = None
+
+    @property
+    def invertible(self):
+        return True
+
+    @property
+    def det(self):
+        """Determinante de A (puede desbordar a ±inf o 0 para n grande)"""
+        with np.errstate(over="ignore", under="ignore"):
+            return self.det_sign * float(np.exp(self.logabsdet))
+
+    @property
+    def x(self):
+        if self._x is None:
+            self._x = self.factorization.solve(self.b)
+        return self._x
+
+    def solve(self, B):
+        return self.factorization.solve(B)
+
+    def inverse(self):
+        with operation("inversa", estimate_flops("solucion_qr", self.n, self.n)):
+            return self.solve(np.eye(self.n))
+
+    def pseudo_inverse(self):
+        """Para A invertible, A⁺ = A⁻¹"""
+        return self.inverse()
+
+
+def _prepare(A):
+    """A densa, o CSR si es dispersa o lo bastante grande y rala para el LU disperso"""
+    if sparse.issparse(A) or (np.ndim(A) == 2 and is_sparse_candidate(np.asarray(A))):
+        return to_csr(A)
+    return np.asarray(A, dtype=float)
+
+
+def structured_analysis(A, b):
+    """StructuredAnalysis de Ax = b, o None si A no es claramente invertible"""
+    if np.ndim(A) != 2 or A.shape[0] != A.shape[1] or A.shape[0] == 0:
+        return None
+    try:
+        factorization = StructuredFactorization(_prepare(A))
+    except np.linalg.LinAlgError:
+        return None
+    if not well_conditioned(factorization.condition, factorization.n):
+        return None
+    return StructuredAnalysis(factorization, b)
+
+
+def structured_solve(A, b):
+    """Resuelve Ax = b por el camino más rápido que admite la estructura de A
+
+    Si A es singular o está muy mal condicionada se usa mínimos cuadrados
+    de norma mínima con la SVD (gelsd).
+
+    Returns:
+        Tupla (x, info) con info["path"] (el método usado) e
+        info["structure"] (las propiedades detectadas)
+    """
+    A = _prepare(A)
+    structure = detect_structure(A)
+    info = {"structure": structure.describe()}
+    try:
+        factorization = StructuredFactorization(A, structure)
+        if well_conditioned(factorization.condition, factorization.n):
+            info["path"] = factorization.path
+            info["condition"] = factorization.condition
+            return factorization.solve(b), info
+    except np.linalg.LinAlgError:
+        pass
+
+    # La SVD no tiene versión dispersa: solo aquí, con A singular, se densifica
+    A = A.toarray() if sparse.issparse(A) else A
+    with operation("svd", estimate_flops("pinv", A.shape[0])):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", linalg.LinAlgWarning)
+            # Misma tolerancia de rango que np.linalg.matrix_rank: con el corte
+            # por defecto (eps) el redondeo cuenta como rango y x no es de norma mínima
+            x = linalg.lstsq(A, b, cond=max(A.shape) * np.finfo(float).eps,
+                             lapack_driver="gelsd", check_finite=False)[0]
+    info["path"] = "svd"
+    return x, info
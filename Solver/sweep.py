@@ -0,0 +1,225 @@
+"""Barrido de escenarios en paralelo sobre variantes de A y b
+
+Describe una grilla de parámetros (ajuste de capacidad en la diagonal,
+caída de enlaces y escalado de la demanda), reparte los escenarios en un
+pool de procesos y junta los resultados en una sola tabla:
+
+    python -m Solver.sweep --A A.npy --b b.npy --diagonal-shift 0 -1 \\
+        --fail-link none 0,1 --demand-scale 0.5 1 2 -o barrido.csv
+
+La matriz base y la demanda se colocan una sola vez en memoria
+compartida; los procesos la leen desde ahí en lugar de recibir una copia
+serializada por cada escenario.
+
+Un escenario que falla (A singular en modo sparse, un enlace fuera de
+rango, ...) no detiene el barrido: su fila queda con estado "error" y
+el motivo, y su columna de X en NaN.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .batch import MODES, WarmStarts, error_result, load_system, solve_system
+
+PARAMETERS = ("diagonal_shift", "fail_link", "demand_scale")
+
+
+def build_grid(diagonal_shift=(0.0,), fail_link=(None,), demand_scale=(1.0,)):
+    """Producto cartesiano de los parámetros: una lista de escenarios
+
+    Args:
+        diagonal_shift: Valores sumados a la diagonal de A (capacidad);
+                        A_modificada del ejemplo es A_original con -1
+        fail_link: Enlaces (i, j) que se dan de baja, o None
+        demand_scale: Factores que multiplican al vector b
+
+    Returns:
+        Lista de diccionarios, uno por escenario
+    """
+    return [dict(zip(PARAMETERS, values))
+            for values in itertools.product(diagonal_shift, fail_link, demand_scale)]
+
+
+def apply_scenario(A, b, scenario):
+    """Devuelve copias de A y b con las modificaciones del escenario"""
+    A = np.array(A, dtype=float)
+    b = np.asarray(b, dtype=float) * scenario.get("demand_scale", 1.0)
+
+    link = scenario.get("fail_link")
+    if link is not None:
+        # Quitar el enlace en los dos sentidos y devolver a la diagonal de
+        # cada extremo el peso de su propia fila (A puede no ser simétrica)
+        i, j = link
+        if not (0 <= i < len(A) and 0 <= j < len(A)):
+            raise IndexError(f"Enlace fuera de la red: ({i}, {j})")
+        if i == j:
+            raise ValueError(f"Un enlace une dos nodos distintos: ({i}, {j})")
+        w_ij, w_ji = A[i, j], A[j, i]
+        A[i, j] = A[j, i] = 0.0
+        A[i, i] += w_ij
+        A[j, j] += w_ji
+
+    shift = scenario.get("diagonal_shift", 0.0)
+    if shift:
+        A[np.diag_indices_from(A)] += shift
+    return A, b
+
+
+class SharedArray:
+    """Arreglo de NumPy en memoria compartida entre procesos"""
+
+    def __init__(self, array):
+        array = np.ascontiguousarray(array, dtype=float)
+        self.shape = array.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.name = self._shm.name
+        np.ndarray(self.shape, dtype=float, buffer=self._shm.buf)[...] = array
+
+    def spec(self):
+        """Lo necesario para abrir el arreglo desde otro proceso"""
+        return self.name, self.shape
+
+    def release(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Vistas de los arreglos compartidos dentro de cada proceso del pool
+_worker_arrays = {}
+
+# En modo iterative, los escenarios seguidos con la misma A (la grilla
+# varía primero demand_scale) arrancan desde la solución anterior
+_warm = WarmStarts()
+
+
+def _attach(name, shape):
+    # Los procesos del pool comparten el resource_tracker del principal,
+    # que es quien libera el bloque en SharedArray.release
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+
+def _init_worker(A_spec, b_spec):
+    _worker_arrays["A"] = _attach(*A_spec)
+    _worker_arrays["b"] = _attach(*b_spec)
+
+
+def _solve_scenario(args):
+    index, scenario, mode = args
+    b = _worker_arrays["b"][1]
+    try:
+        A, b = apply_scenario(_worker_arrays["A"][1], b, scenario)
+        solver = _warm.solver_for(A) if mode == "iterative" else None
+        result = solve_system(A, b, mode, solver)
+    except Exception as exc:
+        # Una excepción que sale del proceso corta pool.map y se pierden
+        # los escenarios ya resueltos: se devuelve como resultado
+        result = error_result(exc, mode, len(b))
+    return index, result
+
+
+def run_sweep(A, b, grid, mode="direct", processes=None, chunksize=None):
+    """Resuelve todos los escenarios de la grilla en un pool de procesos
+
+    Args:
+        A: Matriz base de coeficientes de conexión
+        b: Vector base de demanda
+        grid: Lista de escenarios (ver build_grid)
+        mode: Método de resolución de batch.solve_system
+        processes: Número de procesos (por defecto, todos los núcleos)
+        chunksize: Escenarios por envío a cada proceso
+
+    Returns:
+        Tupla (tabla, X): la tabla es una lista de filas (diccionarios) y
+        X tiene la solución de cada escenario en una columna
+    """
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(grid) // (4 * processes))
+
+    shared_A = SharedArray(A)
+    shared_b = SharedArray(b)
+    try:
+        tasks = [(k, scenario, mode) for k, scenario in enumerate(grid)]
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(shared_A.spec(), shared_b.spec())) as pool:
+            results = dict(pool.map(_solve_scenario, tasks, chunksize=chunksize))
+    finally:
+        shared_A.release()
+        shared_b.release()
+
+    table = []
+    X = np.empty((len(b), len(grid)))
+    for k, scenario in enumerate(grid):
+        result = results[k]
+        X[:, k] = result.pop("x")
+        row = {"scenario": k}
+        row.update({p: scenario.get(p) for p in PARAMETERS})
+        row.update({key: v for key, v in result.items() if not isinstance(v, dict)})
+        row["x_norm"] = float(np.linalg.norm(X[:, k]))
+        table.append(row)
+    return table, X
+
+
+def write_table(table, destination):
+    """Escribe la tabla del barrido en CSV (o en la salida estándar)"""
+    columns = []
+    for row in table:
+        columns.extend(c for c in row if c not in columns)
+
+    f = sys.stdout if destination in (None, "-") else open(destination, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(table)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def _parse_link(text):
+    if text.lower() == "none":
+        return None
+    i, j = text.split(",")
+    return int(i), int(j)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido paralelo de escenarios de red")
+    parser.add_argument("input", nargs="?", help="Escenario base (.npz, .npy, .csv)")
+    parser.add_argument("--A", dest="A", help="Archivo con la matriz A")
+    parser.add_argument("--b", dest="b", help="Archivo con el vector b")
+    parser.add_argument("--diagonal-shift", nargs="+", type=float, default=[0.0])
+    parser.add_argument("--fail-link", nargs="+", type=_parse_link, default=[None],
+                        help="Enlaces 'i,j' que se dan de baja ('none' = ninguno)")
+    parser.add_argument("--demand-scale", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--mode", choices=MODES, default="direct")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-o", "--output", default="-", help="Tabla CSV de resultados")
+    parser.add_argument("--solutions", help="Archivo .npy donde guardar las soluciones X")
+    args = parser.parse_args(argv)
+
+    source = args.input or args.A
+    if not source:
+        parser.error("Debe indicar el escenario base o --A")
+    A, b = load_system(source, args.b)
+
+    grid = build_grid(args.diagonal_shift, args.fail_link, args.demand_scale)
+    table, X = run_sweep(A, b, grid, args.mode, args.processes)
+    write_table(table, args.output)
+    if args.solutions:
+        np.save(args.solutions, X)
+    failed = [row for row in table if row.get("estado") == "error"]
+    for row in failed:
+        print(f"Escenario {row['scenario']}: {row['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
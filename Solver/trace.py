@@ -0,0 +1,267 @@
+"""Registro compacto de los pasos de Gauss-Jordan y visor con saltos
+
+En lugar de guardar la matriz después de cada paso (O(n³) números), se
+guarda la operación: intercambio de filas, escala de una fila o
+F[j] = F[j] - factor × F[i]. Son O(n²) entradas de 17 bytes, más una
+copia de la matriz cada tanto (punto de control). El visor reconstruye
+el estado en cualquier paso desde el punto de control anterior más
+cercano, así que se puede recorrer por páginas o saltar a un paso sin
+volver a calcular nada:
+
+    python -m Solver trace record A.npy b.npy -o traza.npz
+    python -m Solver trace show traza.npz --page 3 --page-size 10
+    python -m Solver trace show traza.npz --step 120
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from .elimination import TOLERANCIA, augmented_buffer, gauss_jordan_steps
+
+# Operaciones, en el mismo formato que entrega gauss_jordan_steps
+KINDS = ("pivote", "intercambio", "singular", "escala", "elimina", "fin_columna", "atras")
+_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+# Puntos de control aproximados por traza si no se indica otra cosa
+DEFAULT_CHECKPOINTS = 16
+
+
+class StepTrace:
+    """Operaciones de una eliminación, en arreglos de NumPy
+
+    Cada paso ocupa un código de operación y tres campos (fila, fila o
+    columna, valor), con el significado de las tuplas de
+    gauss_jordan_steps. checkpoints[k] es la matriz después de k pasos.
+    """
+
+    def __init__(self, n, checkpoint_every):
+        self.n = n
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = {}
+        self._size = 0
+        self._kinds = np.empty(0, dtype=np.int8)
+        self._rows = np.empty(0, dtype=np.int32)
+        self._cols = np.empty(0, dtype=np.int32)
+        self._values = np.empty(0)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, op):
+        """Agrega una operación de gauss_jordan_steps (modo detallado)"""
+        if self._size == len(self._kinds):
+            capacity = max(64, 2 * self._size)
+            self._kinds = np.resize(self._kinds, capacity)
+            self._rows = np.resize(self._rows, capacity)
+            self._cols = np.resize(self._cols, capacity)
+            self._values = np.resize(self._values, capacity)
+        kind = op[0]
+        if kind == "elimina_bloque":
+            raise ValueError("La traza se registra con detailed=True (una fila por paso)")
+        k = self._size
+        self._kinds[k] = _CODES[kind]
+        self._rows[k] = op[1] if len(op) > 1 else -1
+        self._cols[k] = op[2] if kind in ("intercambio", "elimina") else -1
+        self._values[k] = op[-1] if kind in ("escala", "elimina") else 0.0
+        self._size += 1
+
+    def op(self, k):
+        """El paso k como tupla de gauss_jordan_steps"""
+        kind = KINDS[self._kinds[k]]
+        i, j, value = int(self._rows[k]), int(self._cols[k]), float(self._values[k])
+        if kind == "atras":
+            return (kind,)
+        if kind == "intercambio":
+            return (kind, i, j)
+        if kind == "escala":
+            return (kind, i, value)
+        if kind == "elimina":
+            return (kind, i, j, value)
+        return (kind, i)
+
+    def checkpoint(self, k, M):
+        self.checkpoints[k] = M.copy()
+
+    @property
+    def nbytes(self):
+        """Memoria de la traza: operaciones más puntos de control"""
+        ops = self._size * (1 + 4 + 4 + 8)
+        return ops + sum(M.nbytes for M in self.checkpoints.values())
+
+    def save(self, path):
+        """Guarda la traza en un .npz (sin pickle)"""
+        steps = np.array(sorted(self.checkpoints), dtype=np.int64)
+        np.savez(path, n=self.n, checkpoint_every=self.checkpoint_every,
+                 kinds=self._kinds[:self._size], rows=self._rows[:self._size],
+                 cols=self._cols[:self._size], values=self._values[:self._size],
+                 checkpoint_steps=steps,
+                 checkpoints=np.stack([self.checkpoints[k] for k in steps]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            trace = cls(int(data["n"]), int(data["checkpoint_every"]))
+            trace._kinds = data["kinds"]
+            trace._rows = data["rows"]
+            trace._cols = data["cols"]
+            trace._values = data["values"]
+            trace._size = len(trace._kinds)
+            trace.checkpoints = dict(zip(data["checkpoint_steps"].tolist(), data["checkpoints"]))
+        return trace
+
+
+def record_trace(M, n, pivoting=True, tol=TOLERANCIA, checkpoint_every=None):
+    """Ejecuta Gauss-Jordan sobre M (en sitio) registrando cada paso
+
+    Args:
+        M: Matriz aumentada, como en gauss_jordan_steps
+        n: Número de columnas de A
+        pivoting: Pivoteo parcial
+        tol: Tolerancia de pivote
+        checkpoint_every: Pasos entre copias de la matriz (por defecto,
+            unas DEFAULT_CHECKPOINTS en toda la eliminación, que tiene
+            del orden de n² pasos)
+
+    Returns:
+        StepTrace con la matriz inicial, la final y los puntos de control
+    """
+    if checkpoint_every is None:
+        checkpoint_every = max(1, n * n // DEFAULT_CHECKPOINTS)
+    trace = StepTrace(n, checkpoint_every)
+    trace.checkpoint(0, M)
+    for op in gauss_jordan_steps(M, n, pivoting, tol, detailed=True):
+        trace.append(op)
+        if len(trace) % checkpoint_every == 0:
+            trace.checkpoint(len(trace), M)
+    trace.checkpoint(len(trace), M)
+    return trace
+
+
+def apply_step(M, op):
+    """Repite sobre M una operación registrada (igual que _forward_by_rows)"""
+    kind = op[0]
+    if kind == "intercambio":
+        _, i, k = op
+        M[[i, k]] = M[[k, i]]
+    elif kind == "escala":
+        _, i, pivot = op
+        M[i] /= pivot
+    elif kind == "elimina":
+        _, j, i, factor = op
+        M[j] -= factor * M[i]
+
+
+class TraceViewer:
+    """Reconstruye bajo demanda la matriz en cualquier paso de una traza
+
+    Avanzar de a un paso cuesta una operación de fila; un salto hacia
+    atrás (o muy adelante) parte del punto de control más cercano.
+    La matriz que se entrega es la interna del visor: cambia al avanzar,
+    hay que copiarla si se la quiere conservar.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+        self._steps = sorted(trace.checkpoints)
+        self._position = 0
+        self._M = trace.checkpoints[0].copy()
+
+    def __len__(self):
+        return len(self.trace)
+
+    def seek(self, k):
+        """Matriz después de los primeros k pasos (0 ≤ k ≤ len)"""
+        if not 0 <= k <= len(self.trace):
+            raise IndexError(f"Paso fuera de la traza: {k}")
+        nearest = self._steps[int(np.searchsorted(self._steps, k, side="right")) - 1]
+        if k < self._position or nearest > self._position:
+            self._M[...] = self.trace.checkpoints[nearest]
+            self._position = nearest
+        while self._position < k:
+            apply_step(self._M, self.trace.op(self._position))
+            self._position += 1
+        return self._M
+
+    def replay(self, start=0, stop=None):
+        """Genera (k, operación, matriz después de la operación) de start a stop"""
+        stop = len(self.trace) if stop is None else min(stop, len(self.trace))
+        for k in range(start, stop):
+            yield k, self.trace.op(k), self.seek(k + 1)
+
+    def page(self, number, size=20):
+        """Los pasos de la página `number` (desde 0) de `size` pasos"""
+        return self.replay(number * size, (number + 1) * size)
+
+
+def describe(op):
+    """Texto de un paso, numerando filas y columnas desde 1"""
+    kind = op[0]
+    if kind == "pivote":
+        return f"Pivote en posición [{op[1] + 1},{op[1] + 1}]"
+    if kind == "intercambio":
+        return f"Intercambio de fila {op[1] + 1} con fila {op[2] + 1}"
+    if kind == "singular":
+        return f"Pivote nulo en la columna {op[1] + 1}: se salta"
+    if kind == "escala":
+        return f"Fila {op[1] + 1} dividida entre {op[2]:.4g}"
+    if kind == "elimina":
+        return f"F{op[1] + 1} = F{op[1] + 1} - ({op[3]:.4g}) × F{op[2] + 1}"
+    if kind == "fin_columna":
+        return f"Fin de la columna {op[1] + 1}"
+    return "Eliminación hacia atrás"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Traza de Gauss-Jordan paso a paso")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Resuelve Ax = b y guarda la traza")
+    record.add_argument("A", help="Archivo con A, con [A|b] o .npz con A y b")
+    record.add_argument("b", nargs="?", help="Archivo con b (si no viene junto con A)")
+    record.add_argument("-o", "--output", required=True, help="Archivo .npz para la traza")
+    record.add_argument("--no-pivoting", action="store_true", help="Sin intercambio de filas")
+    record.add_argument("--checkpoint-every", type=int, default=None,
+                        help="Pasos entre copias de la matriz")
+
+    show = commands.add_parser("show", help="Muestra pasos de una traza guardada")
+    show.add_argument("trace", help="Archivo .npz de la traza")
+    show.add_argument("--step", type=int, help="Muestra la matriz después de ese paso")
+    show.add_argument("--page", type=int, default=0, help="Página de pasos (desde 0)")
+    show.add_argument("--page-size", type=int, default=20, help="Pasos por página")
+    show.add_argument("--matrices", action="store_true",
+                      help="Muestra la matriz después de cada paso de la página")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        from .batch import load_system
+
+        A, b = load_system(args.A, args.b)
+        n = A.shape[0]
+        trace = record_trace(augmented_buffer(A, b), n, not args.no_pivoting,
+                             checkpoint_every=args.checkpoint_every)
+        trace.save(args.output)
+        print(f"{len(trace)} pasos ({trace.nbytes / 2**20:.2f} MB) guardados en {args.output}")
+        return 0
+
+    from .main import format_matrix
+
+    trace = StepTrace.load(args.trace)
+    viewer = TraceViewer(trace)
+    if args.step is not None:
+        M = viewer.seek(args.step)
+        title = f"Después del paso {args.step}" if args.step else "Matriz inicial"
+        sys.stdout.write(format_matrix(M, title, separator_pos=trace.n))
+        return 0
+
+    pages = -(-len(trace) // args.page_size)
+    print(f"Página {args.page + 1} de {pages} ({len(trace)} pasos)")
+    for k, op, M in viewer.page(args.page, args.page_size):
+        print(f"{k + 1:>8}  {describe(op)}")
+        if args.matrices and op[0] in ("intercambio", "escala", "elimina"):
+            sys.stdout.write(format_matrix(M, f"Paso {k + 1}", separator_pos=trace.n))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
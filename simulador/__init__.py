@@ -0,0 +1,33 @@
+"""Simulador de la red de comunicaciones
+
+Solo depende de NumPy y SciPy; matplotlib y seaborn se cargan la primera
+vez que se pide un gráfico (NetworkOptimizer.plot o simulador.plotting).
+Los nombres de abajo se importan de su módulo la primera vez que se usan.
+"""
+import importlib
+
+_EXPORTS = {
+    "EDGE_DTYPE": "edge_list",
+    "DemandStream": "streaming",
+    "NetworkOptimizer": "main",
+    "StreamStats": "streaming",
+    "iter_demand_file": "streaming",
+    "iter_trajectory": "streaming",
+    "load_edge_list": "edge_list",
+    "write_edge_file": "edge_list",
+    "write_trajectory": "streaming",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
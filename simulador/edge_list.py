@@ -0,0 +1,181 @@
+import itertools
+import numpy as np
+from scipy import sparse
+from typing import Iterator, List, Tuple
+
+# Registro binario compacto de un enlace: 16 bytes por enlace
+EDGE_DTYPE = np.dtype([("origen", "<i4"), ("destino", "<i4"), ("flujo", "<f8")])
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+Links = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def links_to_arrays(connections: List[Tuple[int, int, float]]) -> Links:
+    """
+    Convierte una lista de tuplas (origen, destino, flujo) a tres arreglos.
+
+    Returns:
+        Tupla (origen, destino, flujo) de arreglos NumPy
+    """
+    links = np.asarray(connections, dtype=float).reshape(-1, 3)
+    return links[:, 0].astype(np.intp), links[:, 1].astype(np.intp), links[:, 2]
+
+
+def check_links(n: int, origen: np.ndarray, destino: np.ndarray, source: str = "los enlaces"):
+    """
+    Comprueba que todos los enlaces unan nodos de [0, n).
+
+    Un índice negativo no da error en NumPy: se contaría desde el final y
+    el enlace iría a parar a otro nodo sin aviso.
+
+    Raises:
+        ValueError: Si algún enlace usa un nodo fuera de rango
+    """
+    if len(origen) == 0:
+        return
+    low = min(origen.min(), destino.min())
+    high = max(origen.max(), destino.max())
+    if low < 0 or high >= n:
+        raise ValueError(f"Enlace con nodo fuera de rango [0, {n}) en {source}")
+
+
+def scatter_links(A: np.ndarray, origen: np.ndarray, destino: np.ndarray, flujo: np.ndarray,
+                  source: str = "los enlaces"):
+    """
+    Acumula enlaces bidireccionales en la matriz densa A (en sitio).
+
+    Cada enlace suma flujo en (o, d) y (d, o) y resta flujo en la diagonal
+    de ambos extremos. Los enlaces repetidos se acumulan.
+
+    Raises:
+        ValueError: Si algún enlace usa un nodo fuera de rango (source
+            indica su origen en el mensaje)
+    """
+    n = A.shape[0]
+    check_links(n, origen, destino, source)
+    np.add.at(A, (origen, destino), flujo)
+    np.add.at(A, (destino, origen), flujo)
+    degree = np.bincount(origen, weights=flujo, minlength=n)
+    degree += np.bincount(destino, weights=flujo, minlength=n)
+    A[np.diag_indices(n)] -= degree
+
+
+def links_to_csr(n: int, origen: np.ndarray, destino: np.ndarray, flujo: np.ndarray) -> sparse.csr_matrix:
+    """
+    Construye la matriz de conectividad dispersa (CSR) de un bloque de enlaces.
+
+    Los duplicados se suman al convertir de COO a CSR.
+
+    Raises:
+        ValueError: Si algún enlace usa un nodo fuera de rango
+    """
+    check_links(n, origen, destino)
+    nodes = np.arange(n)
+    degree = np.bincount(origen, weights=flujo, minlength=n)
+    degree += np.bincount(destino, weights=flujo, minlength=n)
+    rows = np.concatenate([origen, destino, nodes])
+    cols = np.concatenate([destino, origen, nodes])
+    vals = np.concatenate([flujo, flujo, -degree])
+    return sparse.coo_matrix((vals, (rows, cols)), shape=(n, n)).tocsr()
+
+
+def write_edge_file(path: str, origen: np.ndarray, destino: np.ndarray, flujo: np.ndarray):
+    """Guarda enlaces en el formato binario de registros EDGE_DTYPE (.npy)"""
+    edges = np.empty(len(origen), dtype=EDGE_DTYPE)
+    edges["origen"] = origen
+    edges["destino"] = destino
+    edges["flujo"] = flujo
+    np.save(path, edges)
+
+
+def iter_edge_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Links]:
+    """
+    Lee un archivo de enlaces por bloques de a lo sumo chunk_size enlaces.
+
+    Formatos:
+        .npy        arreglo estructurado EDGE_DTYPE (se lee con mmap)
+        otro        CSV "origen,destino,flujo"; se ignoran los comentarios
+                    (#) y una fila de encabezado no numérica
+
+    Yields:
+        Tuplas (origen, destino, flujo) de arreglos NumPy
+    """
+    if path.endswith(".npy"):
+        edges = np.load(path, mmap_mode="r")
+        for start in range(0, len(edges), chunk_size):
+            block = edges[start:start + chunk_size]
+            yield (block["origen"].astype(np.intp), block["destino"].astype(np.intp),
+                   block["flujo"].astype(float))
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line for line in f if line.strip() and not line.lstrip().startswith("#"))
+        first = next(lines, None)
+        if first is None:
+            return
+        try:
+            float(first.split(",")[0])
+            lines = itertools.chain([first], lines)
+        except ValueError:
+            pass  # Encabezado
+
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                break
+            data = np.loadtxt(block, delimiter=",", ndmin=2)
+            yield data[:, 0].astype(np.intp), data[:, 1].astype(np.intp), data[:, 2]
+
+
+def load_edge_list(path: str, num_nodes: int, use_sparse: bool = False,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Construye la matriz de conectividad leyendo el archivo de enlaces por bloques.
+
+    En la matriz densa cada bloque se acumula en sitio y se descarta antes
+    de leer el siguiente. En la dispersa cada bloque se reduce a sus
+    entradas fuera de la diagonal (los duplicados del bloque ya sumados) y
+    el grado de cada nodo se acumula en un vector; la CSR se arma una sola
+    vez al final, en lugar de sumar una matriz por bloque.
+
+    Args:
+        path: Archivo de enlaces (ver iter_edge_chunks)
+        num_nodes: Número de nodos de la red
+        use_sparse: Si es True devuelve una matriz CSR
+        chunk_size: Enlaces por bloque
+
+    Returns:
+        Matriz de conectividad densa o CSR
+
+    Raises:
+        ValueError: Si algún enlace usa un nodo fuera de rango
+    """
+    if not use_sparse:
+        A = np.zeros((num_nodes, num_nodes))
+        for origen, destino, flujo in iter_edge_chunks(path, chunk_size):
+            scatter_links(A, origen, destino, flujo, path)
+        return A
+
+    rows, cols, vals = [], [], []
+    degree = np.zeros(num_nodes)
+    for origen, destino, flujo in iter_edge_chunks(path, chunk_size):
+        check_links(num_nodes, origen, destino, path)
+        if origen.size == 0:
+            continue
+        block = sparse.coo_matrix(
+            (np.concatenate([flujo, flujo]),
+             (np.concatenate([origen, destino]), np.concatenate([destino, origen]))),
+            shape=(num_nodes, num_nodes)).tocsr().tocoo()
+        rows.append(block.row)
+        cols.append(block.col)
+        vals.append(block.data)
+        degree += np.bincount(origen, weights=flujo, minlength=num_nodes)
+        degree += np.bincount(destino, weights=flujo, minlength=num_nodes)
+
+    nodes = np.arange(num_nodes)
+    rows.append(nodes)
+    cols.append(nodes)
+    vals.append(-degree)
+    return sparse.coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(num_nodes, num_nodes)).tocsr()
@@ -1,33 +1,101 @@
+import os
+import warnings
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from scipy import linalg, sparse
+from typing import List, Optional, Tuple
+
+from Solver.cache import content_key, get_cache
+from Solver.laplacian import GroundedLaplacian, is_laplacian
+from Solver.mixed_precision import MixedPrecisionLU
+from Solver.partition import PARTITION_MIN_NODES, find_components
+from Solver.sparse_path import sparse_lu
+
+from .edge_list import (DEFAULT_CHUNK_SIZE, links_to_arrays, links_to_csr,
+                        load_edge_list, scatter_links)
 
 class NetworkOptimizer:
     """Clase para modelar y optimizar el sistema de redes de comunicaciones"""
 
-    def __init__(self, num_nodes: int = 3):
+    def __init__(self, num_nodes: int = 3, max_low_rank_updates: int = 32,
+                 drift_tol: float = 1e-8, workers: Optional[int] = None,
+                 precision: str = "double"):
         """Inicializar el optimizador de red
         Args:
             num_nodes (int): Número de nodos en la red.
+            max_low_rank_updates (int): Cambios de enlaces acumulados con
+                Sherman-Morrison-Woodbury antes de volver a factorizar.
+            drift_tol (float): Residuo relativo ‖AX - B‖ / ‖B‖ a partir del
+                cual se vuelve a factorizar tras una actualización.
+            workers (int): Hilos para factorizar y resolver las subredes
+                desconectadas en paralelo (por defecto, todos los núcleos).
+            precision (str): "double" factoriza en float64; "mixed" usa
+                LU en float32 con refinamiento iterativo en float64 (más
+                rápido para una A densa grande, aunque usa algo más de
+                memoria: guarda los factores en float32 y una copia de A).
         """
+        if precision not in ("double", "mixed"):
+            raise ValueError(f"Precisión desconocida: {precision!r}")
         self.num_nodes = num_nodes
+        self.max_low_rank_updates = max_low_rank_updates
+        self.drift_tol = drift_tol
+        self.workers = workers
+        self.precision = precision
+        self._factorization = None
+        self._low_rank = None
         self.A = None  
         self.B = None  
         self.X = None  
         self.A_inv = None
+
+    @property
+    def A(self) -> np.ndarray:
+        """Matriz de conectividad actual"""
+        return self._A
+
+    @A.setter
+    def A(self, value: np.ndarray):
+        # Cualquier cambio de A deja obsoletos la factorización y la inversa.
+        # Se guarda una copia: las actualizaciones de enlaces modifican A en
+        # sitio y no deben tocar el arreglo de quien la asignó
+        if value is None:
+            self._A = None
+        elif sparse.issparse(value):
+            self._A = sparse.csr_matrix(value, dtype=float, copy=True)
+        else:
+            self._A = np.array(value, dtype=float)
+        self.invalidate_factorization()
+
+    def invalidate_factorization(self):
+        """Descarta la factorización y la inversa guardadas.
+
+        Se llama automáticamente al asignar A; hay que llamarla a mano si
+        se modifica A en sitio (por ejemplo A[i, j] = valor).
+        """
+        self._factorization = None
+        self._low_rank = None
+        self.A_inv = None
     
-    def create_connectivity_matrix(self, connections: List[Tuple[int, int, float]] = None) -> np.ndarray:
+    def create_connectivity_matrix(self, connections: List[Tuple[int, int, float]] = None,
+                                   use_sparse: bool = False) -> np.ndarray:
         """
         Crea la matriz A de conectividad basada en las conexiones entre nodos.
         
         Args:
             connections: Lista de tuplas (nodo_origen, nodo_destino, flujo)
                         Si es None, usa la configuración por defecto del proyecto
+            use_sparse: Si es True construye A en formato CSR, con memoria
+                        proporcional al número de enlaces y no a n²
         
         Returns:
             Matriz A de conectividad
+
+        Raises:
+            ValueError: Si algún enlace usa un nodo fuera de [0, num_nodes)
         """
+        if use_sparse:
+            return self.create_sparse_connectivity_matrix(connections)
+
         # Inicializar matriz con ceros
         A = np.zeros((self.num_nodes, self.num_nodes))
 
@@ -40,5 +108,404 @@ class NetworkOptimizer:
             ], dtype=float)
         else:
             #Contruir matriz basada en conexiones proporcionadas
-            for i in range(self.num_nodes):
-            
\ No newline at end of file
+            scatter_links(A, *links_to_arrays(connections))
+
+        self.A = A
+        return A
+
+    def create_sparse_connectivity_matrix(self, connections: List[Tuple[int, int, float]] = None) -> sparse.csr_matrix:
+        """
+        Crea la matriz A de conectividad en formato disperso CSR.
+
+        Produce la misma matriz que create_connectivity_matrix, pero sin
+        reservar nunca la matriz densa de n × n.
+
+        Args:
+            connections: Lista de tuplas (nodo_origen, nodo_destino, flujo)
+                        Si es None, usa la configuración por defecto del proyecto
+
+        Returns:
+            Matriz A de conectividad en formato CSR
+        """
+        if connections is None:
+            # Configuración por defecto: triángulo de 3 nodos con flujo 1
+            connections = [(0, 1, 1.0), (0, 2, 1.0), (1, 2, 1.0)]
+            n = 3
+        else:
+            n = self.num_nodes
+
+        A = links_to_csr(n, *links_to_arrays(connections))
+
+        self.A = A
+        return self.A
+
+    def load_connectivity_matrix(self, path: str, use_sparse: bool = False,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Crea la matriz A leyendo un archivo de enlaces por bloques.
+
+        Pensado para exportaciones con millones de enlaces: nunca se crea
+        la lista de tuplas de Python, solo arreglos NumPy de un bloque.
+
+        Args:
+            path: CSV "origen,destino,flujo" o .npy de registros EDGE_DTYPE
+            use_sparse: Si es True construye A en formato CSR
+            chunk_size: Enlaces leídos por bloque
+
+        Returns:
+            Matriz A de conectividad
+        """
+        self.A = load_edge_list(path, self.num_nodes, use_sparse, chunk_size)
+        return self.A
+
+    def factorize(self, tol: float = 1e-10) -> Tuple[str, tuple]:
+        """
+        Factoriza A una sola vez y guarda el resultado para resolver
+        muchos vectores de demanda sin volver a factorizar.
+
+        Usa Cholesky cuando A (o -A, como en las matrices de conectividad
+        con diagonal negativa) es simétrica definida positiva, y LU con
+        pivoteo parcial en cualquier otro caso. Si A es dispersa usa el LU
+        disperso de SuperLU. Si A es singular pero es el laplaciano de la
+        red (como la matriz por defecto) se fija un nodo de referencia por
+        componente conexa y las soluciones son las de norma mínima.
+
+        Con precision="mixed" una A densa se factoriza en float32 y cada
+        solución se refina en float64; si A está demasiado mal condicionada
+        para que el refinamiento converja se vuelve sola a float64.
+
+        Si la red está partida en subredes sin enlaces entre sí, cada una
+        se factoriza por separado (y en paralelo): el costo es el de
+        varias matrices chicas y no el de una grande.
+
+        Antes de factorizar se busca en la caché de resultados de Solver
+        una factorización de una matriz con el mismo contenido (también
+        para cada subred: si cambia una, las otras se reutilizan).
+
+        Args:
+            tol: Tolerancia para considerar un pivote como cero
+
+        Returns:
+            Tupla (tipo, factores) con tipo "cholesky", "lu", "mixta",
+            "splu", "laplaciano" o "bloques"
+
+        Raises:
+            ValueError: Si todavía no se creó la matriz A
+            np.linalg.LinAlgError: Si A es singular y no es un laplaciano
+        """
+        if self._factorization is not None:
+            return self._factorization
+        if self.A is None:
+            raise ValueError("Primero debe crear la matriz de conectividad A")
+
+        key = content_key("factorizacion", self.A, self.precision, tol)
+        self._factorization = get_cache().get(key)
+        if self._factorization is None:
+            self._factorization = self._factorize(tol)
+            get_cache().put(key, self._factorization)
+        return self._factorization
+
+    def _factorize(self, tol: float) -> Tuple[str, tuple]:
+        if self.A.shape[0] >= PARTITION_MIN_NODES:
+            blocks = find_components(self.A)
+            if len(blocks) > 1:
+                return ("bloques", self._factorize_blocks(blocks, tol))
+
+        try:
+            return self._factorize_regular(self.A, tol)
+        except np.linalg.LinAlgError:
+            if not is_laplacian(self.A):
+                raise
+            return ("laplaciano", GroundedLaplacian(self.A))
+
+    def _factorize_blocks(self, blocks: List[np.ndarray], tol: float):
+        """Un optimizador por subred, factorizados en paralelo"""
+        def factorize_block(rows):
+            sub = NetworkOptimizer(len(rows), self.max_low_rank_updates, self.drift_tol,
+                                   precision=self.precision)
+            if sparse.issparse(self.A):
+                sub.A = self.A[rows][:, rows]
+            else:
+                sub.A = self.A[np.ix_(rows, rows)]
+            sub.factorize(tol)
+            return rows, sub
+
+        with ThreadPoolExecutor(max_workers=self._pool_size(len(blocks))) as pool:
+            return list(pool.map(factorize_block, blocks))
+
+    def _pool_size(self, tasks: int) -> int:
+        return max(1, min(tasks, self.workers or os.cpu_count() or 1))
+
+    def _is_pseudo_inverse(self) -> bool:
+        """Indica si la factorización da A⁺ (A singular) en lugar de A⁻¹"""
+        kind, factors = self._factorization
+        if kind == "bloques":
+            return any(sub._is_pseudo_inverse() for _, sub in factors)
+        return kind == "laplaciano"
+
+    def _factorize_regular(self, A, tol: float) -> Tuple[str, tuple]:
+        """Cholesky, LU (o LU en precisión mixta) o LU disperso de una A no singular"""
+        if sparse.issparse(A):
+            return ("splu", sparse_lu(A, tol))
+        if self.precision == "mixed":
+            return ("mixta", MixedPrecisionLU(A, pivot_tol=tol))
+
+        if np.allclose(A, A.T):
+            sign = -1.0 if np.all(np.diag(A) < 0) else 1.0
+            try:
+                c, lower = linalg.cho_factor(sign * A, check_finite=False)
+                # Los pivotes de Cholesky son diag(c)²; una matriz semidefinida
+                # (un laplaciano) deja el último en el orden del redondeo
+                scale = max(float(np.max(np.abs(np.diag(A)))), 1.0)
+                if np.min(np.abs(np.diag(c))) ** 2 > tol * scale:
+                    return ("cholesky", (c, lower, sign))
+            except linalg.LinAlgError:
+                pass
+
+        with warnings.catch_warnings():
+            # La singularidad se reporta abajo con un error propio
+            warnings.simplefilter("ignore", linalg.LinAlgWarning)
+            lu, piv = linalg.lu_factor(A, check_finite=False)
+        if np.min(np.abs(np.diag(lu))) <= tol:
+            raise np.linalg.LinAlgError(
+                "La matriz A es singular: no se puede factorizar para resolver Ax = b")
+        return ("lu", (lu, piv))
+
+    def solve_batch(self, B: np.ndarray) -> np.ndarray:
+        """
+        Resuelve AX = B para varios vectores de demanda a la vez,
+        reutilizando la factorización guardada de A.
+
+        Si A cambió con actualizaciones de bajo rango desde la última
+        factorización, se corrige la solución con Sherman-Morrison-Woodbury.
+
+        Args:
+            B: Matriz (num_nodes, k) con un vector de demanda por columna,
+               o un solo vector de longitud num_nodes
+
+        Returns:
+            Matriz X con una solución por columna (o vector si B lo era)
+        """
+        X = self._solve_factored(np.asarray(B, dtype=float))
+        if self._low_rank is not None:
+            # A = A₀ + U C Vᵀ  ⇒  A⁻¹B = Y - Z S⁻¹ C Vᵀ Y,
+            # con Y = A₀⁻¹B, Z = A₀⁻¹U y S = I + C Vᵀ Z
+            U, C, V, Z, S = self._low_rank
+            correction = Z @ np.linalg.solve(S, C @ (V.T @ X))
+            X = X - (correction if X.ndim == 2 else correction.ravel())
+        return X
+
+    def _solve_factored(self, B: np.ndarray) -> np.ndarray:
+        """Resuelve con la factorización guardada de A₀ (sin correcciones)"""
+        kind, factors = self.factorize()
+        if kind == "cholesky":
+            c, lower, sign = factors
+            X = linalg.cho_solve((c, lower), sign * B, check_finite=False)
+        elif kind in ("splu", "mixta", "laplaciano"):
+            X = factors.solve(B)
+        elif kind == "bloques":
+            X = np.zeros(B.shape)
+            with ThreadPoolExecutor(max_workers=self._pool_size(len(factors))) as pool:
+                for rows, X_block in pool.map(lambda item: (item[0], item[1].solve_batch(B[item[0]])),
+                                              factors):
+                    X[rows] = X_block
+        else:
+            X = linalg.lu_solve(factors, B, check_finite=False)
+        return X
+
+    def solve(self, B: np.ndarray = None) -> np.ndarray:
+        """
+        Resuelve el sistema AX = B y guarda la demanda y la solución.
+
+        Args:
+            B: Vector (o matriz) de demanda. Si es None usa self.B
+
+        Returns:
+            Solución X
+        """
+        if B is not None:
+            self.B = np.asarray(B, dtype=float)
+        if self.B is None:
+            raise ValueError("No hay vector de demanda B para resolver")
+        self.X = self.solve_batch(self.B)
+        return self.X
+
+    def apply_low_rank_update(self, U: np.ndarray, C: np.ndarray, V: np.ndarray):
+        """
+        Aplica A ← A + U C Vᵀ y actualiza la solución en O(n²).
+
+        En lugar de volver a factorizar, acumula el cambio para corregir
+        las soluciones con la fórmula de Sherman-Morrison-Woodbury. A⁻¹ (si
+        estaba calculada) y X se actualizan en el momento. Se vuelve a
+        factorizar cuando se acumulan max_low_rank_updates columnas o
+        cuando el residuo de X supera drift_tol.
+
+        Args:
+            U: Matriz (n, k)
+            C: Matriz (k, k)
+            V: Matriz (n, k)
+
+        Raises:
+            np.linalg.LinAlgError: Si la matriz resultante es singular
+        """
+        U = np.asarray(U, dtype=float).reshape(self.A.shape[0], -1)
+        V = np.asarray(V, dtype=float).reshape(self.A.shape[0], -1)
+        C = np.atleast_2d(np.asarray(C, dtype=float))
+        if not np.any(C):
+            return
+
+        # U C Vᵀ solo es distinto de cero en las filas que toca U y las
+        # columnas que toca V (dos o tres nodos por enlace): se arma ese
+        # bloque y no una matriz de n × n
+        rows = np.flatnonzero(np.any(U, axis=1))
+        cols = np.flatnonzero(np.any(V, axis=1))
+        block = U[rows] @ C @ V[cols].T
+        if sparse.issparse(self._A):
+            delta = sparse.csr_matrix(
+                (block.ravel(), (np.repeat(rows, len(cols)), np.tile(cols, len(rows)))),
+                shape=self._A.shape)
+            self._A = (self._A + delta).tocsr()
+        else:
+            self._A[np.ix_(rows, cols)] += block
+
+        if self._factorization is None:
+            # No hay nada que actualizar: se factorizará cuando haga falta
+            self.A_inv = None
+            return
+
+        if self._is_pseudo_inverse():
+            # Woodbury no vale sobre la pseudo-inversa: se factoriza de nuevo
+            # (el sistema reducido es mucho más chico que una SVD)
+            self._refactorize()
+            return
+
+        if self.A_inv is not None:
+            # Woodbury sobre la inversa explícita: O(n² k)
+            AiU = self.A_inv @ U
+            S = np.eye(C.shape[0]) + C @ (V.T @ AiU)
+            self.A_inv = self.A_inv - AiU @ np.linalg.solve(S, C @ (V.T @ self.A_inv))
+
+        pending = 0 if self._low_rank is None else self._low_rank[0].shape[1]
+        if pending + U.shape[1] > self.max_low_rank_updates:
+            self._refactorize()
+            return
+
+        # Solo se resuelven las columnas nuevas: A₀⁻¹U de los cambios
+        # anteriores ya está en Z
+        Z = self._solve_factored(U)
+        if self._low_rank is None:
+            U_all, C_all, V_all = U, C, V
+        else:
+            U0, C0, V0, Z0, _ = self._low_rank
+            U_all = np.hstack([U0, U])
+            V_all = np.hstack([V0, V])
+            C_all = linalg.block_diag(C0, C)
+            Z = np.hstack([Z0, Z])
+
+        S = np.eye(C_all.shape[0]) + C_all @ (V_all.T @ Z)
+        if np.linalg.cond(S) > 1.0 / np.finfo(float).eps:
+            # El cambio deja a A (casi) singular: se intenta factorizar de cero
+            self._refactorize()
+            return
+        self._low_rank = (U_all, C_all, V_all, Z, S)
+
+        if self.B is not None and self.X is not None:
+            self.X = self.solve_batch(self.B)
+            residual = self.A @ self.X - self.B
+            if np.linalg.norm(residual) > self.drift_tol * max(np.linalg.norm(self.B), 1.0):
+                self._refactorize()
+
+    def _refactorize(self):
+        """Descarta las actualizaciones acumuladas y factoriza A de nuevo"""
+        had_inverse = self.A_inv is not None
+        self.invalidate_factorization()
+        self.factorize()
+        if self.B is not None and self.X is not None:
+            self.X = self.solve_batch(self.B)
+        if had_inverse:
+            self.compute_inverse()
+
+    def update_link(self, origen: int, destino: int, delta_flujo: float):
+        """
+        Cambia en delta_flujo el flujo del enlace bidireccional (origen, destino).
+
+        Es un cambio de rango 1: A ← A - delta_flujo · u uᵀ con u = e_o - e_d.
+        """
+        u = np.zeros(self.A.shape[0])
+        u[origen] += 1.0
+        u[destino] -= 1.0
+        self.apply_low_rank_update(u, [[-delta_flujo]], u)
+
+    def add_link(self, origen: int, destino: int, flujo: float):
+        """Agrega un enlace (o suma flujo a uno existente)"""
+        self.update_link(origen, destino, flujo)
+
+    def remove_link(self, origen: int, destino: int):
+        """Da de baja el enlace (origen, destino) con todo su flujo"""
+        self.update_link(origen, destino, -self.A[origen, destino])
+
+    def reweight_link(self, origen: int, destino: int, flujo: float):
+        """Fija el flujo del enlace (origen, destino) en un nuevo valor"""
+        self.update_link(origen, destino, flujo - self.A[origen, destino])
+
+    def adjust_capacity(self, nodo: int, delta: float):
+        """Suma delta a la capacidad (diagonal) del nodo: cambio de rango 1"""
+        e = np.zeros(self.A.shape[0])
+        e[nodo] = 1.0
+        self.apply_low_rank_update(e, [[delta]], e)
+
+    def compute_inverse(self) -> np.ndarray:
+        """
+        Calcula A⁻¹ a partir de la factorización guardada. Solo hace falta
+        para mostrarla; para resolver conviene usar solve o solve_batch.
+
+        Returns:
+            Matriz inversa de A (densa aunque A sea dispersa), o la
+            pseudo-inversa A⁺ si A es un laplaciano singular
+        """
+        if self.A_inv is None:
+            self.A_inv = self.solve_batch(np.eye(self.A.shape[0]))
+        return self.A_inv
+
+    def simulate_stream(self, demands, batch_size: int = 32, events=None,
+                        max_wait: Optional[float] = None, warm_start: bool = False):
+        """
+        Resuelve una serie de tiempo de demandas contra la red actual.
+
+        Args:
+            demands: Vectores de demanda de un generador o de
+                simulador.streaming.iter_demand_file
+            batch_size: Instantes que se resuelven juntos
+            events: Cambios de topología {instante: función(optimizer)}
+            max_wait: Espera (s) tras la cual un lote incompleto se
+                resuelve al llegar la demanda siguiente
+            warm_start: Resolver cada instante con un método iterativo
+                desde la solución anterior en lugar de factorizar A
+
+        Returns:
+            Tupla (lotes, stats): un generador de (primer instante, X) y
+            las estadísticas de latencia y rendimiento, que se completan a
+            medida que se consume el generador
+        """
+        from .streaming import DemandStream
+
+        stream = DemandStream(self, batch_size, max_wait, warm_start=warm_start)
+        return stream.run(demands, events), stream.stats
+
+    def plot(self, path: Optional[str] = None):
+        """
+        Grafica A y la última solución X. matplotlib (y seaborn, para
+        matrices chicas) se importan recién aquí, no al importar el módulo.
+
+        Args:
+            path: Archivo donde guardar la figura (opcional)
+
+        Returns:
+            La figura de matplotlib
+        """
+        from .plotting import plot_network
+
+        x = None
+        if self.X is not None:
+            x = self.X if self.X.ndim == 1 else self.X[:, 0]
+        return plot_network(self.A, x, path)
@@ -0,0 +1,243 @@
+import os
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from typing import List, Optional
+
+# matplotlib y seaborn tardan más en importarse que todo el cálculo de un
+# escenario chico: se cargan recién la primera vez que se pide un gráfico
+_modules = {}
+
+# Hasta este tamaño se usa el mapa de calor de seaborn (una celda por
+# elemento); más grande, una sola imagen con bloques agregados
+SEABORN_MAX_NODES = 50
+
+# Celdas por lado de la imagen de una matriz grande
+DEFAULT_MAX_CELLS = 600
+
+# Hasta este número de nodos los flujos se dibujan como barras
+BARS_MAX_NODES = 200
+
+
+def _headless() -> bool:
+    """True si no hay pantalla donde abrir ventanas (servidor, contenedor)"""
+    if os.environ.get("MPLBACKEND"):
+        return False
+    if sys.platform.startswith("linux"):
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+def _pyplot():
+    """Importa (una sola vez) matplotlib.pyplot, con Agg si no hay pantalla"""
+    if "plt" not in _modules:
+        import matplotlib
+        if _headless():
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        _modules["plt"] = plt
+    return _modules["plt"]
+
+
+def _seaborn():
+    if "sns" not in _modules:
+        import seaborn as sns
+        _modules["sns"] = sns
+    return _modules["sns"]
+
+
+def block_reduce(A, max_cells: int = DEFAULT_MAX_CELLS) -> np.ndarray:
+    """
+    Reduce A a una grilla de a lo sumo max_cells × max_cells bloques.
+
+    Cada bloque conserva su elemento de mayor valor absoluto (con su
+    signo), de modo que un enlace aislado sigue viéndose aunque el
+    bloque tenga cientos de ceros. A densa se recorre por franjas de
+    filas: la memoria extra es la de una franja, no la de otra copia de A.
+
+    Returns:
+        Matriz densa de ceil(n / k) × ceil(n / k), con k el lado del bloque
+    """
+    n_rows, n_cols = A.shape
+    k = max(1, -(-max(n_rows, n_cols) // max_cells))
+    shape = (-(-n_rows // k), -(-n_cols // k))
+    high = np.zeros(shape)
+    low = np.zeros(shape)
+
+    if sparse.issparse(A):
+        coo = A.tocoo()
+        cells = (coo.row // k, coo.col // k)
+        np.maximum.at(high, cells, coo.data)
+        np.minimum.at(low, cells, coo.data)
+    else:
+        pad = shape[1] * k - n_cols
+        for i, r0 in enumerate(range(0, n_rows, k)):
+            band = np.asarray(A[r0:r0 + k], dtype=float)
+            if pad:
+                band = np.pad(band, ((0, 0), (0, pad)))
+            band = band.reshape(band.shape[0], shape[1], k)
+            high[i] = np.maximum(band.max(axis=(0, 2)), 0.0)
+            low[i] = np.minimum(band.min(axis=(0, 2)), 0.0)
+    return np.where(high >= -low, high, low)
+
+
+def plot_connectivity(A, ax=None, title: str = "Matriz de conectividad A",
+                      max_cells: int = DEFAULT_MAX_CELLS):
+    """
+    Dibuja la matriz de conectividad como mapa de calor.
+
+    Las matrices chicas usan el mapa de calor de seaborn (con los valores
+    anotados si caben). Las grandes se reducen con block_reduce y se
+    dibujan como una sola imagen rasterizada: el costo ya no depende del
+    número de elementos de A.
+
+    Args:
+        A: Matriz densa o dispersa
+        ax: Ejes de matplotlib donde dibujar (por defecto, unos nuevos)
+        title: Título del gráfico
+        max_cells: Celdas por lado de la imagen de una matriz grande
+
+    Returns:
+        Los ejes usados
+    """
+    plt = _pyplot()
+    if ax is None:
+        _, ax = plt.subplots(figsize=(6, 5))
+    n = A.shape[0]
+
+    if n <= SEABORN_MAX_NODES:
+        data = A.toarray() if sparse.issparse(A) else np.asarray(A)
+        small = n <= 12
+        _seaborn().heatmap(data, ax=ax, cmap="coolwarm", center=0.0, annot=small, fmt=".1f")
+        ax.set_title(title)
+        return ax
+
+    data = block_reduce(A, max_cells)
+    limit = float(np.max(np.abs(data))) or 1.0
+    image = ax.imshow(data, cmap="coolwarm", vmin=-limit, vmax=limit,
+                      interpolation="nearest", aspect="auto",
+                      extent=(0.5, A.shape[1] + 0.5, n + 0.5, 0.5))
+    image.set_rasterized(True)
+    ax.figure.colorbar(image, ax=ax)
+    block = -(-max(A.shape) // max_cells)
+    if block > 1:
+        title = f"{title} (bloques de {block}×{block})"
+    ax.set_title(title)
+    return ax
+
+
+def plot_flows(x: np.ndarray, ax=None, title: str = "Flujo de datos por nodo"):
+    """
+    Dibuja el vector solución x (salida positiva, entrada negativa).
+
+    Con muchos nodos se usan dos áreas rellenas en lugar de una barra por
+    nodo: dos objetos de matplotlib en vez de miles.
+    """
+    plt = _pyplot()
+    if ax is None:
+        _, ax = plt.subplots(figsize=(6, 4))
+    x = np.asarray(x).ravel()
+    nodes = np.arange(1, len(x) + 1)
+    if len(x) <= BARS_MAX_NODES:
+        colors = np.where(x >= 0, "tab:green", "tab:orange")
+        ax.bar(nodes, x, color=colors)
+    else:
+        ax.fill_between(nodes, x, 0.0, where=x >= 0, color="tab:green",
+                        step="mid", linewidth=0, rasterized=True)
+        ax.fill_between(nodes, x, 0.0, where=x < 0, color="tab:orange",
+                        step="mid", linewidth=0, rasterized=True)
+    ax.axhline(0.0, color="black", linewidth=0.8)
+    ax.set_xlabel("Nodo")
+    ax.set_ylabel("Flujo")
+    ax.set_title(title)
+    return ax
+
+
+def plot_network(A, x: Optional[np.ndarray] = None, path: Optional[str] = None,
+                 title: Optional[str] = None):
+    """
+    Figura con la matriz A y, si se conoce, la solución x.
+
+    Args:
+        A: Matriz de conectividad
+        x: Solución del sistema (opcional)
+        path: Si se indica, guarda la figura en ese archivo y la cierra
+        title: Título general de la figura (opcional)
+
+    Returns:
+        La figura de matplotlib
+    """
+    plt = _pyplot()
+    columns = 1 if x is None else 2
+    fig, axes = plt.subplots(1, columns, figsize=(6 * columns, 5), squeeze=False)
+    plot_connectivity(A, axes[0, 0])
+    if x is not None:
+        plot_flows(x, axes[0, 1])
+    if title:
+        fig.suptitle(title)
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(path)
+        plt.close(fig)
+    return fig
+
+
+# Matriz y demanda base dentro de cada proceso de export_sweep
+_worker_arrays = {}
+
+
+def _init_export_worker(A_spec, b_spec):
+    # Los procesos del pool nunca abren ventanas
+    import matplotlib
+    matplotlib.use("Agg")
+    from Solver.sweep import _attach
+    _worker_arrays["A"] = _attach(*A_spec)
+    _worker_arrays["b"] = _attach(*b_spec)
+
+
+def _export_scenario(args):
+    from Solver.sweep import apply_scenario
+    index, scenario, x, path = args
+    A, _ = apply_scenario(_worker_arrays["A"][1], _worker_arrays["b"][1], scenario)
+    plot_network(A, x, path, title=f"Escenario {index}")
+    return path
+
+
+def export_sweep(A, b, grid: List[dict], X: np.ndarray, directory: str,
+                 fmt: str = "png", processes: Optional[int] = None) -> List[str]:
+    """
+    Guarda una figura por escenario de un barrido, en paralelo.
+
+    Cada proceso dibuja con el backend Agg y reconstruye la matriz de su
+    escenario a partir de A y b en memoria compartida (como en
+    Solver.sweep.run_sweep).
+
+    Args:
+        A: Matriz base del barrido
+        b: Demanda base del barrido
+        grid: Escenarios (Solver.sweep.build_grid)
+        X: Soluciones del barrido, una columna por escenario
+        directory: Carpeta donde guardar las figuras
+        fmt: Formato de imagen ("png", "pdf", "svg", ...)
+        processes: Número de procesos (por defecto, todos los núcleos)
+
+    Returns:
+        Rutas de las figuras, en el orden de grid
+    """
+    from Solver.sweep import SharedArray
+
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"escenario_{k:04d}.{fmt}") for k in range(len(grid))]
+    tasks = [(k, scenario, X[:, k], paths[k]) for k, scenario in enumerate(grid)]
+
+    shared_A = SharedArray(A)
+    shared_b = SharedArray(b)
+    try:
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1,
+                                 initializer=_init_export_worker,
+                                 initargs=(shared_A.spec(), shared_b.spec())) as pool:
+            return list(pool.map(_export_scenario, tasks))
+    finally:
+        shared_A.release()
+        shared_b.release()
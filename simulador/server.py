@@ -0,0 +1,396 @@
+"""Servidor residente del simulador sobre un socket Unix
+
+Mantiene en memoria las redes cargadas (un NetworkOptimizer por nombre,
+con su factorización) y la caché de resultados de Solver, de modo que
+cada pedido paga solo la resolución y no el arranque de Python, la
+importación de NumPy/SciPy ni la factorización:
+
+    python -m simulador.server --socket /tmp/simulador.sock --workers 4
+
+y desde otro proceso:
+
+    from simulador.server import SolverClient
+    with SolverClient("/tmp/simulador.sock") as client:
+        client.load("red", A)
+        x = client.solve("red", b)
+        client.update("red", links=[(0, 1, 0.5)])
+
+Formato de los mensajes (pedidos y respuestas):
+
+    u32 largo del encabezado | u32 largo de los datos
+    encabezado JSON (operación, parámetros, descripción de los arreglos)
+    datos: los bytes de cada arreglo, uno detrás del otro
+
+Los arreglos viajan en binario, sin pasar por texto ni pickle. Las
+operaciones son load, solve, update, analyze, drop, stats y shutdown.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from Solver.batch import WarmStarts, solve_system
+
+from .main import NetworkOptimizer
+
+DEFAULT_SOCKET = "/tmp/simulador.sock"
+
+_FRAME = struct.Struct("!II")
+
+# Límite del encabezado JSON: protege al servidor de un mensaje corrupto
+MAX_HEADER_BYTES = 1 << 20
+
+Arrays = Dict[str, np.ndarray]
+
+
+def encode_message(header: dict, arrays: Optional[Arrays] = None) -> bytes:
+    """
+    Arma un mensaje: encabezado JSON más los bytes de cada arreglo.
+
+    Args:
+        header: Diccionario serializable en JSON (operación, parámetros)
+        arrays: Arreglos a enviar, por nombre
+
+    Returns:
+        El mensaje completo listo para escribir en el socket
+    """
+    header = dict(header)
+    chunks, specs = [], []
+    for name, array in (arrays or {}).items():
+        array = np.ascontiguousarray(array)
+        specs.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape)})
+        chunks.append(array.tobytes())
+    header["arrays"] = specs
+    head = json.dumps(header).encode("utf-8")
+    payload = b"".join(chunks)
+    return _FRAME.pack(len(head), len(payload)) + head + payload
+
+
+def decode_message(head: bytes, payload: bytes) -> Tuple[dict, Arrays]:
+    """Separa un mensaje recibido en encabezado y arreglos (copias escribibles)"""
+    header = json.loads(head.decode("utf-8"))
+    arrays, offset = {}, 0
+    for spec in header.pop("arrays", []):
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        arrays[spec["name"]] = array.reshape(spec["shape"]).copy()
+        offset += count * dtype.itemsize
+    return header, arrays
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[dict, Arrays]:
+    head_len, payload_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    if head_len > MAX_HEADER_BYTES:
+        raise ValueError(f"Encabezado demasiado grande ({head_len} bytes)")
+    head = await reader.readexactly(head_len)
+    payload = await reader.readexactly(payload_len)
+    return decode_message(head, payload)
+
+
+def _matrix_from(header: dict, arrays: Arrays):
+    """A densa, o CSR si llegó como A_data, A_indices y A_indptr"""
+    if "A" in arrays:
+        return arrays["A"]
+    return sparse.csr_matrix((arrays["A_data"], arrays["A_indices"], arrays["A_indptr"]),
+                             shape=tuple(header["shape"]))
+
+
+def _matrix_arrays(A) -> Arrays:
+    if sparse.issparse(A):
+        A = sparse.csr_matrix(A, dtype=float)
+        return {"A_data": A.data, "A_indices": A.indices, "A_indptr": A.indptr}
+    return {"A": np.asarray(A, dtype=float)}
+
+
+def _for_mode(A, mode: str):
+    """Deja A dispersa salvo en modo "mixed", cuya LU en float32 es densa"""
+    if mode == "mixed" and sparse.issparse(A):
+        return A.toarray()
+    return A
+
+
+class _Network:
+    """
+    Una red residente: su optimizador, un candado para usarla de a uno y
+    el arranque en caliente de los análisis iterativos sobre ella.
+    """
+
+    def __init__(self, optimizer: NetworkOptimizer):
+        self.optimizer = optimizer
+        self.lock = asyncio.Lock()
+        self.warm = WarmStarts()
+
+
+class SolverServer:
+    """
+    Atiende pedidos de varios clientes a la vez con asyncio.
+
+    El trabajo pesado (factorizar, resolver, analizar) corre en un pool
+    de hilos: LAPACK libera el GIL, y las redes quedan en la memoria del
+    proceso sin copiarse. Los pedidos sobre una misma red se atienden de
+    a uno; los de redes distintas, en paralelo.
+
+    Args:
+        path: Ruta del socket Unix
+        workers: Hilos del pool (por defecto, todos los núcleos)
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET, workers: Optional[int] = None):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.networks: Dict[str, _Network] = {}
+        self.stats: Dict[str, dict] = {}
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._server = None
+        self._stopped = None
+
+    async def serve(self):
+        """Escucha en el socket hasta recibir shutdown"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        try:
+            async with self._server:
+                await self._stopped.wait()
+        finally:
+            self._pool.shutdown(wait=False)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header, arrays = await read_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                started = time.perf_counter()
+                op = header.get("op")
+                try:
+                    reply, out = await self._dispatch(op, header, arrays)
+                    reply["ok"] = True
+                except Exception as exc:
+                    reply, out = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}, {}
+                elapsed = time.perf_counter() - started
+                reply["elapsed_s"] = elapsed
+                self._record(op, elapsed)
+                writer.write(encode_message(reply, out))
+                await writer.drain()
+                if op == "shutdown":
+                    self._stopped.set()
+                    break
+        finally:
+            writer.close()
+
+    def _record(self, op, elapsed: float):
+        stats = self.stats.setdefault(str(op), {"count": 0, "total_s": 0.0, "max_s": 0.0})
+        stats["count"] += 1
+        stats["total_s"] += elapsed
+        stats["max_s"] = max(stats["max_s"], elapsed)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def _network(self, header: dict) -> _Network:
+        name = header.get("network")
+        if name not in self.networks:
+            raise KeyError(f"Red desconocida: {name!r}")
+        return self.networks[name]
+
+    async def _dispatch(self, op, header: dict, arrays: Arrays):
+        handler = getattr(self, f"_op_{op}", None)
+        if handler is None:
+            raise ValueError(f"Operación desconocida: {op!r}")
+        return await handler(header, arrays)
+
+    async def _op_load(self, header, arrays):
+        A = _matrix_from(header, arrays)
+        optimizer = NetworkOptimizer(A.shape[0], workers=header.get("workers"),
+                                     precision=header.get("precision", "double"))
+        optimizer.A = A
+        kind, _ = await self._run(optimizer.factorize)
+        self.networks[header["network"]] = _Network(optimizer)
+        return {"n": int(A.shape[0]), "factorization": kind}, {}
+
+    async def _op_solve(self, header, arrays):
+        network = self._network(header)
+        async with network.lock:
+            X = await self._run(network.optimizer.solve_batch, arrays["B"])
+        return {}, {"X": X}
+
+    async def _op_update(self, header, arrays):
+        network = self._network(header)
+
+        def apply():
+            optimizer = network.optimizer
+            for origen, destino, delta in header.get("links", []):
+                optimizer.update_link(int(origen), int(destino), float(delta))
+            for nodo, delta in header.get("capacity", []):
+                optimizer.adjust_capacity(int(nodo), float(delta))
+            return optimizer.factorize()[0]
+
+        async with network.lock:
+            kind = await self._run(apply)
+        return {"factorization": kind}, {}
+
+    async def _op_analyze(self, header, arrays):
+        mode = header.get("mode", "direct")
+        if "network" in header:
+            network = self._network(header)
+            async with network.lock:
+                A = _for_mode(network.optimizer.A.copy(), mode)
+                if mode == "iterative":
+                    # Pedidos seguidos sobre la misma red arrancan desde la
+                    # solución anterior; el candado protege al solucionador
+                    solver = network.warm.solver_for(A)
+                    result = await self._run(solve_system, A, arrays["b"], mode, solver)
+            if mode != "iterative":
+                result = await self._run(solve_system, A, arrays["b"], mode)
+        else:
+            A = _for_mode(_matrix_from(header, arrays), mode)
+            result = await self._run(solve_system, A, arrays["b"], mode)
+        x = result.pop("x")
+        return {"result": json.loads(json.dumps(result, default=_json_default))}, {"x": x}
+
+    async def _op_drop(self, header, arrays):
+        self.networks.pop(header.get("network"), None)
+        return {}, {}
+
+    async def _op_stats(self, header, arrays):
+        networks = {name: {"n": int(net.optimizer.A.shape[0]),
+                           "factorization": (net.optimizer._factorization or ("ninguna",))[0]}
+                    for name, net in self.networks.items()}
+        return {"networks": networks, "requests": self.stats, "workers": self.workers}, {}
+
+    async def _op_shutdown(self, header, arrays):
+        return {}, {}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class SolverClient:
+    """
+    Cliente sincrónico del servidor (solo necesita NumPy y un socket).
+
+    Cada método envía un pedido y espera la respuesta.
+
+    Raises:
+        RuntimeError: Si el servidor responde con un error
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._sock.close()
+
+    def _recv_exactly(self, size: int) -> bytes:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            chunk = self._sock.recv_into(view[received:], size - received)
+            if not chunk:
+                raise ConnectionError("El servidor cerró la conexión")
+            received += chunk
+        return bytes(buffer)
+
+    def request(self, op: str, arrays: Optional[Arrays] = None, **params) -> Tuple[dict, Arrays]:
+        """Envía un pedido cualquiera y devuelve (encabezado, arreglos) de la respuesta"""
+        self._sock.sendall(encode_message(dict(params, op=op), arrays))
+        head_len, payload_len = _FRAME.unpack(self._recv_exactly(_FRAME.size))
+        header, arrays = decode_message(self._recv_exactly(head_len),
+                                        self._recv_exactly(payload_len))
+        if not header.get("ok"):
+            raise RuntimeError(header.get("error", "Error desconocido en el servidor"))
+        return header, arrays
+
+    def load(self, network: str, A, precision: str = "double") -> dict:
+        """Carga (o reemplaza) una red y la deja factorizada en el servidor"""
+        shape = list(A.shape)
+        header, _ = self.request("load", _matrix_arrays(A), network=network,
+                                 shape=shape, precision=precision)
+        return header
+
+    def solve(self, network: str, B) -> np.ndarray:
+        """Resuelve AX = B con la factorización residente de la red"""
+        _, arrays = self.request("solve", {"B": np.asarray(B, dtype=float)}, network=network)
+        return arrays["X"]
+
+    def update(self, network: str, links=(), capacity=()) -> dict:
+        """Cambia enlaces [(origen, destino, delta)] y capacidades [(nodo, delta)]"""
+        header, _ = self.request("update", network=network,
+                                 links=[list(link) for link in links],
+                                 capacity=[list(c) for c in capacity])
+        return header
+
+    def analyze(self, b, network: Optional[str] = None, A=None, mode: str = "direct"):
+        """
+        Análisis completo (Solver.batch.solve_system) de una red residente o de A.
+
+        Returns:
+            Tupla (resultado, x)
+        """
+        arrays = {"b": np.asarray(b, dtype=float)}
+        params = {"mode": mode}
+        if network is not None:
+            params["network"] = network
+        else:
+            arrays.update(_matrix_arrays(A))
+            params["shape"] = list(A.shape)
+        header, out = self.request("analyze", arrays, **params)
+        return header["result"], out["x"]
+
+    def drop(self, network: str):
+        self.request("drop", network=network)
+
+    def stats(self) -> dict:
+        """Redes residentes y latencia acumulada por operación"""
+        return self.request("stats")[0]
+
+    def shutdown(self):
+        self.request("shutdown")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor residente del simulador de redes")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Ruta del socket Unix")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Hilos para resolver (por defecto, todos los núcleos)")
+    args = parser.parse_args(argv)
+
+    server = SolverServer(args.socket, args.workers)
+    print(f"Escuchando en {args.socket}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
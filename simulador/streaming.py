@@ -0,0 +1,252 @@
+import itertools
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 32
+
+# Latencias guardadas para los percentiles: la memoria no crece con el flujo
+DEFAULT_STATS_WINDOW = 10_000
+
+# Resultado de un micro-lote: (primer instante, soluciones de k × n)
+Trajectory = Tuple[int, np.ndarray]
+
+
+def iter_demand_file(path: str, chunk_size: int = DEFAULT_BATCH_SIZE) -> Iterator[np.ndarray]:
+    """
+    Lee una serie de tiempo de demandas, una fila por instante.
+
+    Formatos:
+        .npy        matriz (instantes, nodos); se lee con mmap
+        otro        CSV con una demanda por fila; se ignoran los
+                    comentarios (#) y una fila de encabezado no numérica
+
+    Yields:
+        Bloques (k, nodos) de a lo sumo chunk_size instantes
+    """
+    if path.endswith(".npy"):
+        demands = np.load(path, mmap_mode="r")
+        for start in range(0, len(demands), chunk_size):
+            yield np.array(demands[start:start + chunk_size], dtype=float, ndmin=2)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line for line in f if line.strip() and not line.lstrip().startswith("#"))
+        first = next(lines, None)
+        if first is None:
+            return
+        try:
+            float(first.split(",")[0])
+            lines = itertools.chain([first], lines)
+        except ValueError:
+            pass  # Encabezado
+
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                break
+            yield np.loadtxt(block, delimiter=",", ndmin=2)
+
+
+def _snapshots(demands: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """Separa en instantes una fuente que entrega vectores o bloques (k, n)"""
+    for item in demands:
+        item = np.asarray(item, dtype=float)
+        if item.ndim == 1:
+            yield item
+        else:
+            yield from item
+
+
+class StreamStats:
+    """
+    Latencia por instante y rendimiento de una simulación en flujo.
+
+    La latencia de un instante va desde que se lee su demanda hasta que
+    su solución está lista (incluye la espera a completar el micro-lote).
+    Solo se guardan las últimas `window` latencias.
+    """
+
+    def __init__(self, window: int = DEFAULT_STATS_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.ticks = 0
+        self.batches = 0
+        self.solve_s = 0.0
+        self.max_latency = 0.0
+        self._first = None
+        self._last = None
+
+    def record_batch(self, arrivals: np.ndarray, started: float, done: float):
+        """Registra un micro-lote resuelto entre started y done"""
+        latencies = done - arrivals
+        self.latencies.extend(latencies.tolist())
+        self.max_latency = max(self.max_latency, float(latencies.max()))
+        self.ticks += len(arrivals)
+        self.batches += 1
+        self.solve_s += done - started
+        if self._first is None:
+            self._first = float(arrivals[0])
+        self._last = done
+
+    @property
+    def throughput(self) -> float:
+        """Instantes resueltos por segundo desde la primera demanda"""
+        if self._first is None or self._last <= self._first:
+            return 0.0
+        return self.ticks / (self._last - self._first)
+
+    def summary(self) -> Dict[str, float]:
+        """Percentiles de latencia (en ms), rendimiento y tiempo de resolución"""
+        result = {"ticks": self.ticks, "batches": self.batches,
+                  "throughput_ticks_s": self.throughput,
+                  "solve_s": self.solve_s, "max_latency_ms": 1e3 * self.max_latency}
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.fromiter(self.latencies, float), [50, 95, 99])
+            result.update({"p50_latency_ms": 1e3 * float(p50), "p95_latency_ms": 1e3 * float(p95),
+                           "p99_latency_ms": 1e3 * float(p99)})
+        return result
+
+
+class DemandStream:
+    """
+    Simulación en flujo: resuelve una serie de demandas contra la red.
+
+    Los instantes se agrupan en micro-lotes que se resuelven juntos con
+    NetworkOptimizer.solve_batch, reutilizando la factorización de A (y
+    sus actualizaciones de bajo rango) entre lotes. Las soluciones se
+    entregan a medida que salen, sin guardar la trayectoria completa.
+
+    Args:
+        optimizer: Optimizador con la matriz A de la red
+        batch_size: Instantes por micro-lote
+        max_wait: Si se indica (en segundos), un lote se resuelve aunque
+            no esté completo cuando llega una demanda y la más vieja del
+            lote lleva esperando al menos ese tiempo. El plazo se revisa
+            solo al llegar cada demanda: con una fuente lenta, el lote
+            parcial espera hasta la demanda siguiente (que entra en ese
+            mismo lote) o hasta que se agote la fuente
+        window: Latencias guardadas para los percentiles
+        warm_start: Resolver cada instante con un método iterativo que
+            arranca desde la solución del instante anterior (ver
+            Solver.iterative.WarmStartSolver) en lugar de factorizar A;
+            conviene para redes grandes con demandas que cambian poco.
+            Un instante que no converge se resuelve con la factorización.
+    """
+
+    def __init__(self, optimizer, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_wait: Optional[float] = None, window: int = DEFAULT_STATS_WINDOW,
+                 warm_start: bool = False):
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser al menos 1")
+        self.optimizer = optimizer
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.warm_start = warm_start
+        self.stats = StreamStats(window)
+        self._warm = None
+        self._components = None
+
+    def run(self, demands: Iterable[np.ndarray],
+            events: Optional[Dict[int, Callable]] = None) -> Iterator[Trajectory]:
+        """
+        Resuelve la serie de demandas y entrega las soluciones por lotes.
+
+        Args:
+            demands: Vectores de demanda (o bloques de k × n, uno por fila),
+                por ejemplo de un generador o de iter_demand_file
+            events: Cambios de topología: {instante: función(optimizer)}
+                que se aplica antes de resolver ese instante (por ejemplo
+                lambda opt: opt.update_link(0, 1, 0.5))
+
+        Yields:
+            Tuplas (primer instante, X) con X de (k, n): la solución de
+            cada instante del lote, una por fila
+        """
+        events = dict(events or {})
+        if not self.warm_start:
+            self.optimizer.factorize()
+        self._warm = None
+        pending, arrivals = [], []
+        first_tick = 0
+
+        for tick, demand in enumerate(_snapshots(demands)):
+            if tick in events and pending:
+                # Los instantes anteriores se resuelven con la red anterior
+                yield self._flush(first_tick, pending, arrivals)
+                pending, arrivals = [], []
+            if tick in events:
+                events[tick](self.optimizer)
+                self._warm = None  # La A anterior ya no sirve de punto de partida
+            if not pending:
+                first_tick = tick
+            pending.append(demand)
+            arrivals.append(time.perf_counter())
+
+            waited = arrivals[-1] - arrivals[0]
+            if len(pending) >= self.batch_size or (
+                    self.max_wait is not None and waited >= self.max_wait):
+                yield self._flush(first_tick, pending, arrivals)
+                pending, arrivals = [], []
+
+        if pending:
+            yield self._flush(first_tick, pending, arrivals)
+
+    def _flush(self, first_tick: int, pending: list, arrivals: list) -> Trajectory:
+        started = time.perf_counter()
+        if self.warm_start:
+            X = np.array([self._solve_warm(demand) for demand in pending])
+        else:
+            X = self.optimizer.solve_batch(np.column_stack(pending)).T
+        self.stats.record_batch(np.asarray(arrivals), started, time.perf_counter())
+        return first_tick, X
+
+    def _solve_warm(self, demand: np.ndarray) -> np.ndarray:
+        from Solver.iterative import WarmStartSolver
+        from Solver.laplacian import is_laplacian
+        from Solver.partition import find_components
+
+        if self._warm is None:
+            A = self.optimizer.A
+            self._warm = WarmStartSolver(A)
+            # En un laplaciano el iterativo converge a una solución cualquiera;
+            # la factorización entrega la de norma mínima (media cero por región)
+            self._components = find_components(A) if is_laplacian(A) else None
+        x, info = self._warm.solve(demand)
+        if not info["converged"]:
+            return self.optimizer.solve_batch(demand)
+        if self._components is not None:
+            x = x.copy()
+            for rows in self._components:
+                x[rows] -= x[rows].mean()
+        return x
+
+
+def write_trajectory(path: str, batches: Iterable[Trajectory]) -> int:
+    """
+    Guarda las soluciones a medida que llegan, sin juntarlas en memoria.
+
+    Cada lote se agrega al archivo como un arreglo .npy más (se leen con
+    iter_trajectory).
+
+    Returns:
+        Número de instantes escritos
+    """
+    ticks = 0
+    with open(path, "wb") as f:
+        for _, X in batches:
+            np.save(f, X)
+            ticks += len(X)
+    return ticks
+
+
+def iter_trajectory(path: str) -> Iterator[np.ndarray]:
+    """Lee por lotes (k, n) una trayectoria escrita con write_trajectory"""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                X = np.load(f)
+            except EOFError:
+                return
+            yield X
@@ -0,0 +1,12 @@
+"""Configuración común de las pruebas (los sistemas de prueba están en helpers)"""
+import pytest
+
+from Solver.cache import set_cache
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    """Sin caché de resultados: cada prueba factoriza de verdad"""
+    previous = set_cache(None)
+    yield
+    set_cache(previous)
@@ -0,0 +1,56 @@
+"""Sistemas de prueba comunes: aleatorio, singular y laplaciano
+
+Cada prueba compara con np.linalg.solve (A invertible) o con
+np.linalg.lstsq (A singular: solución de mínimos cuadrados de norma mínima).
+"""
+import numpy as np
+
+N = 40
+
+
+def random_system(n=N, seed=0):
+    """A aleatoria (invertible con probabilidad 1) y b aleatorio"""
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, n)), rng.standard_normal(n)
+
+
+def singular_system(n=N, seed=0, rank=None, consistent=True):
+    """A de rango n - 2 y b en su imagen (o fuera de ella)"""
+    rng = np.random.default_rng(seed)
+    rank = n - 2 if rank is None else rank
+    A = rng.standard_normal((n, rank)) @ rng.standard_normal((rank, n))
+    b = A @ rng.standard_normal(n) if consistent else rng.standard_normal(n)
+    return A, b
+
+
+def laplacian_system(n=N, seed=0):
+    """A = -L de una red conexa con pesos positivos (como A_original) y
+    una demanda que suma cero"""
+    rng = np.random.default_rng(seed)
+    W = np.zeros((n, n))
+    ring = np.arange(n)
+    W[ring, (ring + 1) % n] = rng.uniform(0.5, 2.0, n)
+    extra = rng.integers(0, n, (2, n))
+    W[extra[0], extra[1]] += rng.uniform(0.5, 2.0, n)
+    W = W + W.T
+    np.fill_diagonal(W, 0.0)
+    A = W - np.diag(W.sum(axis=1))
+    b = rng.standard_normal(n)
+    return A, b - b.mean()
+
+
+def reference(A, b):
+    """Solución de referencia de NumPy"""
+    A = A.toarray() if hasattr(A, "toarray") else A
+    if np.linalg.matrix_rank(A) == A.shape[0]:
+        return np.linalg.solve(A, b)
+    return np.linalg.lstsq(A, b, rcond=None)[0]
+
+
+def assert_solution(A, b, x, rtol=1e-8):
+    """x resuelve Ax = b (o el mismo problema de mínimos cuadrados) como NumPy"""
+    A_dense = A.toarray() if hasattr(A, "toarray") else A
+    x_ref = reference(A_dense, b)
+    scale = max(np.linalg.norm(b), 1.0)
+    assert np.linalg.norm(A_dense @ x - b) <= np.linalg.norm(A_dense @ x_ref - b) + rtol * scale
+    np.testing.assert_allclose(x, x_ref, rtol=rtol * 1e2, atol=rtol * scale)
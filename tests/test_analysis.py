@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from Solver.analysis import MatrixAnalysis, analyze_system
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+
+@pytest.mark.parametrize("analyze", [MatrixAnalysis, analyze_system])
+def test_random_system(analyze):
+    A, b = random_system()
+    analisis = analyze(A, b)
+    assert analisis.invertible and analisis.rank == len(A)
+    sign, logabsdet = np.linalg.slogdet(A)
+    assert analisis.det_sign == sign
+    assert analisis.logabsdet == pytest.approx(logabsdet)
+    assert analisis.condition == pytest.approx(np.linalg.cond(A, 1), rel=0.9)
+    assert_solution(A, b, analisis.x)
+    np.testing.assert_allclose(analisis.inverse(), np.linalg.inv(A), rtol=1e-7, atol=1e-9)
+
+
+@pytest.mark.parametrize("consistent", [True, False])
+def test_singular_system(consistent):
+    A, b = singular_system(consistent=consistent)
+    analisis = analyze_system(A, b)
+    assert analisis.path == "qr"
+    assert not analisis.invertible and analisis.det == 0.0
+    assert analisis.rank == np.linalg.matrix_rank(A)
+    assert analisis.rank_augmented == np.linalg.matrix_rank(np.column_stack((A, b)))
+    assert analisis.consistent == consistent
+    assert_solution(A, b, analisis.x)
+    np.testing.assert_allclose(analisis.pseudo_inverse(), np.linalg.pinv(A), atol=1e-8)
+    with pytest.raises(np.linalg.LinAlgError):
+        analisis.inverse()
+
+
+def test_laplacian_system():
+    A, b = laplacian_system()
+    analisis = analyze_system(A, b)
+    assert analisis.path == "laplaciano"
+    assert analisis.rank == len(A) - 1 and analisis.consistent
+    assert_solution(A, b, analisis.x)
+    np.testing.assert_allclose(analisis.pseudo_inverse(), np.linalg.pinv(A), atol=1e-8)
+
+
+def test_laplacian_inconsistent_demand():
+    A, b = laplacian_system()
+    b = b + 1.0
+    analisis = analyze_system(A, b)
+    assert not analisis.consistent
+    assert analisis.rank_augmented == analisis.rank + 1
+    assert_solution(A, b, analisis.x)
+
+
+def test_determinant_does_not_overflow():
+    n = 400
+    A = 10.0 * np.eye(n)
+    analisis = analyze_system(A, np.ones(n))
+    assert analisis.invertible
+    assert analisis.logabsdet == pytest.approx(n * np.log(10.0))
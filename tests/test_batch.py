@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from Solver.batch import MODES, load_system, main, solve_system
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_random_system_every_mode(mode):
+    A, b = random_system()
+    if mode == "iterative":
+        A = A + 2 * np.sqrt(len(A)) * np.eye(len(A))
+    result = solve_system(A, b, mode)
+    assert result["estado"] == "unica"
+    assert_solution(A, b, result["x"], rtol=1e-6)
+
+
+@pytest.mark.parametrize("mode", ["sparse", "mixed"])
+def test_singular_scenario_is_an_error(mode):
+    A, b = singular_system()
+    result = solve_system(A, b, mode)
+    assert result["estado"] == "error" and result["error"]
+    assert np.all(np.isnan(result["x"]))
+
+
+def test_singular_scenario_iterative_is_reported_cleanly():
+    A = np.ones((3, 3))
+    b = np.array([1.0, 2.0, 3.0])
+    with np.errstate(all="raise"):
+        result = solve_system(A, b, "iterative")
+    assert result["estado"] in ("error", "no_convergio")
+
+
+@pytest.mark.parametrize("consistent", [True, False])
+def test_singular_direct_gives_least_squares(consistent):
+    A, b = singular_system(consistent=consistent)
+    result = solve_system(A, b, "direct")
+    assert result["estado"] == ("consistente" if consistent else "inconsistente")
+    assert_solution(A, b, result["x"])
+
+
+def test_laplacian_direct():
+    A, b = laplacian_system()
+    result = solve_system(A, b, "direct")
+    assert result["path"] == "laplaciano" and result["laplacian"]["components"] == 1
+    assert_solution(A, b, result["x"])
+
+
+def test_load_augmented_csv(tmp_path):
+    A, b = random_system(n=5)
+    path = tmp_path / "sistema.csv"
+    np.savetxt(path, np.column_stack((A, b)), delimiter=",")
+    A_loaded, b_loaded = load_system(str(path))
+    np.testing.assert_allclose(A_loaded, A)
+    np.testing.assert_allclose(b_loaded, b)
+
+
+def test_main_keeps_going_after_a_singular_scenario(tmp_path, capsys):
+    good = tmp_path / "bueno.npz"
+    bad = tmp_path / "singular.npz"
+    A, b = random_system(n=6)
+    np.savez(good, A=A, b=b)
+    A_s, b_s = singular_system(n=6)
+    np.savez(bad, A=A_s, b=b_s)
+    output = tmp_path / "resultados.json"
+
+    code = main([str(bad), str(good), str(tmp_path / "falta.npz"),
+                 "--mode", "sparse", "-o", str(output)])
+
+    assert code == 1
+    results = json.loads(output.read_text(encoding="utf-8"))
+    assert [r["estado"] for r in results] == ["error", "unica", "error"]
+    assert_solution(A, b, np.array(results[1]["x"]))
+    assert "singular.npz" in capsys.readouterr().err
@@ -0,0 +1,81 @@
+import copy
+import json
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from Solver import benchmark
+from Solver.benchmark import NOISE_FLOOR, STRUCTURES, compare, main, make_system, run_benchmarks
+from Solver.sparse_path import solve_sparse
+
+
+def report(*rows):
+    return {"meta": {}, "results": [dict(zip(("structure", "n", "solver", "time_s",
+                                              "residual", "error"), row)) for row in rows]}
+
+
+@pytest.mark.parametrize("structure", STRUCTURES)
+def test_systems_are_reproducible_and_consistent(structure):
+    A, b = make_system(structure, 30)
+    A_again, b_again = make_system(structure, 30)
+    assert sparse.issparse(A) == (structure == "sparse")
+    dense = A.toarray() if sparse.issparse(A) else A
+    np.testing.assert_array_equal(dense, A_again.toarray() if sparse.issparse(A) else A_again)
+    np.testing.assert_array_equal(b, b_again)
+    x = np.linalg.lstsq(dense, b, rcond=None)[0]
+    assert np.linalg.norm(dense @ x - b) <= 1e-6 * np.linalg.norm(b)
+
+
+def test_sparse_case_is_not_densified_for_sparse_solvers(monkeypatch):
+    received = {}
+
+    def spy(name, solve):
+        def run(A, b):
+            received[name] = sparse.issparse(A)
+            return solve(A, b)
+        return run
+
+    monkeypatch.setitem(benchmark.SOLVERS, "spy_sparse", (spy("sparse", solve_sparse), 100, True))
+    monkeypatch.setitem(benchmark.SOLVERS, "spy_dense", (spy("dense", np.linalg.solve), 100, False))
+    result = run_benchmarks([40], ["sparse"], ["spy_sparse", "spy_dense", "structured"],
+                            repeat=1, log=None)
+    assert received == {"sparse": True, "dense": False}
+    assert all(row["error"] is None and row["residual"] < 1e-8 for row in result["results"])
+
+
+def test_compare_flags_a_synthetic_regression():
+    before = report(("dense", 100, "lu", 0.010, 1e-12, None),
+                    ("dense", 100, "qr", 0.010, 1e-12, None),
+                    ("dense", 100, "svd", 0.010, 1e-12, None),
+                    ("dense", 100, "cg", 0.010, 1e-12, None),
+                    ("dense", 3, "lu", NOISE_FLOOR / 10, 1e-12, None))
+    after = report(("dense", 100, "lu", 0.020, 1e-12, None),          # Tiempo ×2
+                   ("dense", 100, "qr", 0.011, 1e-12, None),          # Dentro del umbral
+                   ("dense", 100, "svd", 0.010, 1e-6, None),          # Residuo
+                   ("dense", 100, "cg", None, None, "LinAlgError"),   # Ahora falla
+                   ("dense", 3, "lu", NOISE_FLOOR / 2, 1e-12, None))  # Ruido
+    regressions = compare(before, after, threshold=0.25)
+    assert len(regressions) == 3
+    assert "lu" in regressions[0] and "tiempo" in regressions[0]
+    assert "svd" in regressions[1] and "residuo" in regressions[1]
+    assert "cg" in regressions[2] and "falla" in regressions[2]
+    assert compare(before, copy.deepcopy(before)) == []
+    assert compare(before, after, threshold=1.5)[0].startswith("dense n=100 svd")
+
+
+def test_main_exit_code_on_regression(tmp_path, capsys):
+    # GMRES con 100 iteraciones deja residuo en el caso mal condicionado
+    args = ["--sizes", "100", "--structures", "ill_conditioned", "--solvers", "iterative",
+            "--repeat", "1", "-o", str(tmp_path / "nuevo.json")]
+    assert main(args) == 0
+    previous = json.loads((tmp_path / "nuevo.json").read_text(encoding="utf-8"))
+    previous["results"][0]["time_s"] = 10.0
+    (tmp_path / "lento.json").write_text(json.dumps(previous), encoding="utf-8")
+    assert main(args + ["--compare", str(tmp_path / "lento.json")]) == 0
+    assert "Sin regresiones" in capsys.readouterr().out
+
+    previous["results"][0]["residual"] = 1e-12
+    (tmp_path / "exacto.json").write_text(json.dumps(previous), encoding="utf-8")
+    assert main(args + ["--compare", str(tmp_path / "exacto.json")]) == 1
+    assert "REGRESIÓN ill_conditioned n=100 iterative: residuo" in capsys.readouterr().out
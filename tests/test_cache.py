@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from Solver.analysis import analyze_system
+from Solver.batch import solve_system
+from Solver.cache import ResultCache, content_key, nbytes, set_cache
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+
+@pytest.fixture
+def cache():
+    """Caché real en memoria (la de conftest está desactivada)"""
+    active = ResultCache()
+    previous = set_cache(active)
+    yield active
+    set_cache(previous)
+
+
+def test_content_key_depends_only_on_the_values():
+    A, b = random_system()
+    assert content_key(A, b, "direct") == content_key(A.copy(), b.copy(), "direct")
+    assert content_key(A, b, "direct") != content_key(A, b, "sparse")
+    assert content_key(np.eye(3, dtype=int)) == content_key(np.eye(3))
+    assert content_key(np.eye(3)) != content_key(np.eye(3).ravel())
+
+    S = sparse.coo_matrix(([1.0, 1.0, 2.0], ([0, 0, 1], [1, 1, 0])), shape=(2, 2))
+    assert content_key(S) == content_key(sparse.csr_matrix([[0.0, 2.0], [2.0, 0.0]]))
+
+
+def test_memory_limit_evicts_the_least_recently_used():
+    cache = ResultCache(memory_bytes=3 * 8 * 10)
+    for key in "abc":
+        cache.put(key, np.zeros(10))
+    cache.get("a")
+    cache.put("d", np.zeros(10))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    cache.put("grande", np.zeros(100))
+    assert cache.get("grande") is None
+
+
+@pytest.mark.parametrize("system", [random_system, singular_system, laplacian_system])
+def test_cached_analysis_matches_numpy(cache, system):
+    A, b = system()
+    first = analyze_system(A, b)
+    assert analyze_system(A.copy(), b.copy()) is first and cache.hits == 1
+    assert_solution(A, b, first.x)
+
+
+def test_cached_analysis_ignores_later_changes_to_the_arrays(cache):
+    A, b = random_system(seed=1)
+    A_ref, b_ref = A.copy(), b.copy()
+    analysis = analyze_system(A, b)
+    A[:] = 0.0
+    b[:] = 0.0
+    assert_solution(A_ref, b_ref, analysis.x)
+    assert_solution(A_ref, b_ref, analyze_system(A_ref, b_ref).x)
+
+
+def test_cached_factorization_is_shared_by_equal_networks(cache):
+    A, b = laplacian_system(seed=2)
+    first, second = NetworkOptimizer(len(A)), NetworkOptimizer(len(A))
+    first.A, second.A = A, A.copy()
+    assert first.factorize() is second.factorize()
+    assert_solution(A, b, second.solve_batch(b))
+
+
+def test_solve_results_persist_on_disk(tmp_path):
+    A, b = random_system(seed=3)
+    previous = set_cache(ResultCache(directory=str(tmp_path)))
+    try:
+        first = solve_system(A, b, "direct")
+        first["x"][:] = 0.0  # Quien llama puede modificar su copia
+        set_cache(ResultCache(directory=str(tmp_path)))  # Otro proceso, caché en RAM vacía
+        again = solve_system(A, b, "direct")
+    finally:
+        set_cache(previous)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    assert again["estado"] == "unica"
+    assert_solution(A, b, again["x"])
+
+
+def test_errors_are_not_cached(cache):
+    A, b = singular_system(seed=4)
+    assert solve_system(A, b, "sparse")["estado"] == "error"
+    assert solve_system(A, b, "sparse")["estado"] == "error"
+    assert cache.hits == 0 and cache.misses == 2
+
+
+def test_sparse_lu_factors_count_against_the_memory_limit():
+    A = sparse.random(300, 300, density=0.02, random_state=0, format="csc")
+    lu = splu((A + 4 * sparse.eye(300)).tocsc())
+    size = nbytes(("splu", lu))
+    assert size >= (lu.L.nnz + lu.U.nnz) * 8
+
+    cache = ResultCache(memory_bytes=int(2.5 * size))
+    for key in "abc":
+        cache.put(key, ("splu", lu))
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from simulador import NetworkOptimizer, edge_list
+from simulador.edge_list import links_to_csr, load_edge_list, scatter_links, write_edge_file
+
+
+def random_links(n=50, m=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n, m), rng.integers(0, n, m), rng.uniform(0.5, 2.0, m)
+
+
+def reference_matrix(n, origen, destino, flujo):
+    A = np.zeros((n, n))
+    for o, d, f in zip(origen, destino, flujo):
+        A[o, d] += f
+        A[d, o] += f
+        A[o, o] -= f
+        A[d, d] -= f
+    return A
+
+
+@pytest.mark.parametrize("use_sparse", [False, True])
+@pytest.mark.parametrize("suffix", [".npy", ".csv"])
+def test_load_edge_list_in_chunks(tmp_path, use_sparse, suffix):
+    n = 50
+    origen, destino, flujo = random_links(n)
+    path = tmp_path / f"enlaces{suffix}"
+    if suffix == ".npy":
+        write_edge_file(str(path), origen, destino, flujo)
+    else:
+        rows = ["origen,destino,flujo"] + [f"{o},{d},{float(f)!r}" for o, d, f in zip(origen, destino, flujo)]
+        path.write_text("\n".join(rows), encoding="utf-8")
+
+    A = load_edge_list(str(path), n, use_sparse, chunk_size=37)
+    A = A.toarray() if use_sparse else A
+    np.testing.assert_allclose(A, reference_matrix(n, origen, destino, flujo), atol=1e-12)
+
+
+def test_links_to_csr_matches_scatter():
+    n = 50
+    links = random_links(n, seed=1)
+    A = np.zeros((n, n))
+    scatter_links(A, *links)
+    np.testing.assert_allclose(links_to_csr(n, *links).toarray(), A, atol=1e-12)
+
+
+@pytest.mark.parametrize("bad", [(0, -1, 1.0), (0, 3, 1.0)])
+@pytest.mark.parametrize("use_sparse", [False, True])
+def test_out_of_range_links_are_rejected(bad, use_sparse):
+    with pytest.raises(ValueError):
+        NetworkOptimizer(3).create_connectivity_matrix([(0, 1, 1.0), bad], use_sparse=use_sparse)
+
+
+@pytest.mark.parametrize("use_sparse", [False, True])
+def test_out_of_range_in_file(tmp_path, monkeypatch, use_sparse):
+    path = tmp_path / "enlaces.npy"
+    write_edge_file(str(path), np.array([0, 5]), np.array([1, 1]), np.array([1.0, 1.0]))
+    calls = []
+    check = edge_list.check_links
+    monkeypatch.setattr(edge_list, "check_links", lambda *args: calls.append(args) or check(*args))
+    with pytest.raises(ValueError, match="enlaces.npy"):
+        load_edge_list(str(path), 3, use_sparse)
+    assert len(calls) == 1  # Una sola validación por bloque
@@ -0,0 +1,49 @@
+import numpy as np
+
+from Solver.elimination import augmented_buffer, gauss_jordan_steps, inverse, solve
+
+from tests.helpers import laplacian_system, random_system, singular_system
+
+
+def test_solve_random_matches_numpy():
+    A, b = random_system()
+    np.testing.assert_allclose(solve(A, b), np.linalg.solve(A, b), rtol=1e-8, atol=1e-10)
+
+
+def test_solve_several_right_hand_sides():
+    A, _ = random_system(seed=1)
+    B = np.random.default_rng(1).standard_normal((len(A), 3))
+    np.testing.assert_allclose(solve(A, B), np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
+
+
+def test_inverse_random_matches_numpy():
+    A, _ = random_system(n=30, seed=2)
+    np.testing.assert_allclose(inverse(A), np.linalg.inv(A), rtol=1e-7, atol=1e-9)
+
+
+def test_blocked_and_row_by_row_agree():
+    A, b = random_system(n=150, seed=3)
+    blocked = augmented_buffer(A, b)
+    rows = blocked.copy()
+    for _ in gauss_jordan_steps(blocked, len(A), block=16):
+        pass
+    for _ in gauss_jordan_steps(rows, len(A), detailed=True):
+        pass
+    np.testing.assert_allclose(blocked, rows, rtol=1e-8, atol=1e-10)
+
+
+def test_singular_consistent_system_has_zero_residual():
+    # Gauss-Jordan salta las columnas sin pivote: da una solución del
+    # sistema (no la de norma mínima), con residuo nulo
+    A, b = singular_system(n=12, seed=4)
+    x = solve(A, b)
+    assert np.linalg.norm(A @ x - b) <= 1e-8 * np.linalg.norm(b)
+    M = augmented_buffer(A, b)
+    ops = list(gauss_jordan_steps(M, len(A)))
+    assert any(op[0] == "singular" for op in ops)
+
+
+def test_laplacian_with_zero_sum_demand():
+    A, b = laplacian_system(n=20, seed=5)
+    x = solve(A, b)
+    assert np.linalg.norm(A @ x - b) <= 1e-8 * np.linalg.norm(b)
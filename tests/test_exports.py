@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import simulador
+import Solver
+
+PACKAGES = [Solver, simulador]
+
+
+@pytest.mark.parametrize("package", PACKAGES, ids=lambda p: p.__name__)
+def test_every_export_resolves(package):
+    for name, module in package._EXPORTS.items():
+        value = getattr(package, name)
+        assert value is getattr(sys.modules[f"{package.__name__}.{module}"], name)
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        getattr(package, "no_existe")
+
+
+def test_imports_do_not_load_matplotlib():
+    # En un proceso aparte: otras pruebas ya cargaron matplotlib en este
+    code = (
+        "import sys, Solver, simulador\n"
+        "for package in (Solver, simulador):\n"
+        "    for name in package._EXPORTS:\n"
+        "        getattr(package, name)\n"
+        "loaded = sorted(m for m in sys.modules if m.split('.')[0] in ('matplotlib', 'seaborn'))\n"
+        "assert not loaded, loaded\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parent.parent)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,81 @@
+import re
+
+import numpy as np
+import pytest
+
+from Solver import main as solver_main
+from Solver.elimination import augmented_buffer
+from Solver.main import MAX_RENDER_COLS, MAX_RENDER_ROWS, format_matrix, run_elimination_steps
+
+from tests.helpers import random_system
+
+
+def plain(text):
+    """Texto sin los códigos de color ANSI, una línea por fila (sin el título)"""
+    lines = re.sub(r"\x1b\[[0-9;]*m", "", text).strip("\n").split("\n")
+    return lines[1:]
+
+
+def values(line):
+    return [float(v) for v in re.findall(r"-?\d+\.\d\d", line)]
+
+
+def test_small_matrix_is_shown_whole():
+    A = np.arange(12.0).reshape(3, 4)
+    lines = plain(format_matrix(A, "A"))
+    assert len(lines) == 3
+    assert lines[0].startswith("┌") and lines[-1].startswith("└")
+    for row, line in zip(A, lines):
+        assert values(line) == row.tolist()
+    assert not any("…" in line or "⋮" in line for line in lines)
+
+
+def test_large_matrix_is_elided():
+    A = np.arange(100.0 * 100).reshape(100, 100)
+    lines = plain(format_matrix(A))
+    assert len(lines) == MAX_RENDER_ROWS + 1
+    half = MAX_RENDER_ROWS // 2
+    assert "⋮" in lines[half] and not values(lines[half])
+    first, last = values(lines[0]), values(lines[-1])
+    assert len(first) == MAX_RENDER_COLS and "…" in lines[0]
+    assert first[0] == A[0, 0] and first[-1] == A[0, -1]
+    assert last[0] == A[-1, 0] and last[-1] == A[-1, -1]
+
+
+def test_separator_stays_visible_in_large_augmented_matrix():
+    M = np.arange(40.0 * 80).reshape(40, 80)
+    lines = plain(format_matrix(M, separator_pos=40))
+    assert len(lines) == MAX_RENDER_ROWS + 1
+    # Cada bloque se recorta por separado: las columnas junto al separador se ven
+    assert re.search(r"39\.00\s+│\s+40\.00 .*79\.00", lines[0])
+    assert re.search(r"3159\.00\s+│\s+3160\.00 .*3199\.00", lines[-1])
+
+
+def test_changed_rows_only():
+    M = np.arange(30.0 * 31).reshape(30, 31)
+    lines = plain(format_matrix(M, separator_pos=30, rows=[3, 17]))
+    assert len(lines) == 2
+    assert lines[0].startswith("F4 ") and lines[1].startswith("F18")
+    assert values(lines[0])[0] == M[3, 0] and values(lines[0])[-1] == M[3, 30]
+    assert values(lines[1])[0] == M[17, 0] and values(lines[1])[-1] == M[17, 30]
+
+
+@pytest.mark.parametrize("shape", [(0, 0), (3, 0), (0, 3)])
+def test_empty_matrix(shape):
+    assert plain(format_matrix(np.zeros(shape), "vacía")) == ["[ ]"]
+    assert plain(format_matrix(np.eye(3), rows=[])) == ["[ ]"]
+
+
+def test_large_elimination_shows_only_changed_rows(monkeypatch, capsys):
+    monkeypatch.setattr(solver_main, "ask", lambda prompt="": "")
+    n = MAX_RENDER_ROWS + 4
+    A, b = random_system(n=n)
+    M = augmented_buffer(A, b)
+    trace = run_elimination_steps(M, n, True, True, "Eliminación hacia atrás")
+    out = plain(capsys.readouterr().out)
+    scaled = [k for k, line in enumerate(out) if "normalizada:" in line]
+    assert len(scaled) == n
+    for k in scaled:
+        assert out[k + 1].startswith("F") and not out[k + 2].startswith("F")
+    np.testing.assert_allclose(M[:, n], np.linalg.solve(A, b), rtol=1e-8, atol=1e-10)
+    assert len(trace) > 0
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from Solver import iterative
+from Solver.iterative import WarmStartSolver, choose_method, iterative_solve
+
+from tests.helpers import laplacian_system, random_system, singular_system
+
+
+def dominant_system(n=200, symmetric=True, seed=0):
+    """-(L + I) de una red (como A_modificada): simétrica y diagonal dominante"""
+    A, b = laplacian_system(n, seed)
+    A = A - np.eye(n)
+    if not symmetric:
+        A[0, 1] *= 0.5
+    return A, b
+
+
+def assert_close(x, x_ref, tol=1e-6):
+    assert np.linalg.norm(x - x_ref) <= tol * np.linalg.norm(x_ref)
+
+
+def test_method_choice():
+    A, _ = dominant_system()
+    assert choose_method(A) == "cg"
+    assert choose_method(sparse.csr_matrix(A)) == "cg"
+    A_ns, _ = dominant_system(symmetric=False)
+    assert choose_method(A_ns) == "bicgstab"
+    # Simétrica con diagonal positiva pero indefinida: CG no sirve
+    assert choose_method(np.array([[1.0, 3.0], [3.0, 1.0]])) == "gmres"
+    A_rand, _ = random_system()
+    assert choose_method(A_rand) == "gmres"
+
+
+@pytest.mark.parametrize("method", ["cg", "bicgstab", "gmres"])
+@pytest.mark.parametrize("preconditioner", [None, "jacobi", "ilu"])
+def test_residual_matches_direct_solve(method, preconditioner):
+    A, b = dominant_system(symmetric=method == "cg")
+    x, info = iterative_solve(A, b, method, preconditioner)
+    assert info["converged"] and not info["breakdown"]
+    assert info["residual"] <= 1e-8
+    assert_close(x, np.linalg.solve(A, b))
+
+
+def test_auto_on_random_matrix():
+    # GMRES con reinicio se estanca con una gaussiana pura (autovalores
+    # en un disco alrededor de 0): se corre el espectro lejos del origen
+    A, b = random_system()
+    A = A + 2 * np.sqrt(len(A)) * np.eye(len(A))
+    x, info = iterative_solve(A, b)
+    assert info["method"] == "gmres" and info["converged"]
+    assert_close(x, np.linalg.solve(A, b))
+
+
+def test_indefinite_symmetric_is_not_solved_with_cg():
+    A = np.array([[1.0, 3.0, 0.0], [3.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    b = np.ones(3)
+    x, info = iterative_solve(A, b)
+    assert info["method"] == "gmres" and info["converged"]
+    np.testing.assert_allclose(x, np.linalg.solve(A, b), atol=1e-8)
+
+
+def test_singular_inconsistent_does_not_converge():
+    A, b = singular_system(consistent=False)
+    x, info = iterative_solve(A, b, maxiter=200)
+    assert not info["converged"]
+    assert info["residual"] > 1e-8
+
+
+def test_laplacian_consistent_demand():
+    A, b = laplacian_system(n=100)
+    x, info = iterative_solve(A, b, "gmres")
+    assert info["converged"]
+    assert np.linalg.norm(A @ x - b) <= 1e-7 * np.linalg.norm(b)
+
+
+def test_warm_start_reuses_previous_solution():
+    A, b = dominant_system(n=400, symmetric=False)
+    solver = WarmStartSolver(A)
+    _, cold = solver.solve(b)
+    x, scaled = solver.solve(2.0 * b)
+    assert scaled["iterations"] == 0
+    assert_close(x, np.linalg.solve(A, 2.0 * b))
+    perturbed = 2.0 * b + 1e-3 * np.random.default_rng(1).standard_normal(len(b))
+    _, warm = solver.solve(perturbed)
+    assert warm["converged"] and warm["iterations"] < cold["iterations"]
+
+
+def test_gmres_budget_counts_iterations_not_restarts():
+    # Sin corrimiento GMRES con reinicio se estanca: debe parar en maxiter
+    A, b = random_system(n=300)
+    x, info = iterative_solve(A, b, "gmres", maxiter=100)
+    assert not info["converged"] and info["iterations"] <= 100
+
+
+def test_warm_start_falls_back_to_gmres(monkeypatch):
+    # CG sobre una no simétrica no converge; GMRES sí y queda elegido
+    monkeypatch.setattr(iterative, "choose_method", lambda A: "cg")
+    A, b = random_system()
+    A = A + 2 * np.sqrt(len(A)) * np.eye(len(A))
+    solver = WarmStartSolver(A, maxiter=400)
+    x, info = solver.solve(b)
+    assert info["method"] == "gmres" and info["converged"]
+    assert_close(x, np.linalg.solve(A, b))
+    assert solver.method == "gmres"
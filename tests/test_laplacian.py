@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from Solver.laplacian import GroundedLaplacian, is_laplacian, laplacian_sign, solve_laplacian
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, laplacian_system, random_system
+
+
+def test_sign_of_the_project_matrices():
+    A, _ = laplacian_system()
+    assert laplacian_sign(A) == -1.0
+    assert laplacian_sign(-A) == 1.0
+    assert laplacian_sign(sparse.csr_matrix(A)) == -1.0
+    assert not is_laplacian(random_system()[0])
+    assert not is_laplacian(A - np.eye(len(A)))
+
+
+@pytest.mark.parametrize("as_sparse", [False, True])
+def test_minimum_norm_solution(as_sparse):
+    A, b = laplacian_system()
+    x, info = solve_laplacian(sparse.csr_matrix(A) if as_sparse else A, b)
+    assert info["components"] == 1 and info["consistent"]
+    assert_solution(A, b, x)
+
+
+def test_inconsistent_demand_gives_least_squares():
+    A, b = laplacian_system()
+    b = b + 0.5
+    x, info = solve_laplacian(A, b)
+    assert not info["consistent"]
+    assert_solution(A, b, x)
+
+
+def test_several_components():
+    L1, b1 = laplacian_system(n=15, seed=1)
+    L2, b2 = laplacian_system(n=25, seed=2)
+    A = np.zeros((40, 40))
+    A[:15, :15] = L1
+    A[15:, 15:] = L2
+    b = np.concatenate([b1, b2])
+    grounded = GroundedLaplacian(A)
+    assert grounded.num_components == 2
+    assert_solution(A, b, grounded.solve(b))
+    np.testing.assert_allclose(grounded.solve(np.eye(40)), np.linalg.pinv(A), atol=1e-8)
+
+
+def test_optimizer_grounds_the_laplacian():
+    A, b = laplacian_system()
+    optimizer = NetworkOptimizer(len(A))
+    optimizer.A = A
+    assert optimizer.factorize()[0] == "laplaciano"
+    assert_solution(A, b, optimizer.solve_batch(b))
+
+
+def test_not_a_laplacian_raises():
+    with pytest.raises(ValueError):
+        GroundedLaplacian(random_system()[0])
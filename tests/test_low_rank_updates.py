@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, random_system
+
+
+def optimizer_for(A):
+    optimizer = NetworkOptimizer(A.shape[0])
+    optimizer.A = A
+    return optimizer
+
+
+@pytest.mark.parametrize("as_sparse", [False, True])
+def test_link_updates_match_a_fresh_solve(as_sparse):
+    A, b = random_system(seed=6)
+    A = A + 3 * len(A) * np.eye(len(A))
+    optimizer = optimizer_for(sparse.csr_matrix(A) if as_sparse else A)
+    optimizer.factorize()
+    optimizer.update_link(0, 1, 0.5)
+    optimizer.adjust_capacity(2, -1.0)
+    optimizer.remove_link(3, 4)
+
+    expected = A.copy()
+    expected[0, 1] += 0.5
+    expected[1, 0] += 0.5
+    expected[0, 0] -= 0.5
+    expected[1, 1] -= 0.5
+    expected[2, 2] -= 1.0
+    w = A[3, 4]
+    expected[3, 4] -= w
+    expected[4, 3] -= w
+    expected[3, 3] += w
+    expected[4, 4] += w
+
+    current = optimizer.A.toarray() if as_sparse else optimizer.A
+    np.testing.assert_allclose(current, expected, atol=1e-12)
+    assert_solution(expected, b, optimizer.solve_batch(b))
+
+
+def test_updates_do_not_touch_the_assigned_array():
+    A, _ = random_system(seed=7)
+    original = A.copy()
+    optimizer = optimizer_for(A)
+    optimizer.factorize()
+    optimizer.update_link(0, 1, 2.0)
+    np.testing.assert_array_equal(A, original)
+
+
+def test_many_updates_trigger_a_refactorization():
+    A, b = random_system(seed=8)
+    A = A + 3 * len(A) * np.eye(len(A))
+    optimizer = NetworkOptimizer(len(A), max_low_rank_updates=2)
+    optimizer.A = A
+    optimizer.factorize()
+    for k in range(5):
+        optimizer.update_link(k, k + 1, 0.25)
+    assert_solution(optimizer.A, b, optimizer.solve_batch(b))
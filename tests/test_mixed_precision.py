@@ -0,0 +1,70 @@
+import threading
+
+import numpy as np
+import pytest
+
+from Solver.mixed_precision import MixedPrecisionLU, mixed_precision_solve
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+
+def test_refinement_reaches_double_precision():
+    A, b = random_system(n=100)
+    x, info = mixed_precision_solve(A, b)
+    assert info["precision"] == "mixta" and info["refinement_steps"] > 0
+    assert not info["fell_back"]
+    assert_solution(A, b, x)
+
+
+def test_ill_conditioned_falls_back_to_float64():
+    # κ(A) = 1e8: demasiado para refinar desde float32, no para float64
+    n = 30
+    Q, _ = np.linalg.qr(np.random.default_rng(4).standard_normal((n, n)))
+    A = Q @ np.diag(np.logspace(0, -8, n)) @ Q.T
+    b = np.ones(n)
+    x, info = mixed_precision_solve(A, b)
+    assert info["precision"] == "doble" and info["fell_back"]
+    assert_solution(A, b, x, rtol=1e-6)
+
+
+@pytest.mark.parametrize("system", [singular_system, laplacian_system])
+def test_singular_raises(system):
+    A, b = system()
+    with pytest.raises(np.linalg.LinAlgError):
+        mixed_precision_solve(A, b)
+
+
+def test_solve_does_not_change_the_factorization():
+    A, b = random_system(n=80, seed=1)
+    lu = MixedPrecisionLU(A)
+    A[:] = 0.0  # La factorización tiene su propia copia
+    first, info = lu.solve_info(b)
+    second, again = lu.solve_info(b)
+    np.testing.assert_array_equal(first, second)
+    assert info == again and lu.precision == "mixta"
+
+
+def test_shared_between_threads():
+    A, _ = random_system(n=80, seed=2)
+    lu = MixedPrecisionLU(A)
+    B = np.random.default_rng(2).standard_normal((80, 16))
+    X = np.empty_like(B)
+
+    def solve(k):
+        X[:, k] = lu.solve(B[:, k])
+
+    threads = [threading.Thread(target=solve, args=(k,)) for k in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    np.testing.assert_allclose(X, np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
+
+
+def test_optimizer_mixed_precision():
+    A, b = random_system(seed=3)
+    optimizer = NetworkOptimizer(len(A), precision="mixed")
+    optimizer.A = A
+    assert optimizer.factorize()[0] == "mixta"
+    assert_solution(A, b, optimizer.solve_batch(b))
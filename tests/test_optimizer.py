@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, random_system, singular_system
+
+
+def optimizer_for(A):
+    optimizer = NetworkOptimizer(A.shape[0])
+    optimizer.A = A
+    return optimizer
+
+
+def test_factorize_random():
+    A, b = random_system()
+    optimizer = optimizer_for(A)
+    assert optimizer.factorize()[0] == "lu"
+    assert_solution(A, b, optimizer.solve_batch(b))
+
+
+def test_factorize_symmetric_definite_uses_cholesky():
+    A, b = random_system(seed=1)
+    A = -(A @ A.T + len(A) * np.eye(len(A)))
+    optimizer = optimizer_for(A)
+    assert optimizer.factorize()[0] == "cholesky"
+    assert_solution(A, b, optimizer.solve_batch(b))
+
+
+def test_solve_batch_matches_column_by_column():
+    A, _ = random_system(seed=2)
+    B = np.random.default_rng(2).standard_normal((len(A), 4))
+    np.testing.assert_allclose(optimizer_for(A).solve_batch(B), np.linalg.solve(A, B),
+                               rtol=1e-8, atol=1e-10)
+
+
+def test_singular_non_laplacian_raises():
+    A, _ = singular_system()
+    with pytest.raises(np.linalg.LinAlgError):
+        optimizer_for(A).factorize()
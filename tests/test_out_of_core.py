@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from Solver.out_of_core import OutOfCoreLU, solve_out_of_core
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+# Presupuesto chico: varios paneles aun para n = 60
+BUDGET = 3 * 8 * 60 * 7
+
+
+def test_random_system_from_npy(tmp_path):
+    A, b = random_system(n=60)
+    np.save(tmp_path / "A.npy", A)
+    x = solve_out_of_core(str(tmp_path / "A.npy"), b, memory_budget=BUDGET, workdir=tmp_path)
+    assert_solution(A, b, x)
+
+
+def test_several_right_hand_sides_to_file(tmp_path):
+    A, _ = random_system(n=60, seed=1)
+    B = np.random.default_rng(1).standard_normal((60, 3))
+    with OutOfCoreLU(A, memory_budget=BUDGET, workdir=tmp_path) as lu:
+        assert lu.width < 60
+        X = lu.solve(B, out=str(tmp_path / "X.npy"))
+        np.testing.assert_allclose(np.asarray(X), np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
+    assert not list(tmp_path.glob("*.lu"))
+
+
+@pytest.mark.parametrize("system", [singular_system, laplacian_system])
+def test_singular_raises_and_cleans_up(tmp_path, system):
+    A, b = system(n=60)
+    with pytest.raises(np.linalg.LinAlgError):
+        solve_out_of_core(A, b, memory_budget=BUDGET, workdir=tmp_path)
+    assert not list(tmp_path.glob("*.lu"))
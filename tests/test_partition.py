@@ -0,0 +1,77 @@
+import numpy as np
+from scipy import sparse
+
+from Solver import partition
+from Solver.analysis import analyze_system
+from Solver.partition import find_components, partitioned_solve
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, laplacian_system, random_system
+
+
+def disconnected_system(shift=-1.0):
+    """Dos subredes sin enlaces entre sí (con la diagonal corrida en shift)"""
+    L1, b1 = laplacian_system(n=120, seed=1)
+    L2, b2 = laplacian_system(n=130, seed=2)
+    A = np.zeros((250, 250))
+    A[:120, :120] = L1
+    A[120:, 120:] = L2
+    return A + shift * np.eye(250), np.concatenate([b1, b2])
+
+
+def test_components():
+    A, _ = disconnected_system()
+    blocks = find_components(A)
+    assert sorted(len(rows) for rows in blocks) == [120, 130]
+
+
+def test_partitioned_solve_invertible():
+    A, b = disconnected_system()
+    x, info = partitioned_solve(A, b, min_nodes=1)
+    assert info["components"] == 2 and info["invertible"]
+    assert_solution(A, b, x)
+
+
+def test_partitioned_solve_sparse():
+    A, b = disconnected_system()
+    x, info = partitioned_solve(sparse.csr_matrix(A), b, min_nodes=1)
+    assert info["components"] == 2
+    assert_solution(A, b, x)
+
+
+def test_partitioned_solve_singular_blocks_give_minimum_norm():
+    A, b = disconnected_system(shift=0.0)
+    x, info = partitioned_solve(A, b, min_nodes=1)
+    assert not info["invertible"]
+    assert_solution(A, b, x)
+
+
+def test_single_random_block():
+    A, b = random_system()
+    x, info = partitioned_solve(A, b, min_nodes=1)
+    assert info["components"] == 1
+    assert_solution(A, b, x)
+
+
+def test_optimizer_factorizes_each_subnetwork():
+    A, b = disconnected_system()
+    optimizer = NetworkOptimizer(len(A))
+    optimizer.A = A
+    assert optimizer.factorize()[0] == "bloques"
+    assert_solution(A, b, optimizer.solve_batch(b))
+
+
+def test_sparse_components_stay_sparse(monkeypatch):
+    received = []
+
+    def spy(A, b):
+        received.append(sparse.issparse(A))
+        return analyze_system(A, b)
+
+    monkeypatch.setattr(partition, "analyze_system", spy)
+    A, b = disconnected_system()
+    B = np.column_stack([b, -b])
+    X, info = partitioned_solve(sparse.csr_matrix(A), B, min_nodes=1)
+    assert info["components"] == 2 and info["invertible"]
+    assert received and all(received)
+    np.testing.assert_allclose(X, np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
@@ -0,0 +1,93 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from scipy import sparse
+
+from simulador.plotting import (SEABORN_MAX_NODES, block_reduce, export_sweep,
+                                plot_connectivity, plot_flows, plot_network)
+from Solver.sweep import build_grid, run_sweep
+
+from tests.helpers import laplacian_system
+
+# Sin ventanas: las figuras solo se dibujan en memoria o en archivo
+matplotlib.use("Agg")
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+def reference_block_reduce(A, k):
+    """Elemento de mayor valor absoluto de cada bloque k × k, uno por uno"""
+    n_rows, n_cols = A.shape
+    out = np.zeros((-(-n_rows // k), -(-n_cols // k)))
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            block = A[i * k:(i + 1) * k, j * k:(j + 1) * k].ravel()
+            out[i, j] = block[np.argmax(np.abs(block))]
+    return out
+
+
+@pytest.mark.parametrize("shape, max_cells, expected", [
+    ((7, 5), 3, (3, 2)),
+    ((100, 100), 30, (25, 25)),
+    ((40, 40), 600, (40, 40)),
+])
+def test_block_reduce_keeps_the_largest_entry(shape, max_cells, expected):
+    A = np.random.default_rng(0).standard_normal(shape)
+    A[A > 1.0] = 0.0  # Bloques con ceros y valores de los dos signos
+    k = max(1, -(-max(shape) // max_cells))
+    reduced = block_reduce(A, max_cells)
+    assert reduced.shape == expected
+    np.testing.assert_array_equal(reduced, reference_block_reduce(A, k))
+    np.testing.assert_array_equal(block_reduce(sparse.csr_matrix(A), max_cells), reduced)
+
+
+def test_block_reduce_keeps_an_isolated_link():
+    A = sparse.lil_matrix((3000, 3000))
+    A[1234, 2345] = -5.0
+    reduced = block_reduce(A.tocsr(), 100)
+    assert reduced.shape == (100, 100)
+    assert reduced[1234 // 30, 2345 // 30] == -5.0
+    assert np.count_nonzero(reduced) == 1
+
+
+def test_small_network_uses_seaborn():
+    A, _ = laplacian_system(n=10)
+    ax = plot_connectivity(A)
+    assert not ax.images and ax.collections
+
+
+@pytest.mark.parametrize("as_sparse", [False, True])
+def test_large_network_is_one_image(as_sparse):
+    n = SEABORN_MAX_NODES + 30
+    A, _ = laplacian_system(n=n)
+    ax = plot_connectivity(sparse.csr_matrix(A) if as_sparse else A, max_cells=20)
+    (image,) = ax.images
+    assert image.get_array().shape == (20, 20)
+    assert "bloques de 4×4" in ax.get_title()
+
+
+@pytest.mark.parametrize("n, bars", [(50, True), (500, False)])
+def test_flows(n, bars):
+    ax = plot_flows(np.sin(np.arange(n)))
+    assert (len(ax.patches) == n) == bars
+
+
+def test_plot_network_to_file(tmp_path):
+    A, b = laplacian_system(n=80)
+    path = tmp_path / "red.png"
+    plot_network(A, np.linalg.lstsq(A, b, rcond=None)[0], str(path), title="Red")
+    assert path.stat().st_size > 0
+
+
+def test_export_sweep(tmp_path):
+    A, b = laplacian_system(n=20)
+    grid = build_grid(diagonal_shift=[-1.0, -2.0], demand_scale=[1.0, 2.0])
+    _, X = run_sweep(A, b, grid, "direct", processes=1)
+    paths = export_sweep(A, b, grid, X, str(tmp_path / "figuras"), processes=2)
+    assert [p.rsplit("/", 1)[-1] for p in paths] == [f"escenario_{k:04d}.png" for k in range(4)]
+    assert all((tmp_path / "figuras" / p.rsplit("/", 1)[-1]).stat().st_size > 0 for p in paths)
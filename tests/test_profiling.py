@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from Solver import profiling
+from Solver.profiling import Profiler, estimate_flops, profiler_from_env
+
+WAIT = 0.05
+
+
+@pytest.fixture
+def restore_profiler():
+    """Deja activo el perfilador que había antes de la prueba"""
+    previous = profiling.get_profiler()
+    yield
+    profiling.set_profiler(previous)
+
+
+def test_flop_estimates():
+    assert estimate_flops("lu", 30) == pytest.approx(2 * 30**3 / 3)
+    assert estimate_flops("gauss_jordan", 10, 3) == pytest.approx(2 * 100 * 13)
+    assert estimate_flops("desconocida", 10) is None
+
+
+def test_phase_splits_wall_into_compute_and_wait():
+    profiler = Profiler()
+    profiler.start()
+    with profiler.phase("FASE 1"):
+        with profiler.waiting():
+            time.sleep(WAIT)
+        with profiler.operation("lu", estimate_flops("lu", 200)):
+            np.linalg.solve(np.eye(200) * 2.0, np.ones(200))
+
+    (record,) = profiler.phases
+    assert record["name"] == "FASE 1"
+    assert record["wait_s"] >= WAIT
+    assert record["wall_s"] >= record["wait_s"]
+    assert record["compute_s"] == pytest.approx(record["wall_s"] - record["wait_s"])
+    assert record["cpu_s"] < record["wall_s"]  # El sleep no usa CPU
+    assert set(record["operations"]) == {"lu"}
+
+    stats = profiler.operations["lu"]
+    assert stats["count"] == 1 and stats["flops"] == estimate_flops("lu", 200)
+    assert stats["wall_s"] <= record["compute_s"] + 1e-6
+
+
+def test_operations_accumulate_across_threads():
+    profiler = Profiler()
+    profiler.start()
+
+    def work():
+        for _ in range(20):
+            with profiler.operation("inv", 10.0):
+                with profiler.waiting():
+                    pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = profiler.operations["inv"]
+    assert stats["count"] == 160 and stats["flops"] == 1600.0
+    assert not profiler._open
+
+
+def test_memory_is_reported_per_phase():
+    profiler = Profiler(memory=True)
+    profiler.start()
+    try:
+        with profiler.phase("carga"):
+            with profiler.operation("inv"):
+                block = np.ones((512, 512))
+        del block
+    finally:
+        profiler.stop()
+    (record,) = profiler.phases
+    assert record["peak_mb"] >= 2.0
+    assert profiler.operations["inv"]["peak_mb"] >= 2.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.phase("FASE 1"), profiler.operation("lu", 1.0), profiler.waiting():
+        pass
+    assert profiler.phases == [] and profiler.operations == {}
+
+
+def test_report_from_environment(tmp_path, restore_profiler):
+    path = tmp_path / "reporte.json"
+    profiler = profiler_from_env({"SOLVER_PROFILE": str(path)})
+    assert profiler.enabled and profiling.get_profiler() is profiler
+    profiling.start_phase("FASE 1")
+    with profiling.operation("lu", estimate_flops("lu", 100)):
+        np.linalg.solve(np.eye(100), np.ones(100))
+    profiling.start_phase("FASE 2")
+    profiler.finish()
+
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert set(report) == {"total_s", "memory", "phases", "operations"}
+    assert [phase["name"] for phase in report["phases"]] == ["FASE 1", "FASE 2"]
+    for phase in report["phases"]:
+        assert {"wall_s", "cpu_s", "wait_s", "compute_s", "operations"} <= set(phase)
+    assert report["operations"]["lu"]["count"] == 1
+    assert "gflops_s" in report["operations"]["lu"]
+
+    assert not profiler_from_env({}).enabled
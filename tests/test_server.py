@@ -0,0 +1,127 @@
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from simulador import server
+from simulador.server import SolverClient, SolverServer, decode_message, encode_message
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Servidor en un hilo, sobre un socket temporal, y un cliente conectado"""
+    path = str(tmp_path / "s.sock")
+    server = SolverServer(path, workers=2)
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, "El servidor no arrancó"
+        time.sleep(0.01)
+    with SolverClient(path) as client:
+        yield client
+        client.shutdown()
+    thread.join(timeout=10)
+    assert not thread.is_alive() and not os.path.exists(path)
+
+
+def test_message_round_trip():
+    header = {"op": "solve", "network": "red"}
+    arrays = {"B": np.arange(6.0).reshape(3, 2), "idx": np.arange(3)}
+    message = encode_message(header, arrays)
+    head_len = int.from_bytes(message[:4], "big")
+    decoded, out = decode_message(message[8:8 + head_len], message[8 + head_len:])
+    assert decoded["op"] == "solve" and decoded["network"] == "red"
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(out[name], array)
+
+
+@pytest.mark.parametrize("as_sparse", [False, True])
+def test_resident_network_matches_numpy(client, as_sparse):
+    A, b = random_system()
+    A = A + 3 * len(A) * np.eye(len(A))
+    reply = client.load("red", sparse.csr_matrix(A) if as_sparse else A)
+    assert reply["n"] == len(A)
+    assert_solution(A, b, client.solve("red", b))
+
+    B = np.column_stack([b, -b, 2 * b])
+    np.testing.assert_allclose(client.solve("red", B), np.linalg.solve(A, B),
+                               rtol=1e-8, atol=1e-10)
+
+    client.update("red", links=[(0, 1, 0.5)], capacity=[(2, -1.0)])
+    A[[0, 1], [1, 0]] += 0.5
+    A[[0, 1], [0, 1]] -= 0.5
+    A[2, 2] -= 1.0
+    assert_solution(A, b, client.solve("red", b))
+
+
+def test_laplacian_network_gives_minimum_norm(client):
+    A, b = laplacian_system()
+    assert client.load("red", A)["factorization"] == "laplaciano"
+    assert_solution(A, b, client.solve("red", b))
+    for mode in ("direct", "iterative"):
+        result, x = client.analyze(b, network="red", mode=mode)
+        assert result["estado"] != "error"
+        np.testing.assert_allclose(A @ x, b, atol=1e-6)
+
+
+def test_singular_network_is_rejected_and_the_server_keeps_running(client):
+    A, _ = singular_system()
+    with pytest.raises(RuntimeError, match="LinAlgError"):
+        client.load("singular", A)
+    with pytest.raises(RuntimeError, match="KeyError"):
+        client.solve("singular", np.ones(len(A)))
+
+    A_ok, b = random_system(seed=1)
+    client.load("red", A_ok)
+    assert_solution(A_ok, b, client.solve("red", b))
+    assert set(client.stats()["networks"]) == {"red"}
+
+
+def test_singular_scenario_in_analyze(client):
+    A, b = singular_system(seed=2)
+    result, x = client.analyze(b, A=A, mode="sparse")
+    assert result["estado"] == "error" and "error" in result
+    assert np.all(np.isnan(x))
+
+    result, x = client.analyze(b, A=A, mode="direct")
+    assert result["estado"] == "consistente"
+    assert_solution(A, b, x)
+
+
+def test_stats_count_requests(client):
+    A, b = random_system(seed=3)
+    client.load("red", A)
+    for _ in range(3):
+        client.solve("red", b)
+    client.drop("red")
+    stats = client.stats()
+    assert stats["requests"]["solve"]["count"] == 3
+    assert stats["networks"] == {} and stats["workers"] == 2
+
+
+
+@pytest.mark.parametrize("mode", ["direct", "sparse", "iterative", "blocks", "mixed"])
+def test_sparse_networks_are_analyzed_without_densifying(client, monkeypatch, mode):
+    received = []
+    solve_system = server.solve_system
+
+    def spy(A, *args):
+        received.append(sparse.issparse(A))
+        return solve_system(A, *args)
+
+    monkeypatch.setattr(server, "solve_system", spy)
+    A, b = laplacian_system()
+    A = sparse.csr_matrix(A - np.eye(len(A)))
+    client.load("red", A)
+    for result, x in (client.analyze(b, network="red", mode=mode),
+                      client.analyze(b, A=A, mode=mode)):
+        assert result["estado"] == "unica"
+        assert_solution(A, b, x, rtol=1e-6)
+    assert received == [mode != "mixed"] * 2
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from Solver.sparse_path import is_sparse_candidate, solve_sparse
+from simulador import NetworkOptimizer
+
+from tests.helpers import assert_solution, random_system, singular_system
+
+
+def test_solve_sparse_random():
+    A, b = random_system()
+    assert_solution(A, b, solve_sparse(sparse.csr_matrix(A), b))
+
+
+def test_solve_sparse_accepts_dense():
+    A, b = random_system(seed=1)
+    assert_solution(A, b, solve_sparse(A, b))
+
+
+def test_solve_sparse_singular_raises():
+    A, b = singular_system()
+    with pytest.raises(np.linalg.LinAlgError):
+        solve_sparse(sparse.csr_matrix(A), b)
+
+
+def test_sparse_candidate():
+    n = 400
+    A = sparse.diags([1.0, 4.0, 1.0], [-1, 0, 1], shape=(n, n)).toarray()
+    assert is_sparse_candidate(A)
+    assert not is_sparse_candidate(np.ones((n, n)))
+    assert not is_sparse_candidate(np.eye(10))
+
+
+def optimizer_for(A):
+    optimizer = NetworkOptimizer(A.shape[0])
+    optimizer.A = A
+    return optimizer
+
+
+def test_sparse_matrix_uses_sparse_lu():
+    A, b = random_system(seed=3)
+    A = sparse.csr_matrix(A + 10 * np.eye(len(A)))
+    optimizer = optimizer_for(A)
+    assert optimizer.factorize()[0] == "splu"
+    assert_solution(A, b, optimizer.solve_batch(b))
+
+
+def test_sparse_singular_raises():
+    A, _ = singular_system(seed=4)
+    with pytest.raises(np.linalg.LinAlgError):
+        optimizer_for(sparse.csr_matrix(A)).factorize()
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+import pytest
+
+from simulador import NetworkOptimizer
+from simulador.streaming import DemandStream, iter_demand_file, iter_trajectory, write_trajectory
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+TICKS = 10
+
+
+def optimizer_for(A):
+    optimizer = NetworkOptimizer(len(A))
+    optimizer.A = A
+    return optimizer
+
+
+def demands_for(b, ticks=TICKS):
+    """Demandas que cambian poco entre instantes (sumando cero, como b)"""
+    return [b * (1.0 + 0.05 * k) for k in range(ticks)]
+
+
+def run_stream(optimizer, demands, **kwargs):
+    events = kwargs.pop("events", None)
+    stream = DemandStream(optimizer, batch_size=4, **kwargs)
+    return np.vstack([X for _, X in stream.run(demands, events)]), stream.stats
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+@pytest.mark.parametrize("system", [random_system, laplacian_system])
+def test_each_tick_matches_numpy(system, warm_start):
+    A, b = system()
+    if system is random_system:
+        A = A + 3 * len(A) * np.eye(len(A))  # Diagonal dominante: converge el iterativo
+    demands = demands_for(b)
+    X, stats = run_stream(optimizer_for(A.copy()), demands, warm_start=warm_start)
+    assert X.shape == (TICKS, len(A)) and stats.ticks == TICKS
+    for x, demand in zip(X, demands):
+        assert_solution(A, demand, x, rtol=1e-6)
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_singular_network_raises(warm_start):
+    A, b = singular_system()
+    with pytest.raises(np.linalg.LinAlgError):
+        run_stream(optimizer_for(A), demands_for(b), warm_start=warm_start)
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_event_changes_the_network_from_its_tick(warm_start):
+    A, b = laplacian_system()
+    A = A - np.eye(len(A))
+    changed = A.copy()
+    changed[[0, 1], [1, 0]] += 0.5
+    changed[[0, 1], [0, 1]] -= 0.5
+
+    X, stats = run_stream(optimizer_for(A.copy()), demands_for(b), warm_start=warm_start,
+                          events={5: lambda opt: opt.update_link(0, 1, 0.5)})
+    for tick, (x, demand) in enumerate(zip(X, demands_for(b))):
+        assert_solution(changed if tick >= 5 else A, demand, x, rtol=1e-6)
+    assert stats.batches == 4  # [0-3] [4] [5-8] [9]
+
+
+def test_max_wait_flushes_when_the_next_demand_arrives():
+    A, b = random_system()
+
+    def slow_source():
+        for k, demand in enumerate(demands_for(b, 5)):
+            if k == 2:
+                time.sleep(0.05)
+            yield demand
+
+    stream = DemandStream(optimizer_for(A), batch_size=100, max_wait=0.02)
+    ticks = [(first, len(X)) for first, X in stream.run(slow_source())]
+    # El lote [0, 1] espera a la demanda 2, que llega tarde y entra en él
+    assert ticks == [(0, 3), (3, 2)]
+
+
+def test_csv_to_trajectory_file(tmp_path):
+    A, b = random_system(n=12, seed=1)
+    demands = np.array(demands_for(b, ticks=7))
+    np.savetxt(tmp_path / "demanda.csv", demands, delimiter=",", header="serie", comments="")
+
+    stream = DemandStream(optimizer_for(A), batch_size=3)
+    ticks = write_trajectory(str(tmp_path / "tray.npy"),
+                             stream.run(iter_demand_file(str(tmp_path / "demanda.csv"), 2)))
+    assert ticks == 7
+    X = np.vstack(list(iter_trajectory(str(tmp_path / "tray.npy"))))
+    np.testing.assert_allclose(X, np.linalg.solve(A, demands.T).T, rtol=1e-8, atol=1e-10)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from Solver.structure import (StructuredFactorization, detect_structure, permutation_sign,
+                              structured_analysis, structured_solve)
+
+from tests.helpers import N, assert_solution, laplacian_system, random_system, singular_system
+
+
+def structured(kind, n=N, seed=0):
+    """Una A con la estructura que elige cada camino, y un b aleatorio"""
+    rng = np.random.default_rng(seed)
+    A, b = random_system(n, seed)
+    if kind == "diagonal":
+        A = np.diag(rng.uniform(1.0, 2.0, n) * rng.choice([-1.0, 1.0], n))
+    elif kind == "triangular":
+        A = np.tril(A) + n * np.eye(n)
+    elif kind == "banda":
+        A = np.triu(np.tril(A, 1), -2) + 4 * np.eye(n)
+    elif kind == "cholesky":
+        A = laplacian_system(n, seed)[0] - np.eye(n)  # Definida negativa, como la red
+    elif kind == "ldlt":
+        A = A + A.T  # Simétrica indefinida
+    elif kind == "lu_disperso":
+        A = sparse.random(250, 250, density=0.01, random_state=seed, format="csr")
+        A = (A + 4 * sparse.eye(250)).tocsr()
+        b = rng.standard_normal(250)
+    return A, b
+
+
+PATHS = ["diagonal", "triangular", "banda", "cholesky", "ldlt", "lu", "lu_disperso"]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_each_path_matches_numpy(path):
+    A, b = structured(path)
+    factorization = StructuredFactorization(A)
+    assert factorization.path == path
+
+    dense = A.toarray() if sparse.issparse(A) else A
+    sign, logabsdet = np.linalg.slogdet(dense)
+    assert factorization.det_sign == sign
+    assert factorization.logabsdet == pytest.approx(logabsdet, rel=1e-10, abs=1e-10)
+    assert_solution(dense, b, factorization.solve(b))
+
+    B = np.column_stack([b, 2 * b])
+    np.testing.assert_allclose(factorization.solve(B), np.linalg.solve(dense, B),
+                               rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_structured_solve_matches_numpy(path):
+    A, b = structured(path, seed=1)
+    x, info = structured_solve(A, b)
+    assert info["path"] == path
+    assert_solution(A, b, x)
+
+
+def test_sparse_input_stays_sparse():
+    A, _ = structured("lu_disperso")
+    structure = detect_structure(A)
+    assert structure.sparse and structure.candidate_paths() == ["lu_disperso"]
+    factorization = StructuredFactorization(A, structure)
+    assert not hasattr(factorization, "A") and factorization.path == "lu_disperso"
+
+
+@pytest.mark.parametrize("system", [singular_system, laplacian_system])
+def test_singular_falls_back_to_least_squares(system):
+    A, b = system()
+    assert structured_analysis(A, b) is None
+    x, info = structured_solve(A, b)
+    assert info["path"] == "svd"
+    assert_solution(A, b, x)
+
+
+def test_zero_row_is_singular_without_factorizing():
+    A, b = random_system()
+    A[3] = 0.0
+    assert detect_structure(A).empty_line
+    with pytest.raises(np.linalg.LinAlgError):
+        StructuredFactorization(A)
+    x, info = structured_solve(A, b)
+    assert info["path"] == "svd"
+    assert_solution(A, b, x)
+
+
+def test_analysis_matches_numpy():
+    A, b = random_system(seed=2)
+    analysis = structured_analysis(A, b)
+    assert analysis.path == "lu" and analysis.invertible
+    assert analysis.det == pytest.approx(np.linalg.det(A), rel=1e-8)
+    assert_solution(A, b, analysis.x)
+    np.testing.assert_allclose(analysis.inverse(), np.linalg.inv(A), rtol=1e-8, atol=1e-10)
+
+
+def test_permutation_sign():
+    assert permutation_sign(np.arange(5)) == 1.0
+    assert permutation_sign(np.array([1, 0, 2])) == -1.0
+    assert permutation_sign(np.array([1, 2, 0])) == 1.0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from Solver.sweep import apply_scenario, build_grid, main, run_sweep
+
+from tests.helpers import assert_solution, laplacian_system
+
+
+def test_sweep_matches_each_scenario_solved_alone():
+    A, b = laplacian_system(n=20)
+    grid = build_grid(diagonal_shift=[-1.0, -2.0], fail_link=[None, (0, 1)],
+                      demand_scale=[0.5, 2.0])
+    table, X = run_sweep(A, b, grid, "direct", processes=2)
+    assert len(table) == len(grid) == X.shape[1]
+    for k, scenario in enumerate(grid):
+        A_k, b_k = apply_scenario(A, b, scenario)
+        assert table[k]["estado"] == "unica"
+        assert_solution(A_k, b_k, X[:, k])
+
+
+def test_singular_scenario_does_not_discard_the_others():
+    # Sin corrimiento de la diagonal A es el laplaciano: singular para el LU disperso
+    A, b = laplacian_system(n=20)
+    grid = build_grid(diagonal_shift=[0.0, -1.0], fail_link=[None, (0, 99)])
+    table, X = run_sweep(A, b, grid, "sparse", processes=1)
+
+    states = {(row["diagonal_shift"], row["fail_link"]): row["estado"] for row in table}
+    assert states == {(0.0, None): "error", (0.0, (0, 99)): "error",
+                      (-1.0, None): "unica", (-1.0, (0, 99)): "error"}
+    ok = next(k for k, row in enumerate(table) if row["estado"] == "unica")
+    assert_solution(A - np.eye(20), b, X[:, ok])
+    failed = [k for k, row in enumerate(table) if row["estado"] == "error"]
+    assert np.all(np.isnan(X[:, failed]))
+    assert "IndexError" in table[failed[-1]]["error"]
+
+
+def test_failed_link_keeps_row_sums_of_an_asymmetric_network():
+    A = np.array([[-3.0, 2.0, 1.0],
+                  [0.5, -1.5, 1.0],
+                  [1.0, 1.0, -2.0]])
+    A_k, _ = apply_scenario(A, np.ones(3), {"fail_link": (0, 1)})
+    assert A_k[0, 1] == A_k[1, 0] == 0.0
+    assert A_k[0, 0] == -1.0 and A_k[1, 1] == -1.0
+    np.testing.assert_array_equal(A_k.sum(axis=1), A.sum(axis=1))
+    np.testing.assert_array_equal(A_k[2], A[2])
+    with pytest.raises(ValueError):
+        apply_scenario(A, np.ones(3), {"fail_link": (1, 1)})
+
+
+def test_main_exit_code_and_table(tmp_path, capsys):
+    A, b = laplacian_system(n=10)
+    np.save(tmp_path / "A.npy", A)
+    np.save(tmp_path / "b.npy", b)
+    output = tmp_path / "barrido.csv"
+    code = main(["--A", str(tmp_path / "A.npy"), "--b", str(tmp_path / "b.npy"),
+                 "--diagonal-shift", "0", "-1", "--mode", "sparse", "-j", "1",
+                 "-o", str(output)])
+    assert code == 1
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert "Escenario 0" in capsys.readouterr().err
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from Solver.elimination import augmented_buffer
+from Solver.trace import StepTrace, TraceViewer, describe, main, record_trace
+
+from tests.helpers import assert_solution, laplacian_system, random_system, singular_system
+
+N = 12
+
+
+def particular_solution(M, n):
+    """x de la forma escalonada reducida [R|c]: variables libres en cero"""
+    x = np.zeros(n)
+    for row in M:
+        pivots = np.flatnonzero(np.abs(row[:n]) > 1e-9)
+        if pivots.size:
+            x[pivots[0]] = row[n]
+    return x
+
+
+def test_random_system_matches_numpy():
+    A, b = random_system(n=N)
+    M = augmented_buffer(A, b)
+    trace = record_trace(M, N, checkpoint_every=7)
+    np.testing.assert_allclose(M[:, :N], np.eye(N), atol=1e-10)
+    assert_solution(A, b, M[:, N])
+
+    viewer = TraceViewer(trace)
+    np.testing.assert_array_equal(viewer.seek(len(trace)), M)
+    np.testing.assert_array_equal(viewer.seek(0), augmented_buffer(A, b))
+
+
+@pytest.mark.parametrize("system", [singular_system, laplacian_system])
+def test_singular_system_reaches_the_same_echelon_form(system):
+    A, b = system(n=N)
+    M = augmented_buffer(A, b)
+    trace = record_trace(M, N, checkpoint_every=5)
+    kinds = [trace.op(k)[0] for k in range(len(trace))]
+    assert kinds.count("singular") == N - np.linalg.matrix_rank(A)
+
+    x = particular_solution(M, N)
+    x_ref = np.linalg.lstsq(A, b, rcond=None)[0]
+    assert np.linalg.norm(A @ x - b) <= np.linalg.norm(A @ x_ref - b) + 1e-8 * np.linalg.norm(b)
+    np.testing.assert_array_equal(TraceViewer(trace).seek(len(trace)), M)
+
+
+def test_seek_and_replay_match_the_checkpoints():
+    A, b = random_system(n=N, seed=1)
+    trace = record_trace(augmented_buffer(A, b), N, checkpoint_every=9)
+    viewer = TraceViewer(trace)
+    for k in sorted(trace.checkpoints, reverse=True):  # Saltos hacia atrás
+        np.testing.assert_allclose(viewer.seek(k), trace.checkpoints[k], rtol=0, atol=1e-12)
+
+    steps = list(viewer.replay(3, 12))
+    assert [k for k, _, _ in steps] == list(range(3, 12))
+    for k, op, M in TraceViewer(trace).replay():
+        assert op == trace.op(k) and describe(op)
+        if k + 1 in trace.checkpoints:
+            np.testing.assert_allclose(M, trace.checkpoints[k + 1], rtol=0, atol=1e-12)
+    with pytest.raises(IndexError):
+        viewer.seek(len(trace) + 1)
+
+
+def test_save_and_load(tmp_path):
+    A, b = laplacian_system(n=N, seed=2)
+    trace = record_trace(augmented_buffer(A, b), N)
+    trace.save(tmp_path / "traza.npz")
+    loaded = StepTrace.load(tmp_path / "traza.npz")
+    assert len(loaded) == len(trace) and loaded.n == N
+    assert [loaded.op(k) for k in range(len(loaded))] == [trace.op(k) for k in range(len(trace))]
+    np.testing.assert_array_equal(TraceViewer(loaded).seek(len(loaded)),
+                                  trace.checkpoints[len(trace)])
+
+
+def test_command_line(tmp_path, capsys):
+    A, b = random_system(n=N, seed=3)
+    np.save(tmp_path / "A.npy", A)
+    np.save(tmp_path / "b.npy", b)
+    output = str(tmp_path / "traza.npz")
+    assert main(["record", str(tmp_path / "A.npy"), str(tmp_path / "b.npy"), "-o", output]) == 0
+    assert main(["show", output, "--page", "0", "--page-size", "5"]) == 0
+    assert "Página 1 de" in capsys.readouterr().out
+
+    final = TraceViewer(StepTrace.load(output))
+    assert_solution(A, b, final.seek(len(final))[:, N])